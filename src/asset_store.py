@@ -0,0 +1,76 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# asset_store.py - Icon storage for the menu
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: asset_store.py
+# Description: Loads every icon file once, as the raw 1-bit bytes of the image
+#              (32 bytes for a 16x16 icon), shared by all the menu entries that
+#              use it. Sprites for the compositor, plain or inverted, are built
+#              from those bytes through a sprite cache: all of them up front
+#              normally, or on demand into a small cache in low memory mode.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   An inverted sprite is built from the inverted image, so it looks the same
+#   as ImageOps.invert() of the icon.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import bitplane             # Used to pack the icons for the compositor
+
+from PIL import Image, ImageOps
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+ICON_CACHE_SIZE_LOW = 2     # Sprites kept in low memory mode: the shown icon, plain and inverted
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class IconStore:
+    def __init__(self, paths, low_memory=False, cache_size=ICON_CACHE_SIZE_LOW):
+        """
+        paths maps an icon index to its image file. Indexes sharing a file share its bytes and sprites.
+        In low memory mode at most cache_size sprites are kept, each packed for the one row offset it is shown at.
+        """
+        self.paths = dict(paths)
+        self.files = {}             # path -> (size, mode "1" bytes)
+        for path in self.paths.values():
+            if path not in self.files:
+                img = Image.open(path).convert("1")
+                self.files[path] = (img.size, img.tobytes())
+
+        self.size = (max(size[0] for size, _ in self.files.values()), max(size[1] for size, _ in self.files.values()))
+        if low_memory:
+            self.sprites = bitplane.SpriteCache(self.render, size=cache_size, lazy=True)
+        else:
+            self.sprites = bitplane.SpriteCache(self.render, size=2 * len(self.files))
+            for path in self.files:
+                self.sprites.get((path, False))
+                self.sprites.get((path, True))
+
+    def get(self, index, inverted=False) -> bitplane.Sprite:
+        """
+        The sprite of icon index, or of its inverted variant.
+        """
+        return self.sprites.get((self.paths[index], inverted))
+
+    def render(self, key) -> Image.Image:
+        """
+        Rebuild the image of a (path, inverted) key from the stored bytes. Called by the sprite cache on a miss.
+        """
+        path, inverted = key
+        size, data = self.files[path]
+        img = Image.frombytes("1", size, data)
+        return ImageOps.invert(img) if inverted else img
@@ -0,0 +1,187 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# bitmap_font.py - Precompiled bitmap fonts for the OLED
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: bitmap_font.py
+# Description: The PixelOperator fonts are pixel-exact at their design size,
+#              so FreeType only adds work at runtime. This module compiles a
+#              TTF at a given size into a packed 1-bit glyph table once, and
+#              draws text by pasting the pre-rendered glyphs. The output is
+#              the same as ImageDraw.text() with the TTF.
+#
+# Usage:
+#   python src/bitmap_font.py           (compiles FONT_BUILD_LIST into fonts/*.bfnt)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Font file (all integers big-endian):
+#       magic 'BFN1' | size (u16) | line_height (i16) | glyph count (u16)
+#       then per glyph: codepoint (u32) | advance (i16) | x offset (i8) | y offset (i8)
+#                       | width (u8) | height (u8) | bitmap (PIL mode "1" raw layout)
+#   Offsets are relative to the top-left ("la") anchor used by ImageDraw.text().
+#   Characters missing from the table are drawn with the TTF, if it can be found.
+#   See test_bitmap_font.py for the pixel comparison and the benchmark.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os                   # Used to find the compiled font next to the TTF
+import struct               # Used to pack the glyph table
+
+from PIL import Image, ImageDraw, ImageFont     # Used to render the glyphs at build time
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+FONT_MAGIC = b"BFN1"
+FONT_HEADER = struct.Struct("!4sHhH")
+FONT_GLYPH = struct.Struct("!IhbbBB")
+
+# Printable ASCII and Latin-1, which covers what CUPS and the shell commands return.
+FONT_CHARSET = [c for c in range(0x20, 0x7F)] + [c for c in range(0xA0, 0x100)]
+
+# The fonts and sizes used by cups_hat_display.py.
+FONT_BUILD_LIST = [
+    ("fonts/PixelOperator.ttf", 16),
+]
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def compiled_path(ttf_path, size) -> str:
+    return f"{os.path.splitext(ttf_path)[0]}-{size}.bfnt"
+
+def compile_font(ttf_path, size, charset=FONT_CHARSET) -> bytes:
+    """
+    Render every character of charset the font has into a packed glyph table.
+    """
+    font = ImageFont.truetype(ttf_path, size=size)
+
+    def signature(ch):
+        mask = font.getmask(ch, mode="1")
+        return mask.size, bytes(mask), font.getlength(ch, mode="1")
+
+    # A private use codepoint renders as the .notdef box; characters that render
+    # the same are missing from the font and are left to the TTF fallback.
+    notdef = signature("\ue000")
+
+    glyphs = []
+    for codepoint in charset:
+        ch = chr(codepoint)
+        if signature(ch) == notdef:
+            continue
+
+        advance = font.getlength(ch, mode="1")
+        if advance != int(advance):
+            raise ValueError(f"{ttf_path} at {size}px has a fractional advance for {ch!r}, not a pixel font size")
+
+        left, top, right, bottom = font.getbbox(ch, mode="1")
+        img = Image.new("1", (right - left, bottom - top))
+        if img.width and img.height:
+            ImageDraw.Draw(img).text((-left, -top), ch, font=font, fill=255)
+        glyphs.append(FONT_GLYPH.pack(codepoint, int(advance), left, top, img.width, img.height) + img.tobytes())
+
+    # ImageDraw.text() spaces multiline text by the bottom of "A" plus spacing.
+    line_height = font.getbbox("A", mode="1")[3]
+    return FONT_HEADER.pack(FONT_MAGIC, size, line_height, len(glyphs)) + b"".join(glyphs)
+
+def load_font(ttf_path, size):
+    """
+    Load the compiled bitmap font for ttf_path at size if it has been built,
+    otherwise fall back to the TTF.
+    """
+    path = compiled_path(ttf_path, size)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return BitmapFont(f.read(), fallback_path=ttf_path)
+    return TrueTypeFont(ttf_path, size)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class TrueTypeFont:
+    def __init__(self, ttf_path, size):
+        """
+        Same interface as BitmapFont, drawing through FreeType.
+        """
+        self.font = ImageFont.truetype(ttf_path, size=size)
+
+    def draw_text(self, img, xy, text, fill=255, spacing=4):
+        ImageDraw.Draw(img).text(xy, text, font=self.font, fill=fill, spacing=spacing)
+
+class BitmapFont:
+    def __init__(self, data, fallback_path=None):
+        """
+        data is the output of compile_font(). fallback_path is the TTF used for
+        strings with characters missing from the table.
+        """
+        magic, self.size, self.line_height, count = FONT_HEADER.unpack_from(data)
+        if magic != FONT_MAGIC:
+            raise ValueError("Not a compiled bitmap font")
+
+        self.glyphs = {}    # ch -> (advance, x offset, y offset, mode "1" Image or None)
+        pos = FONT_HEADER.size
+        for _ in range(count):
+            codepoint, advance, left, top, width, height = FONT_GLYPH.unpack_from(data, pos)
+            pos += FONT_GLYPH.size
+            length = ((width + 7) // 8) * height
+            img = None
+            if length:
+                img = Image.frombytes("1", (width, height), data[pos:pos + length])
+            pos += length
+            self.glyphs[chr(codepoint)] = (advance, left, top, img)
+
+        self.fallback_path = fallback_path
+        self.fallback = None
+
+    def draw_text(self, img, xy, text, fill=255, spacing=4):
+        """
+        Draw text on img with its top-left at xy, like ImageDraw.text().
+        """
+        if not all(ch in self.glyphs for ch in text if ch != "\n"):
+            self._draw_fallback(img, xy, text, fill, spacing)
+            return
+
+        y = xy[1]
+        for line in text.split("\n"):
+            x = int(xy[0])
+            top = int(y)
+            for ch in line:
+                advance, left, glyph_top, glyph = self.glyphs[ch]
+                if glyph is not None:
+                    img.paste(fill, (x + left, top + glyph_top), glyph)
+                x += advance
+            y += self.line_height + spacing
+
+    def getlength(self, text) -> int:
+        return sum(self.glyphs[ch][0] for ch in text)
+
+    def _draw_fallback(self, img, xy, text, fill, spacing):
+        if self.fallback_path is None:
+            raise KeyError(f"No glyph for a character in {text!r}")
+        if self.fallback is None:
+            self.fallback = TrueTypeFont(self.fallback_path, self.size)
+        self.fallback.draw_text(img, xy, text, fill, spacing)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Font compiler
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+if __name__ == '__main__':
+    # Paths in FONT_BUILD_LIST are relative to the repository root, like the rest of the app.
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for ttf_path, size in FONT_BUILD_LIST:
+        data = compile_font(ttf_path, size)
+        with open(compiled_path(ttf_path, size), "wb") as f:
+            f.write(data)
+        print(f"{compiled_path(ttf_path, size)}: {FONT_HEADER.unpack_from(data)[3]} glyphs, {len(data)} bytes")
@@ -0,0 +1,263 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# bitplane.py - Packed framebuffer and sprite compositor for the SSD1306
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: bitplane.py
+# Description: Keeps the screen as a packed 1-bit buffer in SSD1306 page
+#              order (512 bytes for 128x32), which is sent to the panel as is.
+#              Icons and text boxes are packed into sprites once, and pasted
+#              with bulk byte operations: numpy when it is installed, Python
+#              ints over bytearray slices otherwise. The result is the same as
+#              Image.paste() on a mode "1" image.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Page order: byte (page * width + x) holds rows page*8 .. page*8+7 of
+#   column x, least significant bit on top. This is the adafruit_framebuf
+#   MVLSB layout used by adafruit_ssd1306.
+#   A sprite is packed for all 8 row offsets within a page, so a paste at any
+#   y is a masked OR of whole bytes, with no bit shifting per frame. A lazy
+#   sprite packs only the offsets it is actually pasted at, which is one for
+#   everything on the menu screen, for an eighth of the memory.
+#   See test_bitplane.py for the comparison with PIL and the benchmark.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import collections          # Used for the sprite LRU cache
+
+try:
+    import numpy            # Optional, vectorizes the byte operations
+except ImportError:
+    numpy = None
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+SPRITE_CACHE_SIZE = 32
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def _page_row_masks(page0, page1, y0, y1) -> list:
+    """
+    For pages page0 .. page1-1, the byte mask of the rows inside [y0, y1).
+    """
+    masks = []
+    for page in range(page0, page1):
+        lo = max(y0 - page * 8, 0)
+        hi = min(y1 - page * 8, 8)
+        masks.append(((1 << hi) - 1) ^ ((1 << lo) - 1))
+    return masks
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class Sprite:
+    def __init__(self, img, transparent=False, lazy=False):
+        """
+        Pack a mode "1" PIL Image. An opaque sprite replaces its whole rectangle
+        like Image.paste(img, xy); a transparent one only sets its lit pixels.
+        A lazy sprite keeps the image bytes and only packs the row offsets it
+        is pasted at, on the first paste.
+        """
+        self.width, self.height = img.size
+        self.transparent = transparent
+        self.data = img.tobytes()
+        self.packed = [None] * 8
+        if not lazy:
+            columns = self._columns()
+            for shift in range(8):
+                self.packed[shift] = self._pack(columns, shift)
+            self.data = None
+
+    def get_packed(self, shift) -> tuple:
+        """
+        (bits, keep) per page for a paste at a y with y % 8 == shift.
+        """
+        packed = self.packed[shift]
+        if packed is None:
+            packed = self.packed[shift] = self._pack(self._columns(), shift)
+        return packed
+
+    def _columns(self) -> list:
+        """
+        One int per column, bit r set if row r is lit.
+        """
+        stride = (self.width + 7) // 8
+        columns = [0] * self.width
+        for y in range(self.height):
+            row = self.data[y * stride:(y + 1) * stride]
+            for x in range(self.width):
+                if row[x >> 3] & (0x80 >> (x & 7)):
+                    columns[x] |= 1 << y
+        return columns
+
+    def _pack(self, columns, shift) -> tuple:
+        """
+        (bits, keep) per page: bits to set, and bits of the screen to keep.
+        """
+        pages = (shift + self.height + 7) // 8
+        cover = columns if self.transparent else [(1 << self.height) - 1] * self.width
+        bits = [bytes((columns[x] << shift >> (p * 8)) & 0xFF for x in range(self.width)) for p in range(pages)]
+        keep = [bytes(~(cover[x] << shift >> (p * 8)) & 0xFF for x in range(self.width)) for p in range(pages)]
+        if numpy is not None:
+            bits = numpy.frombuffer(b"".join(bits), dtype=numpy.uint8).reshape(pages, self.width)
+            keep = numpy.frombuffer(b"".join(keep), dtype=numpy.uint8).reshape(pages, self.width)
+        return bits, keep
+
+class SpriteCache:
+    def __init__(self, render, size=SPRITE_CACHE_SIZE, transparent=False, lazy=False):
+        """
+        LRU cache of sprites. render(key) returns the mode "1" Image for key,
+        and is only called when key isn't cached. lazy is passed to Sprite.
+        """
+        self.render = render
+        self.size = size
+        self.transparent = transparent
+        self.lazy = lazy
+        self.sprites = collections.OrderedDict()
+
+    def get(self, key) -> Sprite:
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        sprite = Sprite(self.render(key), self.transparent, self.lazy)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.size:
+            self.sprites.popitem(last=False)
+        return sprite
+
+class Bitplane:
+    def __init__(self, width, height):
+        """
+        A width x height 1-bit screen. height must be a multiple of 8.
+        """
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.size = (width, height)
+        self.buffer = bytearray(width * self.pages)     # SSD1306 page order
+        self.view = None
+        if numpy is not None:
+            self.view = numpy.frombuffer(self.buffer, dtype=numpy.uint8).reshape(self.pages, width)
+
+    def clear(self, box=None):
+        """
+        Clear the screen, or only the (x0, y0, x1, y1) box.
+        """
+        if box is None:
+            if self.view is not None:
+                self.view.fill(0)
+            else:
+                self.buffer[:] = bytes(len(self.buffer))
+            return
+
+        x0, y0, x1, y1 = box
+        x0, x1 = max(x0, 0), min(x1, self.width)
+        y0, y1 = max(y0, 0), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        page0, page1 = y0 // 8, (y1 - 1) // 8 + 1
+        row_masks = _page_row_masks(page0, page1, y0, y1)
+        if self.view is not None:
+            masks = numpy.array(row_masks, dtype=numpy.uint8).reshape(-1, 1)
+            self.view[page0:page1, x0:x1] &= ~masks
+            return
+
+        width = x1 - x0
+        for page, mask in zip(range(page0, page1), row_masks):
+            start = page * self.width + x0
+            if mask == 0xFF:
+                self.buffer[start:start + width] = bytes(width)
+                continue
+            keep = int.from_bytes(bytes([~mask & 0xFF]) * width, "big")
+            dst = int.from_bytes(self.buffer[start:start + width], "big")
+            self.buffer[start:start + width] = (dst & keep).to_bytes(width, "big")
+
+    def blit(self, sprite: Sprite, xy, clip=None):
+        """
+        Paste sprite with its top-left at xy, like Image.paste().
+        clip is an optional (x0, y0, x1, y1) box the paste is limited to.
+        """
+        x, y = xy
+        x0, y0, x1, y1 = clip if clip is not None else (0, 0, self.width, self.height)
+        x0, x1 = max(x0, x, 0), min(x1, x + sprite.width, self.width)
+        y0, y1 = max(y0, y, 0), min(y1, y + sprite.height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        shift = y % 8
+        first_page = (y - shift) // 8      # Screen page of the sprite's first packed page
+        page0, page1 = y0 // 8, (y1 - 1) // 8 + 1
+        bits, keep = sprite.get_packed(shift)
+        sx0, sx1 = x0 - x, x1 - x
+
+        # The packed keep bytes already protect the rows above and below the sprite,
+        # row masks are only needed when the clip box cuts through it.
+        row_masks = None
+        if y0 != y or y1 != y + sprite.height:
+            row_masks = _page_row_masks(page0, page1, y0, y1)
+
+        if self.view is not None:
+            src_bits = bits[page0 - first_page:page1 - first_page, sx0:sx1]
+            src_keep = keep[page0 - first_page:page1 - first_page, sx0:sx1]
+            dst = self.view[page0:page1, x0:x1]
+            if row_masks is None:
+                dst &= src_keep
+                dst |= src_bits
+            else:
+                masks = numpy.array(row_masks, dtype=numpy.uint8).reshape(-1, 1)
+                dst &= src_keep | ~masks
+                dst |= src_bits & masks
+            return
+
+        # No numpy: treat each page row slice as one big int.
+        width = x1 - x0
+        full = (1 << (width * 8)) - 1
+        for i, page in enumerate(range(page0, page1)):
+            start = page * self.width + x0
+            dst = int.from_bytes(self.buffer[start:start + width], "big")
+            src_bits = int.from_bytes(bits[page - first_page][sx0:sx1], "big")
+            src_keep = int.from_bytes(keep[page - first_page][sx0:sx1], "big")
+            if row_masks is not None:
+                row_mask = int.from_bytes(bytes([row_masks[i]]) * width, "big")
+                src_keep |= full ^ row_mask
+                src_bits &= row_mask
+            self.buffer[start:start + width] = ((dst & src_keep) | src_bits).to_bytes(width, "big")
+
+    def tobytes(self) -> bytes:
+        """
+        The screen in PIL mode "1" raw layout (rows packed MSB first), for the
+        mirror and the recorder. Same as Image.tobytes() of the equivalent image.
+        """
+        if self.view is not None:
+            rows = numpy.unpackbits(self.view, axis=0, bitorder="little")
+            return numpy.packbits(rows, axis=1).tobytes()
+
+        stride = (self.width + 7) // 8
+        out = bytearray(stride * self.height)
+        for page in range(self.pages):
+            for x in range(self.width):
+                byte = self.buffer[page * self.width + x]
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        out[(page * 8 + bit) * stride + (x >> 3)] |= 0x80 >> (x & 7)
+        return bytes(out)
+
+    def to_image(self):
+        from PIL import Image
+        return Image.frombytes("1", self.size, self.tobytes())
@@ -0,0 +1,53 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# check_results.py - PASS/FAIL bookkeeping for the test scripts
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: check_results.py
+# Description: check() prints a PASS or FAIL line per check and remembers any
+#              failure; finish() prints PASSED or FAILED and exits with the
+#              matching status. Shared by the src/test_*.py scripts.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   The scripts stop every thread they start (display bus threads, job queue
+#   fetch thread, in-process collector worker) before calling finish(), so a
+#   plain sys.exit() is enough.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import sys                  # Used for the exit status
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Global Variables
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+ok = True                   # False once any check failed
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def check(label, result) -> bool:
+    """
+    Print a PASS/FAIL line for label and return result.
+    """
+    global ok
+    result = bool(result)
+    print(f"{'PASS' if result else 'FAIL'}: {label}")
+    ok &= result
+    return result
+
+def finish():
+    """
+    Print the overall result and exit with 0 if every check passed, 1 otherwise.
+    """
+    print("PASSED" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
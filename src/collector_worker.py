@@ -0,0 +1,692 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# collector_worker.py - System info and printer collectors in a separate process
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: collector_worker.py
+# Description: The shell commands behind System Info and the CUPS printer poll
+#              run in a worker process, so they never hold the GIL of the
+#              render loop. The System Info commands only run while the UI
+#              shows a System Info page. The worker publishes fixed-layout snapshots into a
+#              multiprocessing.shared_memory segment guarded by a seqlock. The
+#              UI reads them without locks, and only unpacks when the sequence
+#              number moved. While the UI shows a printing printer's page, the
+#              worker also follows the progress of its job (job_progress.py).
+#              With a spool watcher (spool_watcher.py), printers are polled
+#              right after a job arrives or finishes, and only every
+#              COLLECTOR_PRINTER_SAFETY_INTERVAL while nothing is printing.
+#
+# Usage:
+#   Started by CollectorSupervisor.start(). To run it by hand:
+#   python src/collector_worker.py --shm cups_hat_collectors --printers Brother_HL
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Segment layout (little-endian):
+#       header:  magic 'CSN1' | layout (u16) | max printers (u16) | seq (u32) | crc32 of payload (u32)
+#                | worker pid (u32) | progress request (u8) | sysinfo request (u8) | pad | worker heartbeat (f64)
+#                | reader heartbeat (f64) | worker config (u32) | pad
+#       payload: system info (COLLECTOR_SYSINFO), printer poll (COLLECTOR_PRINTERS),
+#                COLLECTOR_MAX_PRINTERS x COLLECTOR_PRINTER, then job progress (COLLECTOR_PROGRESS)
+#   The progress request is the index of the printer whose job progress the UI
+#   shows, or COLLECTOR_PROGRESS_NONE. The sysinfo request is 1 while the UI
+#   shows a System Info page. Only the UI writes the requests.
+#   The worker config is config_hash() of the arguments the worker was started
+#   with. Only the worker writes it; a UI with another configuration replaces
+#   the worker instead of adopting it.
+#   Seqlock: the worker makes seq odd, writes the payload and its crc32, then
+#   makes seq even. A reader retries if seq was odd, moved while it read, or
+#   the crc32 doesn't match. The crc32 also catches torn reads that a weakly
+#   ordered CPU could let through, since Python can't issue memory barriers.
+#   Heartbeats are time.monotonic(), which is the same clock in both processes.
+#   The worker runs in its own session and outlives a crashed UI. A restarted UI
+#   adopts it. The worker exits once no UI has read for COLLECTOR_ORPHAN_TIMEOUT.
+#   The UI restarts a dead or hung worker with backoff, showing the last
+#   snapshot in the meantime.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import argparse             # Used for the worker command line
+import os                   # Used to check on the worker pid
+import select               # Used to wait on the spool watcher
+import signal               # Used to stop a hung worker
+import struct               # Used for the snapshot layout
+import subprocess           # Used to start the worker and run the shell commands
+import sys                  # Used to find the interpreter for the worker
+import time                 # Used for heartbeats and intervals
+import zlib                 # Used to checksum the payload
+
+from multiprocessing import resource_tracker, shared_memory
+
+import ipp_client
+import job_progress
+import printer_status
+import spool_watcher
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+COLLECTOR_SHM_NAME = "cups_hat_collectors"
+COLLECTOR_MAGIC = b"CSN1"
+COLLECTOR_LAYOUT = 4                # Bump whenever the structs below change
+COLLECTOR_MAX_PRINTERS = 8
+
+COLLECTOR_HEADER = struct.Struct("<4sHHIIIBB2xddI4x")
+COLLECTOR_SEQ_OFFSET = 8
+COLLECTOR_CRC_OFFSET = 12
+COLLECTOR_PID_OFFSET = 16
+COLLECTOR_PROGRESS_REQUEST_OFFSET = 20
+COLLECTOR_SYSINFO_REQUEST_OFFSET = 21
+COLLECTOR_HEARTBEAT_OFFSET = 24
+COLLECTOR_READER_HEARTBEAT_OFFSET = 32
+COLLECTOR_CONFIG_OFFSET = 40       # config_hash() of the arguments the worker was started with
+COLLECTOR_SYSINFO = struct.Struct("<d40s16s24s40s16s")     # time, ip, temperature, uptime, memusage, cpuload
+COLLECTOR_PRINTERS = struct.Struct("<d??B5x")              # time, has polled, is reachable, count
+COLLECTOR_PRINTER = struct.Struct("<32s?B?xH96s64s")       # name, found, state, accepting, queued jobs, reasons, message
+COLLECTOR_PROGRESS = struct.Struct("<dBB2xI32sIIIIII")     # time, printer index, job state, job id, job name,
+                                                            # sheets done/total, impressions done/total, k-octets done/total
+COLLECTOR_PROGRESS_NONE = 0xFF
+COLLECTOR_PAYLOAD_OFFSET = COLLECTOR_HEADER.size
+COLLECTOR_PRINTERS_OFFSET = COLLECTOR_PAYLOAD_OFFSET + COLLECTOR_SYSINFO.size
+COLLECTOR_PROGRESS_OFFSET = COLLECTOR_PRINTERS_OFFSET + COLLECTOR_PRINTERS.size + COLLECTOR_MAX_PRINTERS * COLLECTOR_PRINTER.size
+COLLECTOR_PAYLOAD_SIZE = COLLECTOR_PROGRESS_OFFSET + COLLECTOR_PROGRESS.size - COLLECTOR_PAYLOAD_OFFSET
+COLLECTOR_SHM_SIZE = COLLECTOR_HEADER.size + COLLECTOR_PAYLOAD_SIZE
+
+COLLECTOR_READ_RETRIES = 5
+
+COLLECTOR_SYSINFO_INTERVAL = 1.0        # Seconds between runs of the System Info commands while the page is shown
+COLLECTOR_PRINTER_INTERVAL = 2.0        # Seconds between printer polls (one IPP request)
+COLLECTOR_PRINTER_SAFETY_INTERVAL = 30.0    # Seconds between printer polls while the spool watcher
+                                            # is running and no printer is busy or has jobs queued
+COLLECTOR_HEARTBEAT_INTERVAL = 0.5      # Longest the worker sleeps without a heartbeat
+COLLECTOR_COMMAND_TIMEOUT = 5           # Seconds per shell command
+COLLECTOR_STALE_TIMEOUT = 15.0          # A worker without a heartbeat for this long is hung
+COLLECTOR_ORPHAN_TIMEOUT = 60.0         # The worker exits when no UI read for this long
+COLLECTOR_RESTART_DELAY_MIN = 0.5       # Seconds before restarting a dead worker
+COLLECTOR_RESTART_DELAY_MAX = 30.0      # Backoff is doubled up to this limit
+
+# Commands behind the System Info pages, moved here from CUPS_Hat.run_sys_info_commands().
+COLLECTOR_SYSINFO_COMMANDS = {
+    "sys_ip_address":   "hostname -I | cut -d' ' -f1",
+    "sys_temperature":  "vcgencmd measure_temp | awk \'{split($0,a,\"=\"); print a[2]}\'",
+    "sys_uptime":       "uptime | awk \'NR==1{printf \"%s\", $3}\' | awk \'{split($0,a,\":\"); print a[1], a[2]}\' | awk \'{split($0,a,\",\"); print a[1]}\' | awk \'{split($0,a,\" \"); printf \"%sh %sm\", a[1], a[2]}\'",
+    "sys_memusage":     "free -m | awk 'NR==2{printf \"Mem: %s/%s MB\", $3,$2 }'",
+    "sys_cpuload":      'cut -f 1 -d " " /proc/loadavg',
+}
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def open_segment(name, create=False) -> shared_memory.SharedMemory:
+    """
+    Open the segment without the multiprocessing resource tracker, which would
+    unlink it when either process exits. CollectorSupervisor.stop() unlinks it.
+    """
+    size = COLLECTOR_SHM_SIZE if create else 0
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create=create, size=size, track=False)
+
+    # Older versions always track, take it back out.
+    shm = shared_memory.SharedMemory(name, create=create, size=size)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+def unlink_segment(shm: shared_memory.SharedMemory):
+    if sys.version_info < (3, 13):
+        # unlink() unregisters from the tracker on these versions, which must know the name.
+        resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+
+def config_hash(printer_names, printer_interval, sysinfo_interval, spool_dirs) -> int:
+    """
+    Checksum of the worker's configuration. A UI only adopts a running worker
+    whose configuration matches its own.
+    """
+    config = repr((list(printer_names), float(printer_interval), float(sysinfo_interval), list(spool_dirs)))
+    return zlib.crc32(config.encode("utf-8"))
+
+def pack_str(text, size) -> bytes:
+    return str(text).encode("utf-8")[:size]
+
+def unpack_str(data) -> str:
+    return data.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+def is_worker_pid(pid) -> bool:
+    """
+    True if pid is a running collector worker. The pid in the segment may have
+    been reused by something else since the worker died.
+    """
+    if pid <= 0:
+        return False
+    if os.path.isdir("/proc/self"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                return os.path.basename(__file__).encode() in f.read()
+        except OSError:
+            return False
+
+    # No procfs, only check that the pid exists.
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class CollectorSnapshot:
+    def __init__(self):
+        self.seq = 0
+        self.sysinfo_time = 0.0         # time.monotonic() of the last System Info run, 0 if none yet
+        self.sys_ip_address = ""
+        self.sys_temperature = ""
+        self.sys_uptime = ""
+        self.sys_memusage = ""
+        self.sys_cpuload = ""
+        self.printers_time = 0.0        # time.monotonic() of the last printer poll, 0 if none yet
+        self.is_reachable = False
+        self.printers = []              # printer_status.PrinterInfo, in the configured order
+        self.progress_time = 0.0        # time.monotonic() of the last progress poll
+        self.progress_printer = None    # Index of the printer progress is for, None if not followed
+        self.progress = None            # job_progress.JobProgress of its active job, None if none
+
+    def apply_printers(self, monitor: printer_status.PrinterMonitor):
+        """
+        Copy the polled printers into monitor, matched by name.
+        """
+        monitor.is_reachable = self.is_reachable
+        polled = {p.name: p for p in self.printers}
+        for printer in monitor.printers:
+            info = polled.get(printer.name)
+            if info is None:
+                continue
+            printer.is_found = info.is_found
+            printer.state = info.state
+            printer.state_reasons = info.state_reasons
+            printer.state_message = info.state_message
+            printer.is_accepting = info.is_accepting
+            printer.queued_job_count = info.queued_job_count
+
+class SnapshotWriter:
+    def __init__(self, shm: shared_memory.SharedMemory, config=0):
+        """
+        Worker side of the segment. There must be only one writer.
+        config is the config_hash() of the worker's arguments.
+        """
+        self.shm = shm
+        self.buf = shm.buf
+        self.seq = struct.unpack_from("<I", self.buf, COLLECTOR_SEQ_OFFSET)[0] & ~1     # A writer that died mid-write left seq odd
+        struct.pack_into("<I", self.buf, COLLECTOR_CONFIG_OFFSET, config)
+        struct.pack_into("<I", self.buf, COLLECTOR_PID_OFFSET, os.getpid())
+
+    def heartbeat(self, now=None):
+        struct.pack_into("<d", self.buf, COLLECTOR_HEARTBEAT_OFFSET, time.monotonic() if now is None else now)
+
+    def reader_heartbeat(self) -> float:
+        return struct.unpack_from("<d", self.buf, COLLECTOR_READER_HEARTBEAT_OFFSET)[0]
+
+    def progress_request(self):
+        """
+        Index of the printer whose job progress the UI wants, or None.
+        """
+        index = self.buf[COLLECTOR_PROGRESS_REQUEST_OFFSET]
+        return None if index == COLLECTOR_PROGRESS_NONE else index
+
+    def sysinfo_request(self) -> bool:
+        """
+        True while the UI shows a System Info page.
+        """
+        return self.buf[COLLECTOR_SYSINFO_REQUEST_OFFSET] != 0
+
+    def write(self, snapshot: CollectorSnapshot):
+        buf = self.buf
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        struct.pack_into("<I", buf, COLLECTOR_SEQ_OFFSET, self.seq)         # Odd: write in progress
+
+        COLLECTOR_SYSINFO.pack_into(buf, COLLECTOR_PAYLOAD_OFFSET, snapshot.sysinfo_time,
+            pack_str(snapshot.sys_ip_address, 40), pack_str(snapshot.sys_temperature, 16),
+            pack_str(snapshot.sys_uptime, 24), pack_str(snapshot.sys_memusage, 40), pack_str(snapshot.sys_cpuload, 16))
+        printers = snapshot.printers[:COLLECTOR_MAX_PRINTERS]
+        COLLECTOR_PRINTERS.pack_into(buf, COLLECTOR_PRINTERS_OFFSET, snapshot.printers_time,
+                                     snapshot.printers_time > 0, snapshot.is_reachable, len(printers))
+        offset = COLLECTOR_PRINTERS_OFFSET + COLLECTOR_PRINTERS.size
+        for p in printers:
+            COLLECTOR_PRINTER.pack_into(buf, offset, pack_str(p.name, 32), p.is_found, p.state & 0xFF,
+                bool(p.is_accepting), min(p.queued_job_count, 0xFFFF),
+                pack_str(",".join(p.state_reasons), 96), pack_str(p.state_message, 64))
+            offset += COLLECTOR_PRINTER.size
+
+        progress = snapshot.progress if snapshot.progress is not None else job_progress.JobProgress()
+        printer_index = snapshot.progress_printer if snapshot.progress_printer is not None else COLLECTOR_PROGRESS_NONE
+        COLLECTOR_PROGRESS.pack_into(buf, COLLECTOR_PROGRESS_OFFSET, snapshot.progress_time, printer_index,
+            progress.state & 0xFF, progress.job_id, pack_str(progress.name, 32),
+            progress.sheets_completed, progress.sheets, progress.impressions_completed, progress.impressions,
+            progress.k_octets_processed, progress.k_octets)
+
+        crc = zlib.crc32(buf[COLLECTOR_PAYLOAD_OFFSET:COLLECTOR_SHM_SIZE])
+        struct.pack_into("<I", buf, COLLECTOR_CRC_OFFSET, crc)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        struct.pack_into("<I", buf, COLLECTOR_SEQ_OFFSET, self.seq)         # Even: consistent
+
+class SnapshotReader:
+    def __init__(self, shm: shared_memory.SharedMemory):
+        """
+        UI side of the segment. read() never blocks the worker.
+        """
+        self.shm = shm
+        self.buf = shm.buf
+        self.snapshot = None
+        self.torn_reads = 0     # Reads retried because the worker was writing
+
+    def header(self) -> tuple:
+        """
+        (magic, layout, max printers, seq, crc, worker pid, progress request, worker heartbeat, reader heartbeat, worker config)
+        """
+        return COLLECTOR_HEADER.unpack_from(self.buf)
+
+    def worker_pid(self) -> int:
+        return struct.unpack_from("<I", self.buf, COLLECTOR_PID_OFFSET)[0]
+
+    def worker_config(self) -> int:
+        return struct.unpack_from("<I", self.buf, COLLECTOR_CONFIG_OFFSET)[0]
+
+    def worker_heartbeat(self) -> float:
+        return struct.unpack_from("<d", self.buf, COLLECTOR_HEARTBEAT_OFFSET)[0]
+
+    def heartbeat(self):
+        struct.pack_into("<d", self.buf, COLLECTOR_READER_HEARTBEAT_OFFSET, time.monotonic())
+
+    def request_progress(self, printer_index):
+        """
+        Ask the worker to follow the job progress of printer_index, None to stop.
+        """
+        self.buf[COLLECTOR_PROGRESS_REQUEST_OFFSET] = COLLECTOR_PROGRESS_NONE if printer_index is None else printer_index
+
+    def request_sysinfo(self, is_shown):
+        """
+        Ask the worker to run the System Info commands, or to stop running them.
+        """
+        self.buf[COLLECTOR_SYSINFO_REQUEST_OFFSET] = 1 if is_shown else 0
+
+    def read(self) -> CollectorSnapshot:
+        """
+        The latest consistent snapshot, or the previous one if the worker kept
+        writing through every retry. None until the worker published once.
+        Only unpacks when the sequence number moved since the last call.
+        """
+        buf = self.buf
+        for _ in range(COLLECTOR_READ_RETRIES):
+            seq, crc = struct.unpack_from("<II", buf, COLLECTOR_SEQ_OFFSET)
+            if self.snapshot is not None and seq == self.snapshot.seq:
+                return self.snapshot
+            if seq == 0:
+                return None
+            if seq & 1:
+                self.torn_reads += 1
+                continue
+
+            snapshot = self._unpack(seq)
+            if zlib.crc32(buf[COLLECTOR_PAYLOAD_OFFSET:COLLECTOR_SHM_SIZE]) != crc or \
+               struct.unpack_from("<I", buf, COLLECTOR_SEQ_OFFSET)[0] != seq:
+                self.torn_reads += 1
+                continue
+
+            self.snapshot = snapshot
+            return snapshot
+        return self.snapshot
+
+    def _unpack(self, seq) -> CollectorSnapshot:
+        buf = self.buf
+        snapshot = CollectorSnapshot()
+        snapshot.seq = seq
+        fields = COLLECTOR_SYSINFO.unpack_from(buf, COLLECTOR_PAYLOAD_OFFSET)
+        snapshot.sysinfo_time = fields[0]
+        (snapshot.sys_ip_address, snapshot.sys_temperature, snapshot.sys_uptime,
+         snapshot.sys_memusage, snapshot.sys_cpuload) = [unpack_str(f) for f in fields[1:]]
+
+        snapshot.printers_time, has_polled, snapshot.is_reachable, count = \
+            COLLECTOR_PRINTERS.unpack_from(buf, COLLECTOR_PRINTERS_OFFSET)
+        offset = COLLECTOR_PRINTERS_OFFSET + COLLECTOR_PRINTERS.size
+        for _ in range(min(count, COLLECTOR_MAX_PRINTERS)):
+            name, is_found, state, is_accepting, queued, reasons, message = COLLECTOR_PRINTER.unpack_from(buf, offset)
+            printer = printer_status.PrinterInfo(unpack_str(name))
+            printer.is_found = is_found
+            printer.state = state
+            printer.is_accepting = is_accepting
+            printer.queued_job_count = queued
+            printer.state_reasons = [r for r in unpack_str(reasons).split(",") if r]
+            printer.state_message = unpack_str(message)
+            snapshot.printers.append(printer)
+            offset += COLLECTOR_PRINTER.size
+
+        (snapshot.progress_time, printer_index, state, job_id, name, sheets_completed, sheets,
+         impressions_completed, impressions, k_octets_processed, k_octets) = \
+            COLLECTOR_PROGRESS.unpack_from(buf, COLLECTOR_PROGRESS_OFFSET)
+        if printer_index != COLLECTOR_PROGRESS_NONE:
+            snapshot.progress_printer = printer_index
+        if job_id != 0:
+            progress = job_progress.JobProgress(job_id, unpack_str(name), state)
+            progress.sheets_completed, progress.sheets = sheets_completed, sheets
+            progress.impressions_completed, progress.impressions = impressions_completed, impressions
+            progress.k_octets_processed, progress.k_octets = k_octets_processed, k_octets
+            snapshot.progress = progress
+        return snapshot
+
+class CollectorSupervisor:
+    def __init__(self, printer_names, printer_interval=COLLECTOR_PRINTER_INTERVAL, name=COLLECTOR_SHM_NAME,
+                 stale_timeout=COLLECTOR_STALE_TIMEOUT, spool_dirs=(), sysinfo_interval=COLLECTOR_SYSINFO_INTERVAL):
+        """
+        UI side: owns the segment, starts the worker and restarts it if it dies or hangs.
+        spool_dirs are watched by the worker for job files, see spool_watcher.py.
+        """
+        self.printer_names = list(printer_names)
+        self.printer_interval = printer_interval
+        self.sysinfo_interval = sysinfo_interval
+        self.spool_dirs = list(spool_dirs)
+        self.name = name
+        self.stale_timeout = stale_timeout
+        self.shm = None
+        self.reader = None
+        self.process = None         # Popen of a worker this UI started, None if adopted
+        self.restart_delay = COLLECTOR_RESTART_DELAY_MIN
+        self.next_restart_time = 0
+        self.restarts = 0
+        self.spawn_time = 0
+        self.progress_request = None
+        self.sysinfo_request = False
+
+    def start(self):
+        """
+        Attach to the segment of a worker still running from an earlier UI
+        session, or create the segment and start a new worker. A running worker
+        started with other printers, intervals or spool directories is replaced.
+        """
+        try:
+            self.shm = open_segment(self.name)
+            magic, layout, max_printers = COLLECTOR_HEADER.unpack_from(self.shm.buf)[:3]
+            if self.shm.size < COLLECTOR_SHM_SIZE or (magic, layout, max_printers) != (COLLECTOR_MAGIC, COLLECTOR_LAYOUT, COLLECTOR_MAX_PRINTERS):
+                # Left behind by another version, start over.
+                self._kill(struct.unpack_from("<I", self.shm.buf, COLLECTOR_PID_OFFSET)[0])
+                self.shm.close()
+                unlink_segment(self.shm)
+                self.shm = None
+        except FileNotFoundError:
+            self.shm = None
+
+        if self.shm is None:
+            self.shm = open_segment(self.name, create=True)
+            COLLECTOR_HEADER.pack_into(self.shm.buf, 0, COLLECTOR_MAGIC, COLLECTOR_LAYOUT, COLLECTOR_MAX_PRINTERS, 0, 0, 0,
+                                       COLLECTOR_PROGRESS_NONE, 0, 0.0, 0.0, 0)
+
+        self.reader = SnapshotReader(self.shm)
+        self.reader.heartbeat()
+        self.reader.request_progress(self.progress_request)
+        self.reader.request_sysinfo(self.sysinfo_request)
+        if not self.is_worker_healthy():
+            self._spawn()
+        elif self.reader.worker_config() != self.config_hash():
+            print("Collector worker was started with another configuration, restarting it")
+            self._kill(self.reader.worker_pid())
+            self._spawn()
+
+    def config_hash(self) -> int:
+        return config_hash(self.printer_names, self.printer_interval, self.sysinfo_interval, self.spool_dirs)
+
+    def read(self) -> CollectorSnapshot:
+        """
+        Latest snapshot, None until the worker published once.
+        """
+        if self.reader is None:
+            return None
+        self.reader.heartbeat()
+        return self.reader.read()
+
+    def request_progress(self, printer_index):
+        """
+        Follow the job progress of printer_index while it is printing, None to stop.
+        Call whenever the page shown changes; it only writes to the segment on a change.
+        """
+        if printer_index == self.progress_request:
+            return
+        self.progress_request = printer_index
+        if self.reader is not None:
+            self.reader.request_progress(printer_index)
+
+    def request_sysinfo(self, is_shown):
+        """
+        Run the System Info commands while is_shown, e.g. while a System Info page is shown.
+        Call whenever the page shown changes; it only writes to the segment on a change.
+        """
+        if is_shown == self.sysinfo_request:
+            return
+        self.sysinfo_request = is_shown
+        if self.reader is not None:
+            self.reader.request_sysinfo(is_shown)
+
+    def printer_interval_max(self) -> float:
+        """
+        Longest time the worker may go between printer polls.
+        """
+        if self.spool_dirs:
+            return max(self.printer_interval, COLLECTOR_PRINTER_SAFETY_INTERVAL)
+        return self.printer_interval
+
+    def is_worker_healthy(self) -> bool:
+        pid = self.reader.worker_pid()
+        if self.process is not None:
+            if self.process.poll() is not None:
+                return False
+            pid = self.process.pid
+        elif not is_worker_pid(pid):
+            return False
+
+        # A worker that was just started gets stale_timeout to publish its first heartbeat.
+        heartbeat = max(self.reader.worker_heartbeat(), self.spawn_time if self.process is not None else 0)
+        return time.monotonic() - heartbeat < self.stale_timeout
+
+    def supervise(self):
+        """
+        Restart the worker with backoff if it died or stopped sending heartbeats.
+        Call periodically from the main loop.
+        """
+        if self.reader is None:
+            return
+        if self.is_worker_healthy():
+            if self.reader.worker_heartbeat() > self.spawn_time:
+                self.restart_delay = COLLECTOR_RESTART_DELAY_MIN
+            return
+
+        now = time.monotonic()
+        if now < self.next_restart_time:
+            return
+        print(f"Collector worker not responding, restarting in the background (retry in {self.restart_delay:.1f}s if it fails)")
+        self._kill(self.process.pid if self.process is not None else self.reader.worker_pid())
+        self._spawn()
+        self.restarts += 1
+        self.next_restart_time = now + self.restart_delay
+        self.restart_delay = min(self.restart_delay * 2, COLLECTOR_RESTART_DELAY_MAX)
+
+    def stop(self):
+        """
+        Stop the worker and remove the segment. Called when the app exits cleanly.
+        """
+        if self.reader is None:
+            return
+        self._kill(self.process.pid if self.process is not None else self.reader.worker_pid())
+        self.reader.buf = None
+        self.reader = None
+        self.shm.close()
+        unlink_segment(self.shm)
+        self.shm = None
+
+    def _spawn(self):
+        args = [sys.executable, os.path.abspath(__file__), "--shm", self.name,
+                "--printers", ",".join(self.printer_names), "--printer-interval", str(self.printer_interval),
+                "--sysinfo-interval", str(self.sysinfo_interval),
+                "--spool-dirs", os.pathsep.join(self.spool_dirs)]
+        # Own session: a Ctrl-C or crash of the UI doesn't take the worker down.
+        self.process = subprocess.Popen(args, start_new_session=True)
+        self.spawn_time = time.monotonic()
+
+    def _kill(self, pid):
+        if self.process is not None and self.process.pid == pid:
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.wait()
+            self.process = None
+        elif is_worker_pid(pid):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Worker process
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def run_sys_info_commands(snapshot: CollectorSnapshot):
+    for attr, command in COLLECTOR_SYSINFO_COMMANDS.items():
+        try:
+            output = subprocess.check_output(command, shell=True, stderr=subprocess.DEVNULL,
+                                             timeout=COLLECTOR_COMMAND_TIMEOUT).decode("utf-8")
+        except (subprocess.SubprocessError, OSError):
+            output = "N/A"
+        setattr(snapshot, attr, output)
+    snapshot.sysinfo_time = time.monotonic()
+
+def run_printer_poll(snapshot: CollectorSnapshot, monitor: printer_status.PrinterMonitor):
+    try:
+        monitor.poll()
+    except (OSError, ValueError, ipp_client.IPPError) as err:
+        print(f"Printer status poll failed: {err}")
+    snapshot.is_reachable = monitor.is_reachable
+    snapshot.printers = monitor.printers
+    snapshot.printers_time = time.monotonic()
+
+def run_progress_poll(snapshot: CollectorSnapshot, progress_monitor: job_progress.JobProgressMonitor):
+    try:
+        snapshot.progress = progress_monitor.poll()
+    except (OSError, ValueError, ipp_client.IPPError) as err:
+        print(f"Job progress poll failed: {err}")
+    snapshot.progress_time = time.monotonic()
+
+def is_printers_quiet(monitor: printer_status.PrinterMonitor) -> bool:
+    """
+    True while CUPS is reachable and every printer is idle with no jobs queued.
+    """
+    return monitor.is_reachable and all(
+        p.state == ipp_client.IPP_PRINTER_IDLE and p.queued_job_count == 0 for p in monitor.printers)
+
+def worker_main(name, printer_names, printer_interval=COLLECTOR_PRINTER_INTERVAL,
+                sysinfo_interval=COLLECTOR_SYSINFO_INTERVAL, ipp_port=ipp_client.IPP_DEFAULT_PORT,
+                spool_dirs=(), safety_interval=COLLECTOR_PRINTER_SAFETY_INTERVAL):
+    shm = open_segment(name)
+    writer = SnapshotWriter(shm, config_hash(printer_names, printer_interval, sysinfo_interval, spool_dirs))
+    ipp = ipp_client.IPPClient(port=ipp_port)
+    monitor = printer_status.PrinterMonitor(ipp, printer_names)
+    snapshot = CollectorSnapshot()
+    next_sysinfo = next_printers = time.monotonic()
+
+    # Job files showing up or going away in the spool trigger a printer poll right away.
+    # Polling every printer_interval is then only needed while something is printing.
+    watcher = spool_watcher.create_spool_watcher(spool_dirs)
+
+    # Job progress is only polled while the UI shows a printer that is printing.
+    progress_monitor = None
+    cadence = job_progress.JobProgressCadence()
+    next_progress = float("inf")
+
+    while True:
+        now = time.monotonic()
+        writer.heartbeat(now)
+        if now - writer.reader_heartbeat() > COLLECTOR_ORPHAN_TIMEOUT:
+            print("Collector worker: no UI for a while, exiting")
+            break
+
+        changed = False
+        is_sysinfo_shown = writer.sysinfo_request()
+        if is_sysinfo_shown and now >= next_sysinfo:
+            run_sys_info_commands(snapshot)
+            next_sysinfo = now + sysinfo_interval
+            changed = True
+        if now >= next_printers:
+            run_printer_poll(snapshot, monitor)
+            if watcher is not None and watcher.is_active() and is_printers_quiet(monitor):
+                next_printers = now + safety_interval
+            else:
+                next_printers = now + printer_interval
+            changed = True
+
+        index = writer.progress_request()
+        printer = monitor.printers[index] if index is not None and index < len(monitor.printers) else None
+        is_printing = printer is not None and printer.state == ipp_client.IPP_PRINTER_PROCESSING
+        if not is_printing:
+            if progress_monitor is not None or snapshot.progress_printer is not None:
+                progress_monitor = None
+                snapshot.progress_printer = snapshot.progress = None
+                next_progress = float("inf")
+                changed = True
+        else:
+            if progress_monitor is None or progress_monitor.printer_name != printer.name:
+                progress_monitor = job_progress.JobProgressMonitor(ipp, printer.name)
+                snapshot.progress_printer, snapshot.progress = index, None
+                cadence.reset()
+                next_progress = now
+            if now >= next_progress:
+                run_progress_poll(snapshot, progress_monitor)
+                next_progress = now + cadence.next_interval(snapshot.progress)
+                if snapshot.progress is None:
+                    # The job finished, refresh the printer state right away.
+                    next_printers = now
+                changed = True
+
+        if changed:
+            writer.write(snapshot)
+            writer.heartbeat()
+
+        # A System Info page opened since is picked up within COLLECTOR_HEARTBEAT_INTERVAL.
+        next_wake = min(next_sysinfo if is_sysinfo_shown else float("inf"), next_printers, next_progress,
+                        time.monotonic() + COLLECTOR_HEARTBEAT_INTERVAL)
+        timeout = max(0, next_wake - time.monotonic())
+        if watcher is None or not watcher.is_active():
+            time.sleep(timeout)
+            continue
+
+        readable, _, _ = select.select([watcher], [], [], timeout)
+        if readable and watcher.read_events():
+            # A job arrived, changed state or finished. Poll once CUPS is done writing its files.
+            wake = time.monotonic() + spool_watcher.SPOOL_SETTLE_TIME
+            next_printers = min(next_printers, wake)
+            if progress_monitor is not None:
+                next_progress = min(next_progress, wake)
+
+    if watcher is not None:
+        watcher.close()
+    writer.buf = None
+    shm.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Collector worker for the CUPS Hat")
+    parser.add_argument("--shm", default=COLLECTOR_SHM_NAME, help="shared memory segment created by the UI")
+    parser.add_argument("--printers", default="", help="comma separated CUPS queue names")
+    parser.add_argument("--printer-interval", type=float, default=COLLECTOR_PRINTER_INTERVAL)
+    parser.add_argument("--sysinfo-interval", type=float, default=COLLECTOR_SYSINFO_INTERVAL)
+    parser.add_argument("--ipp-port", type=int, default=ipp_client.IPP_DEFAULT_PORT)
+    parser.add_argument("--spool-dirs", default="", help=f"'{os.pathsep}' separated CUPS spool directories to watch")
+    parser.add_argument("--printer-safety-interval", type=float, default=COLLECTOR_PRINTER_SAFETY_INTERVAL)
+    args = parser.parse_args()
+    worker_main(args.shm, [p for p in args.printers.split(",") if p], args.printer_interval, args.sysinfo_interval,
+                args.ipp_port, [d for d in args.spool_dirs.split(os.pathsep) if d], args.printer_safety_interval)
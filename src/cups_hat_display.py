@@ -19,14 +19,27 @@
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
 import time                 # Used for delays
-import subprocess           # Used for getting outputs of shell commands
 import busio                # Used for the I2C bus
 import adafruit_ssd1306     # Used to drive the SSD1306 OLED
 import RPi.GPIO as io       # Used to setup IO on the Pi Zero 2
 import enum                 # Used to create enumerations
 import os                   # Used to execute shell commands
-
-from PIL import Image, ImageDraw, ImageFont, ImageOps     # Used for image processing
+import threading            # Used to submit the test page in the background
+import oled_mirror          # Used to stream the framebuffer for remote support
+import frame_recorder       # Used to record the frames shown on the OLED
+import ipp_client           # Used to query CUPS over IPP
+import job_queue            # Used for the paginated job queue screen
+import printer_status       # Used to monitor all configured CUPS queues
+import display_manager      # Used to drive one or more OLED panels
+import led_patterns         # Used to run status patterns on the LEDs
+import gpio_input           # Used to read the buttons
+import bitmap_font          # Used to draw text without FreeType
+import bitplane             # Used to composite the main screen in SSD1306 page order
+import widgets              # Used to redraw only the parts of the menu that changed
+import collector_worker     # Used to run the shell commands and printer polls in another process
+import asset_store          # Used to keep the icons as packed bytes
+
+from PIL import Image, ImageDraw, ImageFont     # Used for image processing
 from board import SCL, SDA                      # Used with the I2C bus.
 
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
@@ -43,6 +56,21 @@ OLED_TEXT_BOX_HEIGHT = 26
 OLED_SUBMENU_TEXT_BOX_WIDTH = 108
 OLED_SUBMENU_TEXT_BOX_HEIGHT = 26
 
+OLED_PROGRESS_BAR_WIDTH = 108
+OLED_PROGRESS_BAR_HEIGHT = 6
+
+OLED_LABEL_FONT = ("fonts/PixelOperator.ttf", 16)   # Font of the main menu labels
+OLED_STARTUP_LABEL = "Welcome!\nStartup!"
+OLED_SHUTDOWN_LABEL = "Goodbye!\nShutdown!"
+OLED_PRINT_TEST_SENDING_LABEL = "Sending\nTest Page"
+OLED_PRINT_TEST_SENT_LABEL = "Test Page\nSent"
+OLED_PRINT_TEST_FAILED_LABEL = "Test Page\nFailed"
+OLED_PRINT_TEST_RESULT_TIME = 3.0       # Seconds the result of a test print is shown
+
+# Low memory mode, for boards where CUPS needs the RAM. See CUPS_Hat(low_memory=True).
+LOW_MEMORY_VALUE_CACHE_SIZE = 4         # Sub-menu text boxes kept, most are System Info values that change anyway
+LOW_MEMORY_JOB_ROW_CACHE_SIZE = 2 * job_queue.JOBQ_ROWS_PER_PAGE
+
 # Define X-Y COORDS Constants
 # TODO: FINISH THESE DEFINES
 POS_OLED_ICON = (14, 8)         # for the icon
@@ -50,12 +78,37 @@ POS_OLED_NAVI_LEFT = (1, 12)
 POS_OLED_NAVI_RIGHT = (119, 12)
 POS_OLED_TEXT_BOX = (36, 5)
 POS_OLED_SUBMENU_TEXT_BOX = (10, 3)
+POS_OLED_PROGRESS_BAR = (10, 20)        # Below the first two lines of the sub-menu text box
 
 POS_OLED_TEXT_BOX_LINE1 = (3, -2)
 POS_OLED_TEXT_BOX_LINE2 = (3, 9)
 
 POS_OLED_SUBMENU_TEXT_BOX_LINE1 = (0, -2)
 
+# Main panel on the default I2C bus (SCL/SDA). 0 = flush on every oled_update().
+OLED_MAIN_BUS = 1
+OLED_MAIN_ADDRESS = 0x3C
+OLED_MAIN_REFRESH_INTERVAL = 0
+
+# Extra panels showing queue status, e.g.
+# {"name": "queue", "bus": 3, "address": 0x3D, "width": 128, "height": 32, "refresh_interval": 1.0}
+# Panels on buses other than OLED_MAIN_BUS need the adafruit-circuitpython-extended-bus package.
+OLED_EXTRA_PANELS = []
+
+# CUPS queues managed by the hat. All of them are refreshed with one IPP request per poll.
+CUPS_PRINTER_NAMES = [
+    "WiFi_HP_Ink_Tank_115",
+]
+CUPS_TEST_PAGE_PATH = "/usr/share/cups/data/testprint"
+
+# Spool and state directories watched with inotify for jobs arriving and finishing (see spool_watcher.py).
+# Printers are then polled right away, and otherwise only as a safety net while nothing is printing.
+# Empty to poll every tick_rate_printer_status instead.
+CUPS_SPOOL_DIRS = [
+    "/var/spool/cups",      # Job control and data files
+    "/var/cache/cups",      # job.cache, saved when jobs change state
+]
+
 
 # Define menu index constants, for use with current_menu.
 MENU_MAIN_REBOOT            = 0
@@ -64,8 +117,9 @@ MENU_MAIN_SHUTDOWN          = 2
 MENU_MAIN_PRINTER_INFO      = 3
 MENU_MAIN_SYS_INFO          = 4
 MENU_MAIN_PRINTER_OPTIONS   = 5
+MENU_MAIN_JOB_QUEUE         = 6
 MENU_MAIN_FIRST             = MENU_MAIN_REBOOT
-MENU_MAIN_LAST              = MENU_MAIN_PRINTER_OPTIONS
+MENU_MAIN_LAST              = MENU_MAIN_JOB_QUEUE
 MENU_MAIN_LIMIT             = 9         # No additional main menu items beyond this point.
 
 # System Info submenu
@@ -82,6 +136,14 @@ MENU_SUB_PRTOPT_FIRST       = MENU_SUB_PRTOPT_RESUME
 MENU_SUB_PRTOPT_LAST        = MENU_SUB_PRTOPT_GOBACK
 MENU_SUB_PRTOPT_LIMIT       = 29
 
+# Job Queue submenu
+MENU_SUB_JOBQ_LIST          = 30
+MENU_SUB_JOBQ_LIMIT         = 39
+
+# Printer Info submenu, one page per configured printer
+MENU_SUB_PRTINFO_PAGE       = 40
+MENU_SUB_PRTINFO_LIMIT      = 49
+
 # Absolute Limit
 MENU_LIMIT             = 100
 
@@ -92,6 +154,7 @@ ASSET_ICON_POWER         = MENU_MAIN_SHUTDOWN
 ASSET_ICON_PRINTER_INFO  = MENU_MAIN_PRINTER_INFO
 ASSET_ICON_INFO          = MENU_MAIN_SYS_INFO    
 ASSET_ICON_PRINTER_OPT   = MENU_MAIN_PRINTER_OPTIONS
+ASSET_ICON_JOB_QUEUE     = MENU_MAIN_JOB_QUEUE
 ASSET_ICON_RESUME        = MENU_SUB_PRTOPT_RESUME  
 ASSET_ICON_CANCEL        = MENU_SUB_PRTOPT_CANCEL  
 ASSET_ICON_USB           = MENU_SUB_PRTOPT_USBRESET
@@ -112,18 +175,25 @@ if you have any improvement ideas to suggest.
 """
 
 class CUPS_Hat:
-    def __init__(self):
+    def __init__(self, low_memory=False):
         """
-        Define all the attributes
+        Define all the attributes.
+        low_memory keeps fewer rendered sprites, packed only where they are shown, and drops
+        the label font once every label is drawn. The screen looks the same either way.
         """
         #TODO: Initialize some of the attributes below straight from shell commands instead of 0 at first.
         self.is_idle = False        # Bool that indicates whether the system is idle
         self.current_menu = MENU_MAIN_PRINTER_INFO     # Default menu at startup.
         self.is_startup = True      # TODO: Figure out what to do with this.
         self.is_command = False     # Sticky bit that indicates whether a command was executed.
+        self.last_job_id = 0        # Job id of the last job submitted from the hat
+        self.print_test_thread = None       # Submits the test page, see run_command()
+        self.print_test_result = None       # OLED_PRINT_TEST_..._LABEL of the last test print
+        self.print_test_result_time = 0
 
         # System info
-        self.printer_status = 0     # 0 is ok, -1 not ok.
+        self.printer_status = printer_status.PRINTER_STATUS_OK     # Summary of all printers. 0 is ok, 1 busy, -1 not ok.
+        self.printer_info_index = 0 # Printer shown on the Printer Info page
         self.sys_ip_address = 0
         self.sys_temperature = 0
         self.sys_uptime = 0
@@ -143,54 +213,42 @@ class CUPS_Hat:
         io.setup(self.led_green, io.OUT, initial=io.LOW)
         io.setup(self.led_orange, io.OUT, initial=io.LOW)
         io.setup(self.led_red, io.OUT, initial=io.LOW)
-        self.led_state = 0      # For use with toggling LEDs
-
-        # Reference for code below is from link: https://raspberrypihq.com/use-a-push-button-with-raspberry-pi-gpio/
-        # Enable internal pull ups
-        io.setup(self.btn_left, io.IN, pull_up_down=io.PUD_UP)
-        io.setup(self.btn_enter, io.IN, pull_up_down=io.PUD_UP)
-        io.setup(self.btn_right, io.IN, pull_up_down=io.PUD_UP)
-
-        # Register event detection
-        while True:
-            try:
-                io.add_event_detect(self.btn_left, io.FALLING, bouncetime=200)
-            except:
-                pass
-            else:
-                break
-
-        while True:
-            try:
-                io.add_event_detect(self.btn_enter, io.RISING, bouncetime=200)      # Execute command only when button is let go
-            except:
-                pass
-            else:
-                break
 
-        while True:
-            try:
-                io.add_event_detect(self.btn_right, io.FALLING, bouncetime=200)
-            except:
-                pass
-            else:
-                break
+        # Status LED patterns run on kernel LED triggers where available, RPi.GPIO PWM otherwise.
+        self.led_engine = led_patterns.LedPatternEngine(led_patterns.create_leds(io, {
+            led_patterns.LED_GREEN:     self.led_green,
+            led_patterns.LED_ORANGE:    self.led_orange,
+            led_patterns.LED_RED:       self.led_red,
+        }))
+
+        # Buttons are read from the GPIO character device when libgpiod is available
+        # (edge events with kernel timestamps on a pollable fd), or through RPi.GPIO otherwise.
+        self.input = gpio_input.create_input(io, {
+            self.btn_left:  gpio_input.EDGE_FALLING,
+            self.btn_enter: gpio_input.EDGE_RISING,     # Execute command only when button is let go
+            self.btn_right: gpio_input.EDGE_FALLING,
+        })
         
         """ ENDOF Raspberry Pi GPIOs """
 
 
         """ OLED Initialization """
-        self.oled_obj = adafruit_ssd1306.SSD1306_I2C(OLED_WIDTH, OLED_HEIGHT, busio.I2C(SCL, SDA))
-        self.oled_obj.fill(0)
-        self.oled_obj.show()
-
-        # Create framebuffer using Pillow
-        # Make sure to create frameBuffer with mode '1' for 1-bit color.
-        self.img_framebuffer = Image.new("1", (OLED_WIDTH, OLED_HEIGHT))
-        
-        # Get drawing object to draw on frameBuffer & draw black box to clear it.
-        self.img_draw_handle = ImageDraw.Draw(self.img_framebuffer)
-        self.img_draw_handle.rectangle((0, 0, OLED_WIDTH, OLED_HEIGHT), outline=0, fill=0)
+        # Every panel gets its own framebuffer and is flushed by a per-bus thread.
+        # The panels are opened by their bus thread on the first flush, and re-opened
+        # with backoff if they drop off the bus, so a missing OLED never stops the app.
+        self.display_manager = display_manager.DisplayManager()
+        self.display_manager.add_bus(OLED_MAIN_BUS, lambda: busio.I2C(SCL, SDA))
+        self.main_panel = self.display_manager.add_panel(display_manager.Panel(
+            "main", lambda bus: adafruit_ssd1306.SSD1306_I2C(OLED_WIDTH, OLED_HEIGHT, bus, addr=OLED_MAIN_ADDRESS),
+            OLED_MAIN_BUS, OLED_WIDTH, OLED_HEIGHT, OLED_MAIN_REFRESH_INTERVAL, use_bitplane=True))
+
+        self.extra_panels = []
+        for config in OLED_EXTRA_PANELS:
+            self.extra_panels.append(self.display_manager.add_panel(self.create_panel(config)))
+
+        # The main panel's framebuffer is the one the menu draws into. It is a packed
+        # bitplane (see bitplane.py): assets and text boxes are pasted as pre-packed sprites.
+        self.img_framebuffer = self.main_panel.framebuffer
 
         # Create Framebuffer for the text box.
         self.text_framebuffer = Image.new("1", (OLED_TEXT_BOX_WIDTH, OLED_TEXT_BOX_HEIGHT))
@@ -199,60 +257,93 @@ class CUPS_Hat:
         # Create Framebuffer for the sub-menu text box.
         self.submenu_text_framebuffer = Image.new("1", (OLED_SUBMENU_TEXT_BOX_WIDTH, OLED_SUBMENU_TEXT_BOX_HEIGHT))
         self.submenu_text_draw_handle = ImageDraw.Draw(self.submenu_text_framebuffer)
+
+        # Text boxes are only drawn into the framebuffers above when their text changes.
+        self.text_box_cache = bitplane.SpriteCache(self.text_box_render, lazy=low_memory)
+        self.submenu_text_box_cache = bitplane.SpriteCache(self.submenu_text_box_render,
+            LOW_MEMORY_VALUE_CACHE_SIZE if low_memory else bitplane.SPRITE_CACHE_SIZE, lazy=low_memory)
+
+        # Job queue browser, rows are fetched from CUPS in the background.
+        self.ipp = ipp_client.IPPClient()
+        self.job_queue = job_queue.JobQueueBrowser(self.ipp, CUPS_PRINTER_NAMES[0])
+        self.printer_monitor = printer_status.PrinterMonitor(self.ipp, CUPS_PRINTER_NAMES)
+
+        # System info and printer status are collected by a worker process. See start_collectors().
+        self.collectors = collector_worker.CollectorSupervisor(CUPS_PRINTER_NAMES, spool_dirs=CUPS_SPOOL_DIRS)
+        self.printers_time = 0      # Worker time of the printer poll last applied
+
+        # Optional framebuffer mirror and recorder. See enable_mirror() and enable_recorder().
+        self.mirror = None
+        self.recorder = None
         """ ENDOF OLED Initialization """
         
         """ Asset attributes """
-        # Load default font
-        self.img_font = ImageFont.truetype("fonts/PixelOperator.ttf", size=16)
+        # Load default font. Uses the precompiled glyphs from bitmap_font.py if they have been built.
+        self.img_font = bitmap_font.load_font(*OLED_LABEL_FONT)
         self.def_font = ImageFont.load_default()
 
-        # Load all assets
-        self.asset_list = [0] * MENU_LIMIT
-        self.asset_list[ASSET_ICON_REBOOT]          = Image.open("assets/reboot icon.png").convert("1")
-        self.asset_list[ASSET_ICON_PRINTER]         = Image.open("assets/printer icon.png").convert("1")
-        self.asset_list[ASSET_ICON_POWER]           = Image.open("assets/power icon.png").convert("1")
-        self.asset_list[ASSET_ICON_PRINTER_INFO]    = Image.open("assets/printer info icon.png").convert("1")
-        self.asset_list[ASSET_ICON_INFO]            = Image.open("assets/info icon.png").convert("1")
-        self.asset_list[ASSET_ICON_PRINTER_OPT]     = Image.open("assets/printer info icon.png").convert("1")
-        self.asset_list[ASSET_ICON_RESUME]          = Image.open("assets/resume icon.png").convert("1")
-        self.asset_list[ASSET_ICON_CANCEL]          = Image.open("assets/cancel icon.png").convert("1")
-        self.asset_list[ASSET_ICON_USB]             = Image.open("assets/usb icon.png").convert("1")
-        self.asset_list[ASSET_ICON_GOBACK]          = Image.open("assets/go back icon.png").convert("1")
-       
-        self.invert_asset_list = [0] * MENU_LIMIT
-        self.invert_asset_list[ASSET_ICON_REBOOT]          = ImageOps.invert(self.asset_list[ASSET_ICON_REBOOT])
-        self.invert_asset_list[ASSET_ICON_PRINTER]         = ImageOps.invert(self.asset_list[ASSET_ICON_PRINTER])
-        self.invert_asset_list[ASSET_ICON_POWER]           = ImageOps.invert(self.asset_list[ASSET_ICON_POWER])
-        self.invert_asset_list[ASSET_ICON_PRINTER_INFO]    = ImageOps.invert(self.asset_list[ASSET_ICON_PRINTER_INFO])
-        self.invert_asset_list[ASSET_ICON_INFO]            = ImageOps.invert(self.asset_list[ASSET_ICON_INFO])
-        self.invert_asset_list[ASSET_ICON_PRINTER_OPT]     = ImageOps.invert(self.asset_list[ASSET_ICON_PRINTER_OPT])
-        self.invert_asset_list[ASSET_ICON_RESUME]          = ImageOps.invert(self.asset_list[ASSET_ICON_RESUME])
-        self.invert_asset_list[ASSET_ICON_CANCEL]          = ImageOps.invert(self.asset_list[ASSET_ICON_CANCEL])
-        self.invert_asset_list[ASSET_ICON_USB]             = ImageOps.invert(self.asset_list[ASSET_ICON_USB])
-        self.invert_asset_list[ASSET_ICON_GOBACK]          = ImageOps.invert(self.asset_list[ASSET_ICON_GOBACK])
-
-        self.navi_asset_list = [
-            Image.open("assets/right_icon.png").convert("1"),
-            Image.open("assets/left icon.png").convert("1")
-        ]
-
-        self.invert_navi_asset_list = [
-            ImageOps.invert(self.navi_asset_list[ASSET_NAVI_RIGHT]),
-            ImageOps.invert(self.navi_asset_list[ASSET_NAVI_LEFT])
-        ]
-
-        # Initialize first as empty list with specified size
-        self.menu_item_names_list = [0] * MENU_LIMIT
-        self.menu_item_names_list[MENU_MAIN_REBOOT]             = "Reboot"
-        self.menu_item_names_list[MENU_MAIN_PRINT_TEST]         = "Print\nTest Page"
-        self.menu_item_names_list[MENU_MAIN_SHUTDOWN]           = "Shutdown"
-        self.menu_item_names_list[MENU_MAIN_PRINTER_INFO]       = "Printer\nInfo"
-        self.menu_item_names_list[MENU_MAIN_SYS_INFO]           = "System\nInfo"
-        self.menu_item_names_list[MENU_MAIN_PRINTER_OPTIONS]    = "Printer\nOptions"
-        self.menu_item_names_list[MENU_SUB_PRTOPT_RESUME]       = "Resume\nPrinter"
-        self.menu_item_names_list[MENU_SUB_PRTOPT_CANCEL]       = "Cancel All\nJobs"
-        self.menu_item_names_list[MENU_SUB_PRTOPT_USBRESET]     = "Reset\nUSB"
-        self.menu_item_names_list[MENU_SUB_PRTOPT_GOBACK]       = "Go Back to\nMain Menu"
+        # Icons are stored once per file as packed bytes, see asset_store.py.
+        self.icons = asset_store.IconStore({
+            ASSET_ICON_REBOOT:          "assets/reboot icon.png",
+            ASSET_ICON_PRINTER:         "assets/printer icon.png",
+            ASSET_ICON_POWER:           "assets/power icon.png",
+            ASSET_ICON_PRINTER_INFO:    "assets/printer info icon.png",
+            ASSET_ICON_INFO:            "assets/info icon.png",
+            ASSET_ICON_PRINTER_OPT:     "assets/printer info icon.png",
+            ASSET_ICON_JOB_QUEUE:       "assets/printer icon.png",
+            ASSET_ICON_RESUME:          "assets/resume icon.png",
+            ASSET_ICON_CANCEL:          "assets/cancel icon.png",
+            ASSET_ICON_USB:             "assets/usb icon.png",
+            ASSET_ICON_GOBACK:          "assets/go back icon.png",
+        }, low_memory)
+
+        self.navi_icons = asset_store.IconStore({
+            ASSET_NAVI_RIGHT:   "assets/right_icon.png",
+            ASSET_NAVI_LEFT:    "assets/left icon.png",
+        }, low_memory, cache_size=4)
+
+        # The menu screen as retained widgets, in drawing order. Only the boxes of
+        # widgets whose data changed are recomposed each frame (see widgets.py).
+        self.widget_tree = widgets.WidgetTree(self.img_framebuffer)
+        self.icon_widget = self.widget_tree.add(widgets.IconWidget(POS_OLED_ICON, self.icons.size))
+        self.label_widget = self.widget_tree.add(widgets.TextWidget(POS_OLED_TEXT_BOX,
+            (OLED_TEXT_BOX_WIDTH, OLED_TEXT_BOX_HEIGHT), self.text_box_cache))
+        self.value_widget = self.widget_tree.add(widgets.TextWidget(POS_OLED_SUBMENU_TEXT_BOX,
+            (OLED_SUBMENU_TEXT_BOX_WIDTH, OLED_SUBMENU_TEXT_BOX_HEIGHT), self.submenu_text_box_cache))
+        self.job_list_widget = self.widget_tree.add(widgets.ListWidget(POS_OLED_SUBMENU_TEXT_BOX,
+            (OLED_SUBMENU_TEXT_BOX_WIDTH, OLED_SUBMENU_TEXT_BOX_HEIGHT), job_queue.JOBQ_ROW_HEIGHT))
+        self.progress_widget = self.widget_tree.add(widgets.ProgressBarWidget(POS_OLED_PROGRESS_BAR,
+            (OLED_PROGRESS_BAR_WIDTH, OLED_PROGRESS_BAR_HEIGHT)))
+        self.navi_left_widget = self.widget_tree.add(widgets.IconWidget(POS_OLED_NAVI_LEFT, self.navi_icons.size))
+        self.navi_right_widget = self.widget_tree.add(widgets.IconWidget(POS_OLED_NAVI_RIGHT, self.navi_icons.size))
+
+        self.menu_item_names = {
+            MENU_MAIN_REBOOT:           "Reboot",
+            MENU_MAIN_PRINT_TEST:       "Print\nTest Page",
+            MENU_MAIN_SHUTDOWN:         "Shutdown",
+            MENU_MAIN_PRINTER_INFO:     "Printer\nInfo",
+            MENU_MAIN_SYS_INFO:         "System\nInfo",
+            MENU_MAIN_PRINTER_OPTIONS:  "Printer\nOptions",
+            MENU_MAIN_JOB_QUEUE:        "Job\nQueue",
+            MENU_SUB_PRTOPT_RESUME:     "Resume\nPrinter",
+            MENU_SUB_PRTOPT_CANCEL:     "Cancel All\nJobs",
+            MENU_SUB_PRTOPT_USBRESET:   "Reset\nUSB",
+            MENU_SUB_PRTOPT_GOBACK:     "Go Back to\nMain Menu",
+        }
+
+        # Rendered job queue rows are cached between pages.
+        self.job_row_cache = job_queue.JobRowCache(self.def_font,
+            LOW_MEMORY_JOB_ROW_CACHE_SIZE if low_memory else job_queue.JOBQ_ROW_CACHE_SIZE, lazy=low_memory)
+
+        # The labels are a fixed set. In low memory mode they are all drawn now,
+        # then the label font and its framebuffer are let go.
+        if low_memory:
+            for label in [OLED_STARTUP_LABEL, OLED_SHUTDOWN_LABEL, OLED_PRINT_TEST_SENDING_LABEL, OLED_PRINT_TEST_SENT_LABEL,
+                          OLED_PRINT_TEST_FAILED_LABEL] + list(self.menu_item_names.values()):
+                self.text_box_cache.get(label)
+            self.img_font = None
+            self.text_framebuffer = None
+            self.text_draw_handle = None
     
         """ ENDOF Asset attributes """
 
@@ -261,22 +352,18 @@ class CUPS_Hat:
         Display startup animation to show during bootup.
         """
         # TODO: Improve this one. Create new logos?
-        self.framebuffer_clear()
-        self.text_draw_handle.text(POS_OLED_TEXT_BOX_LINE1, "Welcome!\nStartup!", font=self.img_font, fill=255, spacing=-2)
-
-        self.img_framebuffer.paste(self.asset_list[ASSET_ICON_PRINTER], POS_OLED_ICON)
-        self.img_framebuffer.paste(self.text_framebuffer, POS_OLED_TEXT_BOX)
+        self.widgets_update(icon=self.icons.get(ASSET_ICON_PRINTER), label=OLED_STARTUP_LABEL)
 
-        self.oled_update()
+        self.oled_update(wait=True)
 
         time.sleep(0.2)
 
         for i in range (175, 0, -5):
-            self.oled_obj.contrast(i)
+            self.display_manager.set_contrast(self.main_panel, i)
             time.sleep(0.01)
 
         for i in range (0, 175):
-            self.oled_obj.contrast(i)
+            self.display_manager.set_contrast(self.main_panel, i)
             time.sleep(0.01)
 
         time.sleep(0.2)
@@ -286,36 +373,77 @@ class CUPS_Hat:
         """
         Display a closing animation.
         """
-        self.framebuffer_clear()
-        self.text_draw_handle.text(POS_OLED_TEXT_BOX_LINE1, "Goodbye!\nShutdown!", font=self.img_font, fill=255, spacing=-2)
+        self.widgets_update(icon=self.icons.get(ASSET_ICON_POWER), label=OLED_SHUTDOWN_LABEL)
 
-        self.img_framebuffer.paste(self.asset_list[ASSET_ICON_POWER], POS_OLED_ICON)
-        self.img_framebuffer.paste(self.text_framebuffer, POS_OLED_TEXT_BOX)
-
-        self.oled_update()
+        self.oled_update(wait=True)
 
         time.sleep(0.2)
 
         for i in range (175, 0, -1):
-            self.oled_obj.contrast(i)
+            self.display_manager.set_contrast(self.main_panel, i)
             time.sleep(0.01)
 
         time.sleep(0.2)
         self.oled_clear()
 
-    def oled_update(self):
+    def oled_update(self, wait=False):
         """
-        Refresh the OLED
+        Refresh the OLEDs. Only panels whose framebuffer changed are sent.
+        Set wait to block until the I2C transfers are done.
         """
-        self.oled_obj.image(self.img_framebuffer)
-        self.oled_obj.show()
+        self.display_manager.flush(wait=wait)
+
+        if self.mirror is not None:
+            self.mirror.publish(self.img_framebuffer)
+
+        if self.recorder is not None:
+            self.recorder.record(self.img_framebuffer, self.current_menu)
+
+    def enable_mirror(self, address):
+        """
+        Stream the framebuffer to local subscribers.
+        address is a Unix socket path or a (host, port) tuple.
+        """
+        self.mirror = oled_mirror.FramebufferMirror(address)
+
+    def enable_recorder(self, path):
+        """
+        Append every distinct frame to the recording at path.
+        See frame_compare.py to check a recording against the golden frames.
+        """
+        self.recorder = frame_recorder.FrameRecorder(path)
 
     def oled_clear(self):
         """
-        Clear the OLED
+        Clear the OLEDs
+        """
+        self.display_manager.clear()
+        self.widget_tree.invalidate()
+
+    def create_panel(self, config) -> display_manager.Panel:
+        """
+        Create an extra panel from one of the OLED_EXTRA_PANELS entries.
         """
-        self.oled_obj.fill(0)
-        self.oled_obj.show()
+        bus_id = config.get("bus", OLED_MAIN_BUS)
+        width = config.get("width", OLED_WIDTH)
+        height = config.get("height", OLED_HEIGHT)
+        address = config.get("address", OLED_MAIN_ADDRESS)
+
+        if bus_id not in self.display_manager.workers:
+            from adafruit_extended_bus import ExtendedI2C
+            self.display_manager.add_bus(bus_id, lambda: ExtendedI2C(bus_id))
+
+        return display_manager.Panel(config["name"], lambda bus: adafruit_ssd1306.SSD1306_I2C(width, height, bus, addr=address),
+                                     bus_id, width, height, config.get("refresh_interval", 1.0))
+
+    def extra_panels_prepare_framebuffer(self):
+        """
+        Draw the status of every printer on the extra panels, one line each.
+        """
+        lines = [f"{p.name[:12]} {p.state_name()} {p.queued_job_count}" for p in self.printer_monitor.printers]
+        for panel in self.extra_panels:
+            panel.draw_handle.rectangle((0, 0, panel.width, panel.height), outline=0, fill=0)
+            panel.draw_handle.text(POS_OLED_SUBMENU_TEXT_BOX_LINE1, "\n".join(lines), font=self.def_font, fill=255, spacing=-5.5)
 
     # TODO: Improve the comment below.
     def is_button_pressed(self, button) -> bool:
@@ -323,10 +451,7 @@ class CUPS_Hat:
         Check if button is pressed.
         button == self.btn_left, etc.
         """
-        if io.input(button) == io.LOW:
-            return True
-        else:
-            return False
+        return self.input.is_button_pressed(button)
 
     # TODO: Improve the comment below.
     def is_button_held(self, button) -> bool:
@@ -341,10 +466,13 @@ class CUPS_Hat:
         Check if button event was detected
         button == self.btn_left, etc.
         """
-        if io.event_detected(button):
-            return True
-        else:
-            return False
+        return self.input.is_button_ev_det(button)
+
+    def wait_for_input(self, timeout):
+        """
+        Sleep until a button edge arrives or timeout seconds pass.
+        """
+        self.input.wait(timeout)
 
     def is_command_executed(self) -> bool:
         """
@@ -365,9 +493,14 @@ class CUPS_Hat:
             #os("reboot")
             print("REBOOT!")
         elif self.current_menu == MENU_MAIN_PRINT_TEST:
-            # Print Test page...
-            #os("lp -d WiFi_HP_Ink_Tank_115 /usr/share/cups/data/testprint")
-            print("TEST PRINT")
+            # Print Test page on the printer last selected in Printer Info, streamed straight to CUPS.
+            # Submitted from a background thread like the job queue fetch, so the display loop
+            # never waits on CUPS. The label shows the result once it is done.
+            if self.print_test_thread is None or not self.print_test_thread.is_alive():
+                self.print_test_result = None
+                self.print_test_thread = threading.Thread(target=self._thread_print_test,
+                    args=(CUPS_PRINTER_NAMES[self.printer_info_index],), daemon=True)
+                self.print_test_thread.start()
         elif self.current_menu == MENU_MAIN_SHUTDOWN:
             # Shutdown...
             #os("poweroff")
@@ -383,34 +516,134 @@ class CUPS_Hat:
         elif self.current_menu == MENU_MAIN_PRINTER_OPTIONS:
             print("Printer Options!")
             pass
+        elif self.current_menu == MENU_MAIN_JOB_QUEUE:
+            print("JOB QUEUE!")
+            pass
+
+    def _thread_print_test(self, printer_name):
+        try:
+            self.last_job_id = self.ipp.print_job(printer_name, CUPS_TEST_PAGE_PATH, "Test Page")
+            print(f"TEST PRINT: job {self.last_job_id}")
+            self.print_test_result = OLED_PRINT_TEST_SENT_LABEL
+        except (OSError, ValueError, ipp_client.IPPError) as err:
+            print(f"TEST PRINT failed: {err}")
+            self.print_test_result = OLED_PRINT_TEST_FAILED_LABEL
+        self.print_test_result_time = time.monotonic()
+
+    def print_test_label(self) -> str:
+        """
+        Label of the Print Test Page menu: sending, then the result for a few seconds.
+        """
+        if self.print_test_thread is not None and self.print_test_thread.is_alive():
+            return OLED_PRINT_TEST_SENDING_LABEL
+        if self.print_test_result is not None and time.monotonic() - self.print_test_result_time < OLED_PRINT_TEST_RESULT_TIME:
+            return self.print_test_result
+        return self.menu_item_names[MENU_MAIN_PRINT_TEST]
+
+    def start_collectors(self, printer_interval):
+        """
+        Start the collector worker, or adopt the one left running by an earlier session.
+        printer_interval is the time in seconds between printer polls.
+        """
+        self.collectors.printer_interval = printer_interval
+        self.collectors.start()
 
     def run_sys_info_commands(self):
+        """
+        Copy the latest system info from the collector worker. The shell commands run there.
+        """
         # TODO: Update sys_uptime and add ability to get uptime in Days as well. Right now it can only get hours and minutes from the "uptime" command.
-        self.sys_ip_address = subprocess.check_output("hostname -I | cut -d' ' -f1", shell=True).decode("utf-8")
-        self.sys_temperature = subprocess.check_output("vcgencmd measure_temp | awk \'{split($0,a,\"=\"); print a[2]}\'", shell=True).decode("utf-8")
-        self.sys_uptime = subprocess.check_output("uptime | awk \'NR==1{printf \"%s\", $3}\' | awk \'{split($0,a,\":\"); print a[1], a[2]}\' | awk \'{split($0,a,\",\"); print a[1]}\' | awk \'{split($0,a,\" \"); printf \"%sh %sm\", a[1], a[2]}\'", shell=True).decode("utf-8")
-        self.sys_memusage = subprocess.check_output("free -m | awk 'NR==2{printf \"Mem: %s/%s MB\", $3,$2 }'", shell=True).decode("utf-8")
-        self.sys_cpuload = subprocess.check_output('cut -f 1 -d " " /proc/loadavg', shell=True).decode("utf-8")
+        snapshot = self.collectors.read()
+        if snapshot is None or snapshot.sysinfo_time == 0:
+            return
+        self.sys_ip_address = snapshot.sys_ip_address
+        self.sys_temperature = snapshot.sys_temperature
+        self.sys_uptime = snapshot.sys_uptime
+        self.sys_memusage = snapshot.sys_memusage
+        self.sys_cpuload = snapshot.sys_cpuload
 
     def run_printer_info_commands(self):
-        # TODO: Define this function to get printer status.
-        # os.system("lpstat")
-        pass
+        """
+        Pick up the latest printer poll from the collector worker and update the summary.
+        Restarts the worker if it died or hung.
+        """
+        self.collectors.supervise()
+        snapshot = self.collectors.read()
+        if snapshot is None or snapshot.printers_time == 0:
+            return      # No poll finished yet
+
+        snapshot.apply_printers(self.printer_monitor)
+        self.printers_time = snapshot.printers_time
+        if time.monotonic() - snapshot.printers_time > collector_worker.COLLECTOR_STALE_TIMEOUT + self.collectors.printer_interval_max():
+            # The worker hasn't polled in a while, don't keep showing old status as current.
+            self.printer_monitor.is_reachable = False
+        self.printer_status = self.printer_monitor.summary_status()
+        self.extra_panels_prepare_framebuffer()
+        self.led_update_status()
+
+    def is_printer_poll_new(self) -> bool:
+        """
+        True when the collector worker finished a printer poll that wasn't applied yet,
+        e.g. right after a job arrived in the spool. Cheap enough to call every loop.
+        """
+        snapshot = self.collectors.read()
+        return snapshot is not None and snapshot.printers_time != self.printers_time
 
-    def framebuffer_clear(self):
+    def widgets_update(self, icon=None, label=None, value=None, job_rows=None, progress=None, navi_left=None, navi_right=None):
         """
-        Clear the framebuffers
+        Bind what every widget shows (None hides it) and recompose the changed ones.
+        Returns the damaged boxes of the main framebuffer, which are also handed to the main panel.
         """
-        self.img_draw_handle.rectangle((0, 0, OLED_WIDTH, OLED_HEIGHT), outline=0, fill=0)
+        self.icon_widget.set(icon)
+        self.label_widget.set(label)
+        self.value_widget.set(value)
+        self.job_list_widget.set(job_rows)
+        self.progress_widget.set(progress)
+        self.navi_left_widget.set(navi_left)
+        self.navi_right_widget.set(navi_right)
+
+        damage = self.widget_tree.render()
+        self.main_panel.add_damage(damage)
+        return damage
+
+    def text_box_render(self, text) -> Image.Image:
+        """
+        Draw text into the text box framebuffer. Called by text_box_cache on a miss.
+        In low memory mode that only happens for a label that isn't a menu item, which brings the font back.
+        """
+        if self.img_font is None:
+            self.img_font = bitmap_font.load_font(*OLED_LABEL_FONT)
+            self.text_framebuffer = Image.new("1", (OLED_TEXT_BOX_WIDTH, OLED_TEXT_BOX_HEIGHT))
+            self.text_draw_handle = ImageDraw.Draw(self.text_framebuffer)
         self.text_draw_handle.rectangle((0, 0, OLED_TEXT_BOX_WIDTH, OLED_TEXT_BOX_HEIGHT), outline=0, fill=0)
+        self.img_font.draw_text(self.text_framebuffer, POS_OLED_TEXT_BOX_LINE1, text, fill=255, spacing=-2)
+        return self.text_framebuffer
+
+    def submenu_text_box_render(self, text) -> Image.Image:
+        """
+        Draw text into the sub-menu text box framebuffer. Called by submenu_text_box_cache on a miss.
+        """
         self.submenu_text_draw_handle.rectangle((0, 0, OLED_SUBMENU_TEXT_BOX_WIDTH, OLED_SUBMENU_TEXT_BOX_HEIGHT), outline=0, fill=0)
+        self.submenu_text_draw_handle.text(POS_OLED_SUBMENU_TEXT_BOX_LINE1, text, font=self.def_font, fill=255, spacing=-5.5)
+        return self.submenu_text_framebuffer
 
-    def heartbeat(self):
+    def led_update_status(self):
         """
-        Blink the heartbeat LED.
+        Switch the LED patterns to match the printer/system state.
+        Nothing is written to the LEDs unless the state changed.
         """
-        io.output(self.led_green, self.led_state)
-        self.led_state = self.led_state ^ 1
+        state_reasons = [r for p in self.printer_monitor.printers for r in p.state_reasons]
+        self.led_engine.set_state(led_patterns.resolve_state(self.printer_status, state_reasons, self.read_cpu_temperature()))
+
+    def read_cpu_temperature(self):
+        """
+        CPU temperature in degrees C, or None if it can't be read.
+        """
+        try:
+            with open("/sys/class/thermal/thermal_zone0/temp") as f:
+                return int(f.read()) / 1000
+        except (OSError, ValueError):
+            return None
 
     #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
     # current_menu-related class methods
@@ -433,6 +666,14 @@ class CUPS_Hat:
             else:
                 pass
 
+        elif self.current_menu in range(MENU_SUB_JOBQ_LIST, MENU_SUB_JOBQ_LIMIT):
+            # Page through the job queue
+            self.job_queue.page_left()
+
+        elif self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            # Rotate through the configured printers
+            self.printer_info_index = (self.printer_info_index - 1) % len(CUPS_PRINTER_NAMES)
+
     def menu_change_right(self):
         """
         Advance the current_menu value to the right
@@ -451,6 +692,14 @@ class CUPS_Hat:
             else:
                 pass
 
+        elif self.current_menu in range(MENU_SUB_JOBQ_LIST, MENU_SUB_JOBQ_LIMIT):
+            # Page through the job queue
+            self.job_queue.page_right()
+
+        elif self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            # Rotate through the configured printers
+            self.printer_info_index = (self.printer_info_index + 1) % len(CUPS_PRINTER_NAMES)
+
     def menu_change_enter(self):
         """
         Enter/exit a sub-menu based on the current_menu value.
@@ -461,56 +710,126 @@ class CUPS_Hat:
         elif self.current_menu in range(MENU_SUB_SYSINFO_P1, MENU_SUB_SYSINFO_LIMIT):
             self.current_menu = MENU_MAIN_SYS_INFO
 
+        elif self.current_menu == MENU_MAIN_PRINTER_INFO:
+            self.current_menu = MENU_SUB_PRTINFO_PAGE
+
+        elif self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            self.current_menu = MENU_MAIN_PRINTER_INFO
+
+        elif self.current_menu == MENU_MAIN_JOB_QUEUE:
+            # Show the queue of the printer last selected in Printer Info
+            self.current_menu = MENU_SUB_JOBQ_LIST
+            self.job_queue.printer_name = CUPS_PRINTER_NAMES[self.printer_info_index]
+            self.job_queue.open()
+
+        elif self.current_menu in range(MENU_SUB_JOBQ_LIST, MENU_SUB_JOBQ_LIMIT):
+            self.current_menu = MENU_MAIN_JOB_QUEUE
+            self.job_queue.close()
+
+    def is_navi_left_shown(self) -> bool:
+        """
+        Hide the left arrow when there is nothing further to the left.
+        """
+        if self.current_menu == MENU_SUB_SYSINFO_P1:
+            return False
+        if self.current_menu in range(MENU_SUB_JOBQ_LIST, MENU_SUB_JOBQ_LIMIT):
+            return not self.job_queue.is_first_page()
+        if self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            return len(CUPS_PRINTER_NAMES) > 1
+        return True
+
+    def is_navi_right_shown(self) -> bool:
+        """
+        Hide the right arrow when there is nothing further to the right.
+        """
+        if self.current_menu == MENU_SUB_SYSINFO_P2:
+            return False
+        if self.current_menu in range(MENU_SUB_JOBQ_LIST, MENU_SUB_JOBQ_LIMIT):
+            return not self.job_queue.is_last_page()
+        if self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            return len(CUPS_PRINTER_NAMES) > 1
+        return True
+
+    def printer_info_active_job(self):
+        """
+        job_progress.JobProgress of the job the printer on the Printer Info page is printing, or None.
+        """
+        snapshot = self.collectors.read()
+        if snapshot is None or snapshot.progress_printer != self.printer_info_index or snapshot.progress is None:
+            return None
+        if self.printer_monitor.printers[self.printer_info_index].state != ipp_client.IPP_PRINTER_PROCESSING:
+            return None
+        return snapshot.progress
+
+    def job_queue_rows(self):
+        """
+        The visible job queue rows as a tuple of sprites for the job list widget, or None if the queue is empty.
+        Rows still being fetched are left blank.
+        """
+        rows = self.job_queue.visible_rows()
+        if not rows:
+            return None
+        return tuple(self.job_row_cache.get(row) if row is not None else None for row in rows)
+
     def menu_prepare_framebuffer(self):
         """
-        Prepare the menu for the framebuffer to be displayed based on the current_menu value
+        Prepare the menu for the framebuffer to be displayed based on the current_menu value.
+        Only the parts of the screen whose content changed are redrawn.
         """
-        self.framebuffer_clear()
+        icon = label = value = job_rows = progress = navi_left = navi_right = None
+
+        # The collector worker follows the job progress of the printer on the Printer Info page.
+        if self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            self.collectors.request_progress(self.printer_info_index)
+        else:
+            self.collectors.request_progress(None)
+
+        # The System Info commands only run in the worker while their page is shown.
+        self.collectors.request_sysinfo(self.current_menu in range(MENU_SUB_SYSINFO_P1, MENU_SUB_SYSINFO_LIMIT))
 
         # ============================================================================================================================
         # Prepare text box and icon contents
         # ============================================================================================================================
         if self.current_menu in range(MENU_SUB_SYSINFO_P1, MENU_SUB_SYSINFO_LIMIT):
-            temp_str = 0
             self.run_sys_info_commands()
             if self.current_menu == MENU_SUB_SYSINFO_P1:
-                temp_str = f"IP: {self.sys_ip_address}\nCPU Load: {self.sys_cpuload}\n{self.sys_memusage}"
+                value = f"IP: {self.sys_ip_address}\nCPU Load: {self.sys_cpuload}\n{self.sys_memusage}"
+            else:
+                value = f"Temp: {self.sys_temperature}\nUptime: {self.sys_uptime}"
+
+        elif self.current_menu in range(MENU_SUB_JOBQ_LIST, MENU_SUB_JOBQ_LIMIT):
+            job_rows = self.job_queue_rows()
+            if job_rows is None:
+                value = "No jobs queued"
+
+        elif self.current_menu in range(MENU_SUB_PRTINFO_PAGE, MENU_SUB_PRTINFO_LIMIT):
+            printer = self.printer_monitor.printers[self.printer_info_index]
+            job = self.printer_info_active_job()
+            if job is not None:
+                # Live view of the job being printed, the bar only changes when its width in pixels does.
+                value = f"{printer.name} #{job.job_id}\nPg {job.pages_text()} Imp {job.impressions_completed} {job.k_octets_processed}k"
+                progress = self.progress_widget.fill_width(job.fraction())
             else:
-                temp_str = f"Temp: {self.sys_temperature}\nUptime: {self.sys_uptime}"
-                
-            self.submenu_text_draw_handle.text(POS_OLED_SUBMENU_TEXT_BOX_LINE1, temp_str, font=self.def_font, fill=255, spacing=-5.5)
+                reasons = ", ".join(printer.reasons()) or "OK"
+                value = f"{printer.name}\n{printer.state_name()} Jobs: {printer.queued_job_count}\n{reasons}"
 
         elif self.current_menu in range(MENU_MAIN_FIRST, MENU_MAIN_LIMIT):
-            self.text_draw_handle.text(POS_OLED_TEXT_BOX_LINE1, self.menu_item_names_list[self.current_menu], font=self.img_font, fill=255, spacing=-2)    
-
-            if self.is_button_pressed(self.btn_enter) == True:
-                self.img_framebuffer.paste(self.invert_asset_list[self.current_menu], POS_OLED_ICON)
-            else:    
-                self.img_framebuffer.paste(self.asset_list[self.current_menu], POS_OLED_ICON)
-        # ============================================================================================================================
-
-        # ============================================================================================================================
-        # Paste text box to the main frame buffer
-        # ============================================================================================================================
-        if self.current_menu in range(MENU_MAIN_FIRST, MENU_MAIN_LIMIT):
-            self.img_framebuffer.paste(self.text_framebuffer, POS_OLED_TEXT_BOX)
-        elif self.current_menu in range(MENU_SUB_SYSINFO_P1, MENU_SUB_SYSINFO_LIMIT):
-            self.img_framebuffer.paste(self.submenu_text_framebuffer, POS_OLED_SUBMENU_TEXT_BOX)
+            icon = self.icons.get(self.current_menu, inverted=self.is_button_pressed(self.btn_enter))
+            if self.current_menu == MENU_MAIN_PRINT_TEST:
+                label = self.print_test_label()
+            else:
+                label = self.menu_item_names[self.current_menu]
         # ============================================================================================================================
 
         # ============================================================================================================================
         # Invert left/right icons depending on the menu
         # ============================================================================================================================
         # TODO: Improve handling of the Sub-menus here.
-        if self.current_menu != MENU_SUB_SYSINFO_P1:
-            if self.is_button_pressed(self.btn_left) == True:
-                self.img_framebuffer.paste(self.invert_navi_asset_list[ASSET_NAVI_LEFT], POS_OLED_NAVI_LEFT)
-            else:
-                self.img_framebuffer.paste(self.navi_asset_list[ASSET_NAVI_LEFT], POS_OLED_NAVI_LEFT)
+        if self.is_navi_left_shown():
+            navi_left = self.navi_icons.get(ASSET_NAVI_LEFT, inverted=self.is_button_pressed(self.btn_left))
 
-        if self.current_menu != MENU_SUB_SYSINFO_P2:
-            if self.is_button_pressed(self.btn_right) == True:
-                self.img_framebuffer.paste(self.invert_navi_asset_list[ASSET_NAVI_RIGHT], POS_OLED_NAVI_RIGHT)
-            else:
-                self.img_framebuffer.paste(self.navi_asset_list[ASSET_NAVI_RIGHT], POS_OLED_NAVI_RIGHT)
-        # ============================================================================================================================
\ No newline at end of file
+        if self.is_navi_right_shown():
+            navi_right = self.navi_icons.get(ASSET_NAVI_RIGHT, inverted=self.is_button_pressed(self.btn_right))
+        # ============================================================================================================================
+
+        return self.widgets_update(icon, label, value, job_rows, progress, navi_left, navi_right)
\ No newline at end of file
@@ -0,0 +1,333 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# display_manager.py - Drives one or more SSD1306 panels
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: display_manager.py
+# Description: Each panel has its own framebuffer, refresh rate and change
+#              detection. Flushes are handed to one worker thread per I2C bus:
+#              panels on different buses flush concurrently, panels on the
+#              same bus are serialized, and a panel that changes again before
+#              its previous flush went out only sends the newest frame.
+#
+#              The bus threads also supervise the panels: an I2C error marks
+#              the panel degraded, the device is re-created with exponential
+#              backoff, and the current frame is resent once it is back. The
+#              main loop never sees the OSError.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   The manager never imports the hardware libraries itself. Register a
+#   factory per bus that opens it (e.g. busio.I2C) with add_bus(), and give
+#   each panel a factory that creates its device on that bus
+#   (e.g. adafruit_ssd1306.SSD1306_I2C).
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import threading            # Used for the per-bus flush threads
+import time                 # Used for per-panel refresh rates
+
+from PIL import Image, ImageDraw
+
+import bitplane             # Used for panels composited in SSD1306 page order
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+PANEL_RETRY_DELAY_MIN = 0.5     # Seconds before the first re-init attempt
+PANEL_RETRY_DELAY_MAX = 30.0    # Backoff is doubled up to this limit
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class Panel:
+    def __init__(self, name, device_factory, bus_id, width, height, refresh_interval=0, use_bitplane=False):
+        """
+        device_factory(bus) is called on the bus thread to (re)create the SSD1306 driver object.
+        bus_id identifies the I2C bus; panels with the same bus_id share a flush thread.
+        refresh_interval is the minimum time in seconds between flushes (0 = every flush()).
+        use_bitplane makes the framebuffer a bitplane.Bitplane instead of a PIL Image.
+        Its buffer is copied into the driver as is, skipping the per-pixel image() conversion.
+        """
+        self.name = name
+        self.device_factory = device_factory
+        self.device = None          # Created by the bus thread on the first flush
+        self.bus_id = bus_id
+        self.width = width
+        self.height = height
+        self.refresh_interval = refresh_interval
+
+        if use_bitplane:
+            self.framebuffer = bitplane.Bitplane(width, height)
+            self.draw_handle = None
+        else:
+            # Make sure to create the framebuffer with mode '1' for 1-bit color.
+            self.framebuffer = Image.new("1", (width, height))
+            self.draw_handle = ImageDraw.Draw(self.framebuffer)
+
+        self.last_sent = None       # bytes of the last frame handed to the bus thread
+        self.damage = None          # Boxes drawn since the last flush, None if the drawing code doesn't report them
+        self.pending = None         # Frame waiting to be sent, newest frame wins
+        self.current_frame = None   # Last frame submitted, resent after recovery
+        self.next_flush_time = 0
+
+        # Supervisor state
+        self.is_degraded = False
+        self.last_error = None
+        self.retry_delay = PANEL_RETRY_DELAY_MIN
+        self.next_retry_time = 0
+
+    def snapshot(self) -> tuple:
+        """
+        Return (frame_bytes, frame) of the framebuffer. frame is what the bus thread
+        sends: page order bytes for a bitplane, a copy of the Image otherwise.
+        """
+        if self.draw_handle is None:
+            frame = bytes(self.framebuffer.buffer)
+            return frame, frame
+        return self.framebuffer.tobytes(), self.framebuffer.copy()
+
+    def clear(self):
+        if self.draw_handle is None:
+            self.framebuffer.clear()
+        else:
+            self.draw_handle.rectangle((0, 0, self.width, self.height), outline=0, fill=0)
+        if self.damage is not None:
+            self.damage.append((0, 0, self.width, self.height))
+
+    def add_damage(self, boxes):
+        """
+        Report the (x0, y0, x1, y1) boxes drawn since the last flush.
+        Once a panel gets damage reports, flush() skips it while there are none.
+        """
+        if self.damage is None:
+            self.damage = []
+        self.damage.extend(boxes)
+
+    def is_damaged(self) -> bool:
+        return self.damage is None or len(self.damage) > 0
+
+    def is_due(self, now) -> bool:
+        return now >= self.next_flush_time
+
+    def is_ready(self, now) -> bool:
+        """
+        True if the bus thread should try to send the pending frame now.
+        """
+        return self.pending is not None and (not self.is_degraded or now >= self.next_retry_time)
+
+class BusWorker:
+    def __init__(self, bus_id, bus_factory):
+        """
+        Sends pending frames for every panel on one I2C bus, one at a time,
+        and re-initializes the bus and panels after an I2C error.
+        bus_factory() opens the bus and returns it.
+        """
+        self.bus_id = bus_id
+        self.bus_factory = bus_factory
+        self.bus = None             # Opened by the bus thread on the first flush
+        self.panels = []
+        self.cond = threading.Condition()
+        self.io_lock = threading.Lock()     # Held while talking to a device on this bus
+        self.is_busy = False
+        self.flag_kill_thread = False
+        self.thread = threading.Thread(target=self._thread_flush, name=f"oled-bus-{bus_id}", daemon=True)
+        self.thread.start()
+
+    def submit(self, panel: Panel, frame):
+        with self.cond:
+            panel.pending = frame       # Coalesce: replace any frame not yet sent
+            panel.current_frame = frame
+            self.cond.notify_all()
+
+    def wait_idle(self):
+        """
+        Wait until every healthy panel's frame went out. Degraded panels are not waited on.
+        """
+        with self.cond:
+            while self.is_busy or any(p.pending is not None and not p.is_degraded for p in self.panels):
+                self.cond.wait()
+
+    def stop(self):
+        with self.cond:
+            self.flag_kill_thread = True
+            self.cond.notify_all()
+        self.thread.join()
+
+    def mark_degraded(self, panel: Panel, err, frame=None):
+        """
+        Drop the bus and devices and schedule a re-init with exponential backoff.
+        The frame being sent (or the last one submitted) is resent on recovery.
+        Call with io_lock held.
+        """
+        self._close_bus()
+        with self.cond:
+            panel.last_error = err
+            if not panel.is_degraded:
+                print(f"OLED panel '{panel.name}' degraded: {err}")
+            panel.is_degraded = True
+            panel.next_retry_time = time.monotonic() + panel.retry_delay
+            panel.retry_delay = min(panel.retry_delay * 2, PANEL_RETRY_DELAY_MAX)
+            if panel.pending is None:
+                panel.pending = frame if frame is not None else panel.current_frame
+            self.cond.notify_all()
+
+    def _thread_flush(self):
+        while True:
+            with self.cond:
+                while True:
+                    if self.flag_kill_thread:
+                        return
+                    now = time.monotonic()
+                    work = [p for p in self.panels if p.is_ready(now)]
+                    if work:
+                        break
+
+                    # Sleep until a frame is submitted or the next re-init attempt is due.
+                    retry_times = [p.next_retry_time for p in self.panels if p.is_degraded and p.pending is not None]
+                    self.cond.wait(max(0, min(retry_times) - now) if retry_times else None)
+
+                work = [(panel, panel.pending) for panel in work]
+                for panel, _ in work:
+                    panel.pending = None
+                self.is_busy = True
+
+            for panel, frame in work:
+                self._send(panel, frame)
+
+            with self.cond:
+                self.is_busy = False
+                self.cond.notify_all()
+
+    def _close_bus(self):
+        """
+        Forget the bus and every device on it; they are re-created on the next send.
+        Healthy panels get their current frame queued again so they are redrawn.
+        """
+        if self.bus is not None:
+            try:
+                self.bus.deinit()
+            except (OSError, AttributeError):
+                pass
+            self.bus = None
+
+        with self.cond:
+            for panel in self.panels:
+                panel.device = None
+                if panel.pending is None and not panel.is_degraded:
+                    panel.pending = panel.current_frame
+
+    def _send(self, panel: Panel, frame):
+        with self.io_lock:
+            if panel.device is None:
+                try:
+                    if self.bus is None:
+                        self.bus = self.bus_factory()
+                    panel.device = panel.device_factory(self.bus)
+                except (OSError, ValueError, RuntimeError) as err:
+                    self.mark_degraded(panel, err, frame)
+                    return
+
+            try:
+                if isinstance(frame, bytes):
+                    # Already in the driver's page order.
+                    panel.device.buf[:] = frame
+                else:
+                    panel.device.image(frame)
+                panel.device.show()
+            except OSError as err:
+                self.mark_degraded(panel, err, frame)
+                return
+
+        if panel.is_degraded:
+            print(f"OLED panel '{panel.name}' recovered")
+            with self.cond:
+                panel.is_degraded = False
+                panel.retry_delay = PANEL_RETRY_DELAY_MIN
+
+class DisplayManager:
+    def __init__(self):
+        self.panels = []
+        self.workers = {}           # bus_id -> BusWorker
+
+    def add_bus(self, bus_id, bus_factory):
+        """
+        Register an I2C bus. bus_factory() opens it; it is called again after I2C errors.
+        """
+        self.workers[bus_id] = BusWorker(bus_id, bus_factory)
+
+    def add_panel(self, panel: Panel) -> Panel:
+        """
+        Add a panel on a bus registered with add_bus().
+        """
+        worker = self.workers[panel.bus_id]
+        with worker.cond:
+            worker.panels.append(panel)
+        self.panels.append(panel)
+        return panel
+
+    def flush(self, wait=False, force=False):
+        """
+        Hand every panel that is due and whose framebuffer changed to its bus thread.
+        Returns without waiting for the I2C transfers unless wait is True.
+        force ignores both the refresh interval and change detection.
+        """
+        now = time.monotonic()
+        for panel in self.panels:
+            if not force and not (panel.is_due(now) and panel.is_damaged()):
+                continue
+
+            # Send a copy so the caller can keep drawing into the framebuffer.
+            frame_bytes, frame = panel.snapshot()
+            if panel.damage is not None:
+                panel.damage = []
+            if not force and frame_bytes == panel.last_sent:
+                continue
+
+            panel.last_sent = frame_bytes
+            panel.next_flush_time = now + panel.refresh_interval
+            self.workers[panel.bus_id].submit(panel, frame)
+
+        if wait:
+            self.wait_idle()
+
+    def wait_idle(self):
+        for worker in self.workers.values():
+            worker.wait_idle()
+
+    def clear(self, wait=True):
+        """
+        Blank every panel.
+        """
+        for panel in self.panels:
+            panel.clear()
+        self.flush(wait=wait, force=True)
+
+    def set_contrast(self, panel: Panel, value):
+        """
+        Set a panel's contrast. Skipped while the panel is degraded.
+        """
+        worker = self.workers[panel.bus_id]
+        with worker.io_lock:
+            if panel.device is None:
+                return
+            try:
+                panel.device.contrast(value)
+            except OSError as err:
+                worker.mark_degraded(panel, err)
+
+    def is_degraded(self) -> bool:
+        return any(panel.is_degraded for panel in self.panels)
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.stop()
@@ -0,0 +1,164 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# frame_compare.py - Checks OLED frames against stored golden frames
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: frame_compare.py
+# Description: Compares one frame per MENU_* state, taken from a recording
+#              (frame_recorder.py) or from a directory of rendered PNGs,
+#              against the golden frames in golden/<MENU_NAME>.png.
+#              Frames are compared as packed bytes, so a full check of every
+#              state takes a few milliseconds.
+#
+# Usage:
+#   python frame_compare.py session.ofr                 (compare a recording)
+#   python frame_compare.py rendered/                   (compare PNGs named MENU_*.png)
+#   python frame_compare.py session.ofr --update        (store the frames as the new golden frames)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   From a recording, the frame used for a state is the one that stayed on
+#   screen the longest while in that state. This skips the transient frames
+#   with an inverted icon while a button is held.
+#   The MENU_* names are read from cups_hat_display.py with ast, so this runs
+#   on any machine without the OLED/GPIO libraries installed.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import argparse
+import ast
+import collections
+import os
+import sys
+import time
+
+from PIL import Image
+
+import frame_recorder
+from oled_mirror import xor_bytes
+
+MENU_SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cups_hat_display.py")
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "golden")
+
+def load_menu_states(source_path=MENU_SOURCE_PATH) -> dict:
+    """
+    Return {value: name} for every MENU_* state defined in cups_hat_display.py.
+    Aliases (MENU_*_FIRST/LAST) and the range limits are skipped.
+    """
+    states = {}
+    for node in ast.parse(open(source_path).read()).body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        name = getattr(node.targets[0], "id", "")
+        if not name.startswith("MENU_") or name.endswith("_LIMIT"):
+            continue
+        if isinstance(node.value, ast.Constant) and isinstance(node.value.value, int):
+            states[node.value.value] = name
+    return states
+
+def frames_from_recording(path) -> dict:
+    """
+    Return {menu: (width, height, frame_bytes)} with the longest-shown frame of each state.
+    """
+    shown_ms = collections.defaultdict(lambda: collections.defaultdict(int))
+    prev = None
+    with frame_recorder.FrameReader(path) as reader:
+        for frame in reader.frames():
+            if prev is not None:
+                shown_ms[prev.menu][prev.data] += frame.timestamp_ms - prev.timestamp_ms
+            prev = frame
+        if prev is not None:
+            # The last frame is still on screen, count it so a state seen only once is covered.
+            shown_ms[prev.menu][prev.data] += 0
+        size = (reader.width, reader.height)
+
+    return {menu: (*size, max(durations, key=durations.get))
+            for menu, durations in shown_ms.items()
+            if menu != frame_recorder.RECORD_MENU_UNKNOWN}
+
+def frames_from_directory(path, states) -> dict:
+    """
+    Return {menu: (width, height, frame_bytes)} for every <MENU_NAME>.png in path.
+    """
+    frames = {}
+    for value, name in states.items():
+        png_path = os.path.join(path, name + ".png")
+        if os.path.exists(png_path):
+            img = Image.open(png_path).convert("1")
+            frames[value] = (*img.size, img.tobytes())
+    return frames
+
+def compare_frames(width, frame, golden) -> tuple:
+    """
+    Return (differing_pixels, (x0, y0, x1, y1) bounding box or None).
+    Both frames are PIL mode "1" raw bytes of the same size.
+    """
+    diff = xor_bytes(frame, golden)
+    count = bin(int.from_bytes(diff, "big")).count("1")
+    if count == 0:
+        return 0, None
+
+    stride = (width + 7) // 8
+    rows = [i // stride for i, byte in enumerate(diff) if byte]
+    cols = [(i % stride) * 8 + bit for i, byte in enumerate(diff) if byte
+            for bit in range(8) if byte & (0x80 >> bit)]
+    return count, (min(cols), rows[0], max(cols), rows[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CUPS Hat frames against golden frames.")
+    parser.add_argument("source", help="Recording (.ofr) or directory of MENU_*.png frames")
+    parser.add_argument("--golden", default=GOLDEN_DIR, help="Directory of golden frames")
+    parser.add_argument("--max-diff", type=int, default=0, help="Differing pixels allowed per state")
+    parser.add_argument("--update", action="store_true", help="Store the source frames as the golden frames")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    states = load_menu_states()
+    if os.path.isdir(args.source):
+        frames = frames_from_directory(args.source, states)
+    else:
+        frames = frames_from_recording(args.source)
+    loaded = time.perf_counter()
+
+    if args.update:
+        os.makedirs(args.golden, exist_ok=True)
+        for value, (width, height, frame) in frames.items():
+            if value in states:
+                Image.frombytes("1", (width, height), frame).save(os.path.join(args.golden, states[value] + ".png"))
+        print(f"Stored {len(frames)} golden frames in {args.golden}")
+        return
+
+    golden = frames_from_directory(args.golden, states)
+    failed = 0
+    for value, name in sorted(states.items()):
+        if value not in frames:
+            print(f"{name:<28} not covered")
+            continue
+        if value not in golden:
+            print(f"{name:<28} FAIL  no golden frame")
+            failed += 1
+            continue
+
+        width, height, frame = frames[value]
+        if (width, height) != golden[value][:2]:
+            print(f"{name:<28} FAIL  size {width}x{height}, golden is {golden[value][0]}x{golden[value][1]}")
+            failed += 1
+            continue
+
+        count, bbox = compare_frames(width, frame, golden[value][2])
+        if count > args.max_diff:
+            print(f"{name:<28} FAIL  {count} pixels differ in {bbox}")
+            failed += 1
+        else:
+            print(f"{name:<28} ok")
+
+    end = time.perf_counter()
+    print(f"\n{len(frames)} states checked, {failed} failed "
+          f"(load {(loaded - start) * 1000:.1f} ms, compare {(end - loaded) * 1000:.1f} ms)")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
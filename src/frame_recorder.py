@@ -0,0 +1,284 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# frame_recorder.py - Records every distinct OLED frame to a compact file
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: frame_recorder.py
+# Description: Appends each frame that differs from the previous one to a
+#              recording file, as a deflated XOR delta of the 1-bit packed
+#              framebuffer. A sidecar index of keyframe timestamps lets the
+#              reader seek to any point without decoding the whole file.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Recording file (all integers big-endian):
+#       magic 'OFR1' | width (u16) | height (u16)
+#       then records of: timestamp_ms (u64) | type (1 byte) | menu (u8) | length (u16) | payload
+#   type 'K' is a keyframe, type 'D' is a delta against the previous frame.
+#   The payload is raw deflate of (frame XOR reference), where the reference
+#   of a keyframe is an all-black frame. menu is current_menu when the frame
+#   was shown, or RECORD_MENU_UNKNOWN.
+#
+#   Index file (<recording>.idx): timestamp_ms (u64) | offset (u64) per keyframe.
+#   It can always be rebuilt from the recording, so a lost index is harmless.
+#
+#   A typical menu session changes the screen about once per second, which
+#   comes to roughly 100-150 kB per hour.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import bisect               # Used to seek in the keyframe index
+import os                   # Used to check for existing recordings
+import struct               # Used to pack the record headers
+import time                 # Used for timestamps and the flush interval
+import zlib                 # Used to compress the deltas
+
+from oled_mirror import xor_bytes
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+RECORD_MAGIC = b"OFR1"
+RECORD_TYPE_KEYFRAME = b"K"
+RECORD_TYPE_DELTA = b"D"
+RECORD_MENU_UNKNOWN = 255
+
+RECORD_FILE_HEADER = struct.Struct("!4sHH")
+RECORD_HEADER = struct.Struct("!QcBH")
+RECORD_INDEX_ENTRY = struct.Struct("!QQ")
+
+RECORD_KEYFRAME_INTERVAL = 256      # Frames between keyframes, bounds the work needed to seek
+RECORD_FLUSH_INTERVAL = 5.0         # Seconds between writes to the SD card
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Codec functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def deflate(data: bytes) -> bytes:
+    """
+    Raw deflate (no zlib header/checksum), the records carry their own framing.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def inflate(data: bytes) -> bytes:
+    return zlib.decompress(data, -15)
+
+def index_path(path) -> str:
+    return path + ".idx"
+
+def scan_records(f, offset=RECORD_FILE_HEADER.size):
+    """
+    Generator that yields (offset, timestamp_ms, type, menu, length) for every
+    complete record from offset on. Stops at a record torn by a power cut.
+    """
+    file_size = f.seek(0, os.SEEK_END)
+    f.seek(offset)
+    while True:
+        header = f.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        timestamp_ms, rec_type, menu, length = RECORD_HEADER.unpack(header)
+        payload_end = offset + RECORD_HEADER.size + length
+        if payload_end > file_size:
+            return
+        yield offset, timestamp_ms, rec_type, menu, length
+        offset = payload_end
+        f.seek(offset)
+
+def rebuild_index(path) -> list:
+    """
+    Scan the recording and rewrite its index. Returns [(timestamp_ms, offset), ...].
+    """
+    entries = []
+    with open(path, "rb") as f:
+        for offset, timestamp_ms, rec_type, _, _ in scan_records(f):
+            if rec_type == RECORD_TYPE_KEYFRAME:
+                entries.append((timestamp_ms, offset))
+
+    with open(index_path(path), "wb") as f:
+        for entry in entries:
+            f.write(RECORD_INDEX_ENTRY.pack(*entry))
+    return entries
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class RecordedFrame:
+    def __init__(self, timestamp_ms, menu, width, height, data):
+        self.timestamp_ms = timestamp_ms
+        self.menu = menu
+        self.width = width
+        self.height = height
+        self.data = data            # PIL mode "1" raw layout (rows packed MSB first)
+
+    def to_image(self):
+        from PIL import Image
+        return Image.frombytes("1", (self.width, self.height), self.data)
+
+class FrameRecorder:
+    def __init__(self, path, keyframe_interval=RECORD_KEYFRAME_INTERVAL, flush_interval=RECORD_FLUSH_INTERVAL):
+        """
+        Append to the recording at path, creating it if needed.
+        A recording cut short by a power loss is trimmed back to its last complete record.
+        """
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.flush_interval = flush_interval
+        self.width = 0
+        self.height = 0
+        self.last_frame = None          # bytes of the last recorded frame
+        self.frames_since_keyframe = 0
+        self.next_flush_time = 0
+        self.bytes_written = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._trim_torn_tail()
+        self.f = open(path, "ab")
+        self.index_f = open(index_path(path), "ab")
+
+    def record(self, img_framebuffer, menu=None, timestamp=None) -> bool:
+        """
+        Append img_framebuffer (a mode "1" PIL Image) if it differs from the last recorded frame.
+        Returns True if a record was written.
+        """
+        frame = img_framebuffer.tobytes()
+        if frame == self.last_frame:
+            return False
+
+        if self.f.tell() == 0:
+            self.width, self.height = img_framebuffer.size
+            self.f.write(RECORD_FILE_HEADER.pack(RECORD_MAGIC, self.width, self.height))
+        elif img_framebuffer.size != (self.width, self.height):
+            raise ValueError(f"Frame is {img_framebuffer.size}, recording is {(self.width, self.height)}")
+
+        if timestamp is None:
+            timestamp = time.time()
+        timestamp_ms = int(timestamp * 1000)
+
+        # Every new recording session starts with a keyframe, the previous frame isn't known.
+        is_keyframe = self.last_frame is None or self.frames_since_keyframe >= self.keyframe_interval
+        if is_keyframe:
+            payload = deflate(frame)
+            rec_type = RECORD_TYPE_KEYFRAME
+            self.frames_since_keyframe = 0
+            self.index_f.write(RECORD_INDEX_ENTRY.pack(timestamp_ms, self.f.tell()))
+        else:
+            payload = deflate(xor_bytes(frame, self.last_frame))
+            rec_type = RECORD_TYPE_DELTA
+            self.frames_since_keyframe += 1
+
+        menu = RECORD_MENU_UNKNOWN if menu is None else menu
+        self.f.write(RECORD_HEADER.pack(timestamp_ms, rec_type, menu, len(payload)))
+        self.f.write(payload)
+        self.bytes_written += RECORD_HEADER.size + len(payload)
+        self.last_frame = frame
+
+        now = time.monotonic()
+        if now >= self.next_flush_time:
+            self.next_flush_time = now + self.flush_interval
+            self.flush()
+        return True
+
+    def flush(self):
+        # Recording first, so the index never points past the end of it.
+        self.f.flush()
+        self.index_f.flush()
+
+    def close(self):
+        self.flush()
+        self.f.close()
+        self.index_f.close()
+
+    def _trim_torn_tail(self):
+        with open(self.path, "r+b") as f:
+            magic, self.width, self.height = RECORD_FILE_HEADER.unpack(f.read(RECORD_FILE_HEADER.size))
+            if magic != RECORD_MAGIC:
+                raise ValueError(f"{self.path} is not a frame recording")
+
+            end = RECORD_FILE_HEADER.size
+            for offset, _, _, _, length in scan_records(f):
+                end = offset + RECORD_HEADER.size + length
+            if end != f.seek(0, os.SEEK_END):
+                f.truncate(end)
+
+        # Cheap compared to the scan above, and drops index entries past a trimmed tail.
+        rebuild_index(self.path)
+
+class FrameReader:
+    def __init__(self, path):
+        """
+        Open a recording made by FrameRecorder for reading.
+        """
+        self.path = path
+        self.f = open(path, "rb")
+        magic, self.width, self.height = RECORD_FILE_HEADER.unpack(self.f.read(RECORD_FILE_HEADER.size))
+        if magic != RECORD_MAGIC:
+            raise ValueError(f"{path} is not a frame recording")
+        self.frame_size = ((self.width + 7) // 8) * self.height
+
+        self.index = []
+        try:
+            with open(index_path(path), "rb") as f:
+                data = f.read()
+            for i in range(0, len(data) - RECORD_INDEX_ENTRY.size + 1, RECORD_INDEX_ENTRY.size):
+                self.index.append(RECORD_INDEX_ENTRY.unpack_from(data, i))
+        except FileNotFoundError:
+            self.index = rebuild_index(path)
+        self.index_times = [timestamp_ms for timestamp_ms, _ in self.index]
+
+    def frames(self, offset=RECORD_FILE_HEADER.size):
+        """
+        Generator that yields a RecordedFrame for every record from offset on.
+        offset must point at a keyframe (or the start of the recording).
+        """
+        frame = None
+        for rec_offset, timestamp_ms, rec_type, menu, length in scan_records(self.f, offset):
+            self.f.seek(rec_offset + RECORD_HEADER.size)
+            delta = inflate(self.f.read(length))
+            if len(delta) != self.frame_size:
+                raise ValueError(f"Record at {rec_offset} decoded to {len(delta)} bytes, expected {self.frame_size}")
+
+            if rec_type == RECORD_TYPE_KEYFRAME:
+                frame = delta
+            elif frame is None:
+                raise ValueError(f"Delta at {rec_offset} has no keyframe before it")
+            else:
+                frame = xor_bytes(frame, delta)
+
+            yield RecordedFrame(timestamp_ms, menu, self.width, self.height, frame)
+
+    def frame_at(self, timestamp) -> RecordedFrame:
+        """
+        The frame that was on screen at timestamp (seconds, like time.time()).
+        Returns None if timestamp is before the first frame.
+        """
+        timestamp_ms = int(timestamp * 1000)
+        i = bisect.bisect_right(self.index_times, timestamp_ms) - 1
+        if i < 0:
+            return None
+
+        shown = None
+        for frame in self.frames(self.index[i][1]):
+            if frame.timestamp_ms > timestamp_ms:
+                break
+            shown = frame
+        return shown
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
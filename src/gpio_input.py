@@ -0,0 +1,228 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# gpio_input.py - Button input backends
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: gpio_input.py
+# Description: Reads the buttons either through RPi.GPIO event detection, or
+#              through the GPIO character device (libgpiod v2). The character
+#              device backend reads edge events with kernel timestamps from a
+#              pollable file descriptor, so the main loop can sleep in
+#              select() until a button is pressed.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Reference: https://libgpiod.readthedocs.io/en/latest/python_api.html
+#   FakeEdgeSource stands in for the character device (see test_gpio_input.py).
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import datetime             # Used for the libgpiod debounce period
+import os                   # Used for the fake event pipe
+import select               # Used to wait for edge events
+import struct               # Used to pack fake edge events
+import time                 # Used when there is no fd to wait on
+
+try:
+    import gpiod            # libgpiod v2 Python bindings, optional
+    from gpiod.line import Bias, Direction, Edge, Value
+except ImportError:
+    gpiod = None
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+GPIO_CHIP_PATH = "/dev/gpiochip0"       # Main header on the Pi Zero 2
+GPIO_CONSUMER = "cups_hat"
+
+GPIO_BOUNCETIME_MS = 200                # Same as the RPi.GPIO bouncetime used before
+GPIO_KERNEL_DEBOUNCE_MS = 10            # Contact bounce filtered in the kernel, well below a quick click
+
+EDGE_FALLING = 0
+EDGE_RISING = 1
+
+FAKE_EVENT = struct.Struct("!IBQ")      # line offset, is_rising, timestamp_ns
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class RPiGpioInput:
+    def __init__(self, io, buttons):
+        """
+        io is the RPi.GPIO module (already in BCM mode).
+        buttons is a dict of pin -> EDGE_FALLING/EDGE_RISING to latch.
+        """
+        self.io = io
+        for pin, edge in buttons.items():
+            # Reference for code below is from link: https://raspberrypihq.com/use-a-push-button-with-raspberry-pi-gpio/
+            io.setup(pin, io.IN, pull_up_down=io.PUD_UP)
+
+            # add_event_detect fails intermittently right after setup; retry until it sticks.
+            while True:
+                try:
+                    io.add_event_detect(pin, io.RISING if edge == EDGE_RISING else io.FALLING, bouncetime=GPIO_BOUNCETIME_MS)
+                except RuntimeError:
+                    time.sleep(0.01)
+                else:
+                    break
+
+    def fileno(self):
+        return None
+
+    def wait(self, timeout):
+        """
+        RPi.GPIO has no fd to wait on, so just sleep.
+        """
+        time.sleep(timeout)
+
+    def is_button_pressed(self, pin) -> bool:
+        return self.io.input(pin) == self.io.LOW
+
+    def is_button_ev_det(self, pin) -> bool:
+        return bool(self.io.event_detected(pin))
+
+class GpiodEdgeSource:
+    def __init__(self, pins, chip_path=GPIO_CHIP_PATH, debounce_ms=GPIO_KERNEL_DEBOUNCE_MS):
+        """
+        Request pins as pulled-up inputs with edge detection on both edges.
+        The kernel filters contact bounce where the GPIO driver supports it.
+        """
+        settings = gpiod.LineSettings(
+            direction=Direction.INPUT,
+            edge_detection=Edge.BOTH,
+            bias=Bias.PULL_UP,
+            debounce_period=datetime.timedelta(milliseconds=debounce_ms))
+        self.request = gpiod.request_lines(chip_path, consumer=GPIO_CONSUMER, config={tuple(pins): settings})
+
+    def fileno(self) -> int:
+        return self.request.fd
+
+    def read_events(self) -> list:
+        """
+        Return [(offset, is_rising, timestamp_ns), ...] for every pending edge.
+        """
+        return [(ev.line_offset, ev.event_type == ev.Type.RISING_EDGE, ev.timestamp_ns)
+                for ev in self.request.read_edge_events()]
+
+    def get_value(self, offset) -> int:
+        return 1 if self.request.get_value(offset) == Value.ACTIVE else 0
+
+    def close(self):
+        self.request.release()
+
+class FakeEdgeSource:
+    def __init__(self, levels):
+        """
+        Pipe-backed stand-in for GpiodEdgeSource. levels is a dict of offset -> initial level.
+        """
+        self.levels = dict(levels)
+        self.read_fd, self.write_fd = os.pipe()
+        os.set_blocking(self.read_fd, False)
+
+    def inject(self, offset, is_rising, timestamp_ns=None):
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        os.write(self.write_fd, FAKE_EVENT.pack(offset, is_rising, timestamp_ns))
+
+    def fileno(self) -> int:
+        return self.read_fd
+
+    def read_events(self) -> list:
+        events = []
+        try:
+            data = os.read(self.read_fd, FAKE_EVENT.size * 64)
+        except BlockingIOError:
+            return events
+        for i in range(0, len(data) - FAKE_EVENT.size + 1, FAKE_EVENT.size):
+            offset, is_rising, timestamp_ns = FAKE_EVENT.unpack_from(data, i)
+            self.levels[offset] = 1 if is_rising else 0
+            events.append((offset, bool(is_rising), timestamp_ns))
+        return events
+
+    def get_value(self, offset) -> int:
+        return self.levels[offset]
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+class EdgeEventInput:
+    def __init__(self, source, buttons, bouncetime_ms=GPIO_BOUNCETIME_MS):
+        """
+        source is a GpiodEdgeSource (or FakeEdgeSource).
+        buttons is a dict of pin -> EDGE_FALLING/EDGE_RISING to latch.
+        Latched edges closer than bouncetime_ms to the previous latched edge on the
+        same pin are dropped, using the kernel timestamps.
+        """
+        self.source = source
+        self.buttons = dict(buttons)
+        self.bounce_ns = bouncetime_ms * 1000000
+        self.levels = {pin: source.get_value(pin) for pin in self.buttons}
+        self.latched = {pin: False for pin in self.buttons}
+        self.last_event_ns = {pin: None for pin in self.buttons}  # Kernel timestamp of the last latched edge
+
+    def fileno(self) -> int:
+        return self.source.fileno()
+
+    def wait(self, timeout):
+        """
+        Block until an edge arrives or timeout seconds pass, then process the edges.
+        Costs no CPU while the buttons are idle.
+        """
+        readable, _, _ = select.select([self.source.fileno()], [], [], timeout)
+        if readable:
+            self.process_events()
+
+    def process_events(self):
+        """
+        Read and latch every pending edge. Call when fileno() is readable.
+        """
+        for pin, is_rising, timestamp_ns in self.source.read_events():
+            if pin not in self.buttons:
+                continue
+            self.levels[pin] = 1 if is_rising else 0
+            if (self.buttons[pin] == EDGE_RISING) != is_rising:
+                continue
+
+            # Like RPi.GPIO bouncetime: drop latched-direction edges too close to the last one.
+            last = self.last_event_ns[pin]
+            if last is not None and timestamp_ns - last < self.bounce_ns:
+                continue
+            self.latched[pin] = True
+            self.last_event_ns[pin] = timestamp_ns
+
+    def is_button_pressed(self, pin) -> bool:
+        """
+        Buttons are active low (pulled up). Uses the level tracked from the edges, no syscall.
+        """
+        return self.levels[pin] == 0
+
+    def is_button_ev_det(self, pin) -> bool:
+        """
+        Sticky like RPi.GPIO event_detected(): True once per latched edge.
+        """
+        retval = self.latched[pin]
+        self.latched[pin] = False
+        return retval
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def create_input(io, buttons, chip_path=GPIO_CHIP_PATH):
+    """
+    Use the GPIO character device if libgpiod is installed and the chip exists,
+    otherwise fall back to RPi.GPIO.
+    """
+    if gpiod is not None and os.path.exists(chip_path):
+        return EdgeEventInput(GpiodEdgeSource(buttons.keys(), chip_path), buttons)
+    return RPiGpioInput(io, buttons)
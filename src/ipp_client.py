@@ -0,0 +1,294 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# ipp_client.py - Minimal IPP client for talking to the local CUPS server
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: ipp_client.py
+# Description: Encodes IPP requests, sends them to CUPS over HTTP and decodes
+#              the responses. Only the parts of RFC 8010/8011 used by the
+#              CUPS Hat are implemented.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Reference: https://www.rfc-editor.org/rfc/rfc8010
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import getpass              # Used for requesting-user-name
+import http.client          # Used to POST IPP requests to CUPS
+import itertools            # Used to generate request ids
+import os                   # Used to name print jobs after their file
+import struct               # Used to encode/decode IPP messages
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+IPP_DEFAULT_HOST = "localhost"
+IPP_DEFAULT_PORT = 631
+IPP_TIMEOUT = 5             # Seconds
+IPP_CHUNK_SIZE = 64 * 1024  # Bytes read from disk per chunk when streaming a document
+
+# Operation ids
+IPP_OP_PRINT_JOB                = 0x0002
+IPP_OP_GET_JOB_ATTRIBUTES       = 0x0009
+IPP_OP_GET_JOBS                 = 0x000A
+IPP_OP_GET_PRINTER_ATTRIBUTES   = 0x000B
+IPP_OP_CUPS_GET_PRINTERS        = 0x4002
+
+# Status codes
+IPP_STATUS_OK                   = 0x0000
+IPP_STATUS_OK_LIMIT             = 0x00FF    # 0x0000-0x00FF are all successful-ok-*
+IPP_STATUS_NOT_FOUND            = 0x0406    # client-error-not-found, e.g. a job already purged
+
+# Delimiter tags
+IPP_TAG_OPERATION               = 0x01
+IPP_TAG_JOB                     = 0x02
+IPP_TAG_END                     = 0x03
+IPP_TAG_PRINTER                 = 0x04
+IPP_TAG_UNSUPPORTED_GROUP       = 0x05
+
+# Value tags
+IPP_TAG_INTEGER                 = 0x21
+IPP_TAG_BOOLEAN                 = 0x22
+IPP_TAG_ENUM                    = 0x23
+IPP_TAG_TEXT                    = 0x41
+IPP_TAG_NAME                    = 0x42
+IPP_TAG_KEYWORD                 = 0x44
+IPP_TAG_URI                     = 0x45
+IPP_TAG_CHARSET                 = 0x47
+IPP_TAG_LANGUAGE                = 0x48
+IPP_TAG_MIMETYPE                = 0x49
+
+# job-state enum values
+IPP_JOB_PENDING                 = 3
+IPP_JOB_HELD                    = 4
+IPP_JOB_PROCESSING              = 5
+IPP_JOB_STOPPED                 = 6
+IPP_JOB_CANCELED                = 7
+IPP_JOB_ABORTED                 = 8
+IPP_JOB_COMPLETED               = 9
+
+# printer-state enum values
+IPP_PRINTER_IDLE                = 3
+IPP_PRINTER_PROCESSING          = 4
+IPP_PRINTER_STOPPED             = 5
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class IPPError(Exception):
+    """
+    Raised when CUPS answers with a non-successful status code, or with an
+    HTTP error instead of an IPP response (status is then None).
+    """
+    def __init__(self, status, http_status=None, http_reason=""):
+        if http_status is None:
+            super().__init__(f"IPP request failed with status 0x{status:04x}")
+        else:
+            super().__init__(f"IPP request failed with HTTP status {http_status} {http_reason}".rstrip())
+        self.status = status
+        self.http_status = http_status
+
+class IPPResponse:
+    def __init__(self, status, request_id, groups):
+        """
+        groups is a list of (group_tag, {name: [values]}) in the order received.
+        """
+        self.status = status
+        self.request_id = request_id
+        self.groups = groups
+
+    def groups_of(self, group_tag) -> list:
+        """
+        Return the attribute dicts of every group with the given tag.
+        e.g. response.groups_of(IPP_TAG_JOB) is one dict per job.
+        """
+        return [attrs for tag, attrs in self.groups if tag == group_tag]
+
+class IPPClient:
+    def __init__(self, host=IPP_DEFAULT_HOST, port=IPP_DEFAULT_PORT, timeout=IPP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.user = getpass.getuser()
+        self.request_ids = itertools.count(1)
+
+    def printer_uri(self, printer_name) -> str:
+        return f"ipp://{self.host}/printers/{printer_name}"
+
+    def request(self, operation, attributes=(), path="/", document=None) -> IPPResponse:
+        """
+        Send an IPP request and return the decoded response.
+        attributes is a list of (value_tag, name, value) tuples for the operation group,
+        value may be a list for multi-valued attributes.
+        document is optional bytes or an iterable of bytes chunks sent after the IPP header.
+        """
+        header = encode_request(operation, next(self.request_ids), attributes, self.user)
+
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            if document is None:
+                conn.request("POST", path, body=header, headers={"Content-Type": "application/ipp"})
+            elif isinstance(document, (bytes, bytearray)):
+                conn.request("POST", path, body=header + document, headers={"Content-Type": "application/ipp"})
+            else:
+                conn.request("POST", path, body=itertools.chain((header,), document),
+                             headers={"Content-Type": "application/ipp"}, encode_chunked=True)
+            reply = conn.getresponse()
+            data = reply.read()
+        finally:
+            conn.close()
+
+        if reply.status != 200:
+            # e.g. 401 when authentication is required; the body is an HTML page, not IPP.
+            raise IPPError(None, reply.status, reply.reason)
+        response = decode_response(data)
+        if response.status > IPP_STATUS_OK_LIMIT:
+            raise IPPError(response.status)
+        return response
+
+    def print_job(self, printer_name, path, job_name=None, document_format="application/octet-stream") -> int:
+        """
+        Submit the file at path to printer_name with Print-Job and return the job id.
+        The file is streamed from disk in IPP_CHUNK_SIZE chunks, so it is never
+        fully loaded into memory. CUPS answers once the document is spooled.
+        """
+        if job_name is None:
+            job_name = os.path.basename(path)
+
+        with open(path, "rb") as f:
+            response = self.request(
+                IPP_OP_PRINT_JOB,
+                [
+                    (IPP_TAG_URI, "printer-uri", self.printer_uri(printer_name)),
+                    (IPP_TAG_NAME, "job-name", job_name),
+                    (IPP_TAG_MIMETYPE, "document-format", document_format),
+                ],
+                path=f"/printers/{printer_name}",
+                document=iter(lambda: f.read(IPP_CHUNK_SIZE), b""))
+
+        for attrs in response.groups_of(IPP_TAG_JOB):
+            return attrs["job-id"][0]
+        raise ValueError("Print-Job response has no job-id")
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Encoder/decoder functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def _encode_value(value_tag, value) -> bytes:
+    if value_tag in (IPP_TAG_INTEGER, IPP_TAG_ENUM):
+        return struct.pack("!i", value)
+    if value_tag == IPP_TAG_BOOLEAN:
+        return struct.pack("!B", 1 if value else 0)
+    return value.encode("utf-8")
+
+def encode_attribute(value_tag, name, value) -> bytes:
+    """
+    Encode one attribute. Lists become additional values with an empty name.
+    """
+    values = value if isinstance(value, (list, tuple)) else [value]
+    out = bytearray()
+    for i, v in enumerate(values):
+        attr_name = name.encode("utf-8") if i == 0 else b""
+        encoded = _encode_value(value_tag, v)
+        out += struct.pack("!BH", value_tag, len(attr_name)) + attr_name
+        out += struct.pack("!H", len(encoded)) + encoded
+    return bytes(out)
+
+def encode_response(status, request_id, groups) -> bytes:
+    """
+    Build an IPP response. groups is a list of (group_tag, [(value_tag, name, value), ...]).
+    Used by stand-in IPP endpoints for testing.
+    """
+    out = bytearray(struct.pack("!BBHI", 2, 0, status, request_id))
+    for group_tag, attributes in groups:
+        out.append(group_tag)
+        for value_tag, name, value in attributes:
+            out += encode_attribute(value_tag, name, value)
+    out.append(IPP_TAG_END)
+    return bytes(out)
+
+def encode_request(operation, request_id, attributes, user) -> bytes:
+    """
+    Build the IPP header for a request (everything before the document data).
+    """
+    out = bytearray(struct.pack("!BBHI", 2, 0, operation, request_id))
+    out.append(IPP_TAG_OPERATION)
+    out += encode_attribute(IPP_TAG_CHARSET, "attributes-charset", "utf-8")
+    out += encode_attribute(IPP_TAG_LANGUAGE, "attributes-natural-language", "en")
+    for value_tag, name, value in attributes:
+        out += encode_attribute(value_tag, name, value)
+    out += encode_attribute(IPP_TAG_NAME, "requesting-user-name", user)
+    out.append(IPP_TAG_END)
+    return bytes(out)
+
+def _decode_value(value_tag, raw):
+    if value_tag in (IPP_TAG_INTEGER, IPP_TAG_ENUM) and len(raw) == 4:
+        return struct.unpack("!i", raw)[0]
+    if value_tag == IPP_TAG_BOOLEAN and len(raw) == 1:
+        return raw[0] != 0
+    if 0x40 <= value_tag <= 0x4F:
+        return raw.decode("utf-8", errors="replace")
+    # Dates, resolutions, ranges, etc. are left as raw bytes.
+    return raw
+
+def decode_response(data) -> IPPResponse:
+    """
+    Decode an IPP response body into an IPPResponse.
+    Raises ValueError if the body is not a complete IPP response.
+    """
+    try:
+        return _decode_response(data)
+    except (struct.error, IndexError) as err:
+        raise ValueError(f"Malformed IPP response: {err}") from None
+
+def _decode_response(data) -> IPPResponse:
+    if len(data) < 9:
+        raise ValueError("IPP response too short")
+
+    _, _, status, request_id = struct.unpack_from("!BBHI", data, 0)
+    pos = 8
+    groups = []
+    attrs = None
+    last_name = None
+
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+
+        if tag == IPP_TAG_END:
+            break
+        if tag < 0x10:
+            # Start of a new attribute group
+            attrs = {}
+            groups.append((tag, attrs))
+            last_name = None
+            continue
+
+        name_len = struct.unpack_from("!H", data, pos)[0]
+        pos += 2
+        name = data[pos:pos + name_len].decode("utf-8", errors="replace")
+        pos += name_len
+        value_len = struct.unpack_from("!H", data, pos)[0]
+        pos += 2
+        value = _decode_value(tag, data[pos:pos + value_len])
+        pos += value_len
+
+        if attrs is None:
+            raise ValueError("IPP attribute outside of a group")
+        if name:
+            last_name = name
+            attrs[name] = [value]
+        elif last_name is not None:
+            attrs[last_name].append(value)
+
+    return IPPResponse(status, request_id, groups)
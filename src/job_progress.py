@@ -0,0 +1,185 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# job_progress.py - Progress of the job a printer is working on
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: job_progress.py
+# Description: Reads sheets, impressions and bytes processed of the job a
+#              printer is printing. The first poll finds the job with Get-Jobs,
+#              later polls only ask for that job with Get-Job-Attributes.
+#              JobProgressCadence decides when to poll next: often while the
+#              numbers move, backing off while they don't.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Progress is only polled while the Printer Info page is showing a printer
+#   that is printing (see collector_worker.py). An idle printer costs nothing
+#   beyond the regular printer poll.
+#   Totals (job-impressions, job-media-sheets, job-k-octets) are 0 when the
+#   printer or the document format doesn't report them.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import ipp_client
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+JOB_PROGRESS_ATTRIBUTES = [
+    "job-id",
+    "job-name",
+    "job-state",
+    "job-media-sheets-completed",
+    "job-media-sheets",
+    "job-impressions-completed",
+    "job-impressions",
+    "job-k-octets-processed",
+    "job-k-octets",
+]
+
+JOB_PROGRESS_SEARCH_LIMIT = 4           # Jobs looked at to find the one printing
+
+JOB_PROGRESS_INTERVAL_MIN = 0.5         # Seconds between polls while the job is moving
+JOB_PROGRESS_INTERVAL_MAX = 4.0         # Backoff limit while it isn't (e.g. out of paper)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class JobProgress:
+    def __init__(self, job_id=0, name="", state=0):
+        self.job_id = job_id
+        self.name = name
+        self.state = state
+        self.sheets_completed = 0
+        self.sheets = 0
+        self.impressions_completed = 0
+        self.impressions = 0
+        self.k_octets_processed = 0
+        self.k_octets = 0
+
+    def counters(self) -> tuple:
+        """
+        Everything the progress view shows, to tell whether a poll changed anything.
+        """
+        return (self.job_id, self.state, self.sheets_completed, self.sheets, self.impressions_completed,
+                self.impressions, self.k_octets_processed, self.k_octets)
+
+    def is_active(self) -> bool:
+        return self.state in (ipp_client.IPP_JOB_PROCESSING, ipp_client.IPP_JOB_STOPPED)
+
+    def fraction(self):
+        """
+        Fraction done from the best counter with a known total, or None.
+        """
+        for done, total in ((self.impressions_completed, self.impressions),
+                            (self.sheets_completed, self.sheets),
+                            (self.k_octets_processed, self.k_octets)):
+            if total > 0:
+                return min(done / total, 1.0)
+        return None
+
+    def pages_text(self) -> str:
+        if self.sheets > 0:
+            return f"{self.sheets_completed}/{self.sheets}"
+        return str(self.sheets_completed)
+
+    def update(self, attrs):
+        """
+        Copy the attributes of a Get-Jobs/Get-Job-Attributes job group.
+        """
+        self.job_id = attrs.get("job-id", [self.job_id])[0]
+        self.name = attrs.get("job-name", [self.name])[0]
+        self.state = attrs.get("job-state", [0])[0]
+        self.sheets_completed = attrs.get("job-media-sheets-completed", [0])[0]
+        self.sheets = attrs.get("job-media-sheets", [0])[0]
+        self.impressions_completed = attrs.get("job-impressions-completed", [0])[0]
+        self.impressions = attrs.get("job-impressions", [0])[0]
+        self.k_octets_processed = attrs.get("job-k-octets-processed", [0])[0]
+        self.k_octets = attrs.get("job-k-octets", [0])[0]
+
+class JobProgressMonitor:
+    def __init__(self, ipp: ipp_client.IPPClient, printer_name):
+        """
+        Follows the job printer_name is printing.
+        """
+        self.ipp = ipp
+        self.printer_name = printer_name
+        self.progress = None        # JobProgress of the job being followed, None if there isn't one
+
+    def poll(self) -> JobProgress:
+        """
+        Refresh the progress of the job being printed. Returns None once nothing is printing.
+        Raises OSError/IPPError if CUPS can't be reached.
+        """
+        if self.progress is not None:
+            try:
+                response = self.ipp.request(
+                    ipp_client.IPP_OP_GET_JOB_ATTRIBUTES,
+                    [
+                        (ipp_client.IPP_TAG_URI, "printer-uri", self.ipp.printer_uri(self.printer_name)),
+                        (ipp_client.IPP_TAG_INTEGER, "job-id", self.progress.job_id),
+                        (ipp_client.IPP_TAG_KEYWORD, "requested-attributes", JOB_PROGRESS_ATTRIBUTES),
+                    ],
+                    path=f"/printers/{self.printer_name}")
+            except ipp_client.IPPError:
+                response = None     # The job was purged or cancelled between polls, CUPS doesn't know it anymore
+            if response is not None:
+                for attrs in response.groups_of(ipp_client.IPP_TAG_JOB):
+                    self.progress.update(attrs)
+                if self.progress.is_active():
+                    return self.progress
+
+        # Not following a job yet, or it finished or is gone: look for the one printing now.
+        self.progress = None
+        response = self.ipp.request(
+            ipp_client.IPP_OP_GET_JOBS,
+            [
+                (ipp_client.IPP_TAG_URI, "printer-uri", self.ipp.printer_uri(self.printer_name)),
+                (ipp_client.IPP_TAG_INTEGER, "limit", JOB_PROGRESS_SEARCH_LIMIT),
+                (ipp_client.IPP_TAG_KEYWORD, "which-jobs", "not-completed"),
+                (ipp_client.IPP_TAG_KEYWORD, "requested-attributes", JOB_PROGRESS_ATTRIBUTES),
+            ],
+            path=f"/printers/{self.printer_name}")
+        for attrs in response.groups_of(ipp_client.IPP_TAG_JOB):
+            progress = JobProgress()
+            progress.update(attrs)
+            if progress.is_active():
+                self.progress = progress
+                break
+        return self.progress
+
+class JobProgressCadence:
+    def __init__(self, interval_min=JOB_PROGRESS_INTERVAL_MIN, interval_max=JOB_PROGRESS_INTERVAL_MAX):
+        """
+        Poll interval for the progress view: interval_min while the counters
+        move, doubled after every poll that didn't change them.
+        """
+        self.interval_min = interval_min
+        self.interval_max = interval_max
+        self.interval = interval_min
+        self.last_counters = None
+
+    def reset(self):
+        self.interval = self.interval_min
+        self.last_counters = None
+
+    def next_interval(self, progress) -> float:
+        """
+        Seconds until the next poll, given the result of the last one.
+        """
+        counters = progress.counters() if progress is not None else None
+        if counters != self.last_counters:
+            self.interval = self.interval_min
+        else:
+            self.interval = min(self.interval * 2, self.interval_max)
+        self.last_counters = counters
+        return self.interval
@@ -0,0 +1,270 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# job_queue.py - Paginated CUPS job queue browser
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: job_queue.py
+# Description: Lists the jobs of a CUPS queue a page at a time. Only the
+#              visible page plus a prefetch window is fetched from CUPS
+#              (Get-Jobs with first-index/limit), and rendered rows are cached
+#              so paging back and forth doesn't redraw text.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Fetching runs on a background thread so the display loop never waits on CUPS.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import threading            # Used for the background fetch thread
+import time                 # Used for the refresh interval
+import collections          # Used for the row bitmap LRU cache
+
+import ipp_client
+import bitplane             # Used to pack the rendered rows
+
+from PIL import Image, ImageDraw
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+JOBQ_ROWS_PER_PAGE = 3
+JOBQ_PREFETCH_PAGES = 2         # Pages fetched ahead of (and behind) the visible page
+JOBQ_KEEP_PAGES = 8             # Jobs further than this from the visible page are forgotten
+JOBQ_REFRESH_INTERVAL = 5       # Seconds between re-reading the queue while it is shown
+
+JOBQ_ROW_WIDTH = 108
+JOBQ_ROW_HEIGHT = 9
+POS_JOBQ_ROW_TEXT = (0, -2)
+JOBQ_ROW_CACHE_SIZE = 64
+
+JOBQ_REQUESTED_ATTRIBUTES = ["job-id", "job-originating-user-name", "job-state", "job-k-octets"]
+
+JOBQ_STATE_NAMES = {
+    ipp_client.IPP_JOB_PENDING:     "pend",
+    ipp_client.IPP_JOB_HELD:        "held",
+    ipp_client.IPP_JOB_PROCESSING:  "prnt",
+    ipp_client.IPP_JOB_STOPPED:     "stop",
+    ipp_client.IPP_JOB_CANCELED:    "canc",
+    ipp_client.IPP_JOB_ABORTED:     "abrt",
+    ipp_client.IPP_JOB_COMPLETED:   "done",
+}
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class JobRow:
+    def __init__(self, job_id, user, state, size_kb):
+        self.job_id = job_id
+        self.user = user
+        self.state = state
+        self.size_kb = size_kb
+
+    def key(self) -> tuple:
+        return (self.job_id, self.user, self.state, self.size_kb)
+
+    def text(self) -> str:
+        state = JOBQ_STATE_NAMES.get(self.state, "?")
+        return f"{self.job_id} {self.user[:6]} {state} {self.size_kb}K"
+
+class JobRowCache:
+    def __init__(self, font, size=JOBQ_ROW_CACHE_SIZE, lazy=False):
+        """
+        LRU cache of rendered row sprites, keyed by the row contents. lazy is passed to bitplane.Sprite.
+        """
+        self.font = font
+        self.size = size
+        self.lazy = lazy
+        self.rows = collections.OrderedDict()
+
+    def get(self, row: JobRow) -> bitplane.Sprite:
+        key = row.key()
+        sprite = self.rows.get(key)
+        if sprite is not None:
+            self.rows.move_to_end(key)
+            return sprite
+
+        img = Image.new("1", (JOBQ_ROW_WIDTH, JOBQ_ROW_HEIGHT))
+        ImageDraw.Draw(img).text(POS_JOBQ_ROW_TEXT, row.text(), font=self.font, fill=255)
+        sprite = bitplane.Sprite(img, lazy=self.lazy)
+        self.rows[key] = sprite
+        if len(self.rows) > self.size:
+            self.rows.popitem(last=False)
+        return sprite
+
+class JobQueueBrowser:
+    def __init__(self, ipp: ipp_client.IPPClient, printer_name, rows_per_page=JOBQ_ROWS_PER_PAGE):
+        self.ipp = ipp
+        self.printer_name = printer_name
+        self.rows_per_page = rows_per_page
+
+        self.page = 0
+        self.job_count = 0
+        self.jobs = {}              # 0-based queue index -> JobRow
+        self.is_active = False      # True while the queue screen is shown
+        self.next_refresh = 0
+        self.last_error = None
+
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.flag_kill_thread = False
+
+    #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+    # Called from the display loop
+    #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+    def open(self):
+        """
+        Start showing the queue from the first page.
+        """
+        with self.lock:
+            self.page = 0
+            self.jobs.clear()
+        self.is_active = True
+        self.next_refresh = 0
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._thread_fetch, daemon=True)
+            self.thread.start()
+        self.wake.set()
+
+    def close(self):
+        """
+        Stop refreshing the queue; the fetch thread goes idle.
+        """
+        self.is_active = False
+
+    def stop(self):
+        """
+        Stop the fetch thread. Call from app cleanup.
+        """
+        self.flag_kill_thread = True
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def page_count(self) -> int:
+        return max(1, -(-self.job_count // self.rows_per_page))
+
+    def is_first_page(self) -> bool:
+        return self.page == 0
+
+    def is_last_page(self) -> bool:
+        return self.page >= self.page_count() - 1
+
+    def page_left(self):
+        with self.lock:
+            if self.page > 0:
+                self.page -= 1
+                self.wake.set()
+
+    def page_right(self):
+        with self.lock:     # The fetch thread may be clamping the page to a new job count
+            if self.page < self.page_count() - 1:
+                self.page += 1
+                self.wake.set()
+
+    def visible_rows(self) -> list:
+        """
+        Rows of the current page. Entries are None while still being fetched.
+        """
+        with self.lock:
+            first = self.page * self.rows_per_page
+            last = min(first + self.rows_per_page, self.job_count)
+            return [self.jobs.get(i) for i in range(first, last)]
+
+    #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+    # Background fetching
+    #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+    def _thread_fetch(self):
+        while not self.flag_kill_thread:
+            self.wake.wait(JOBQ_REFRESH_INTERVAL)
+            self.wake.clear()
+            if not self.is_active or self.flag_kill_thread:
+                continue
+
+            try:
+                is_refresh = time.monotonic() >= self.next_refresh
+                if is_refresh:
+                    # The queue may have changed; re-read the count and the whole window.
+                    self.next_refresh = time.monotonic() + JOBQ_REFRESH_INTERVAL
+                    self._fetch_job_count()
+                self._fetch_window(is_refresh)
+                self.last_error = None
+            except (OSError, ValueError, ipp_client.IPPError) as err:
+                self.last_error = err
+
+    def _fetch_job_count(self):
+        response = self.ipp.request(
+            ipp_client.IPP_OP_GET_PRINTER_ATTRIBUTES,
+            [
+                (ipp_client.IPP_TAG_URI, "printer-uri", self.ipp.printer_uri(self.printer_name)),
+                (ipp_client.IPP_TAG_KEYWORD, "requested-attributes", ["queued-job-count"]),
+            ],
+            path=f"/printers/{self.printer_name}")
+
+        with self.lock:     # Same lock as the page turns, so a turn never lands past the new last page
+            for attrs in response.groups_of(ipp_client.IPP_TAG_PRINTER):
+                self.job_count = attrs.get("queued-job-count", [0])[0]
+
+            if self.page > self.page_count() - 1:
+                self.page = self.page_count() - 1
+
+    def _fetch_window(self, is_refresh=False):
+        """
+        Fetch whatever is missing from the visible page +/- JOBQ_PREFETCH_PAGES,
+        using a single Get-Jobs request. On refresh the whole window is re-read
+        and replaces every cached row, so stale rows never linger.
+        """
+        with self.lock:
+            page = self.page
+            first = max(0, (page - JOBQ_PREFETCH_PAGES) * self.rows_per_page)
+            last = min(self.job_count, (page + 1 + JOBQ_PREFETCH_PAGES) * self.rows_per_page)
+
+            # Forget rows that are far from the visible page to keep memory flat.
+            keep_first = (page - JOBQ_KEEP_PAGES) * self.rows_per_page
+            keep_last = (page + 1 + JOBQ_KEEP_PAGES) * self.rows_per_page
+            for index in [i for i in self.jobs if i < keep_first or i >= keep_last]:
+                del self.jobs[index]
+
+            if is_refresh:
+                missing = list(range(first, last))
+            else:
+                missing = [i for i in range(first, last) if i not in self.jobs]
+        if not missing:
+            if is_refresh:
+                with self.lock:
+                    self.jobs.clear()
+            return
+
+        first_missing = missing[0]
+        limit = missing[-1] - first_missing + 1
+        response = self.ipp.request(
+            ipp_client.IPP_OP_GET_JOBS,
+            [
+                (ipp_client.IPP_TAG_URI, "printer-uri", self.ipp.printer_uri(self.printer_name)),
+                (ipp_client.IPP_TAG_INTEGER, "first-index", first_missing + 1),    # IPP indices are 1-based
+                (ipp_client.IPP_TAG_INTEGER, "limit", limit),
+                (ipp_client.IPP_TAG_KEYWORD, "which-jobs", "not-completed"),
+                (ipp_client.IPP_TAG_KEYWORD, "requested-attributes", JOBQ_REQUESTED_ATTRIBUTES),
+            ],
+            path=f"/printers/{self.printer_name}")
+
+        with self.lock:
+            if is_refresh:
+                self.jobs.clear()
+            for offset, attrs in enumerate(response.groups_of(ipp_client.IPP_TAG_JOB)):
+                self.jobs[first_missing + offset] = JobRow(
+                    attrs.get("job-id", [0])[0],
+                    attrs.get("job-originating-user-name", [""])[0],
+                    attrs.get("job-state", [0])[0],
+                    attrs.get("job-k-octets", [0])[0])
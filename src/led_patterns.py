@@ -0,0 +1,304 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# led_patterns.py - LED pattern engine for the status LEDs
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: led_patterns.py
+# Description: Maps printer/system states to LED patterns (solid, blink,
+#              blink-N, breathe) and hands them to a backend that runs them
+#              without Python wakeups where possible:
+#                - SysfsLed: kernel LED class (gpio-leds overlay). Uses the
+#                  "timer" and "pattern" triggers, so every pattern runs in
+#                  the kernel.
+#                - GpioPwmLed: RPi.GPIO PWM. Solid and blink run in the
+#                  RPi.GPIO PWM thread; breathe and blink-N are stepped from
+#                  tick() as a fallback.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   GPIO23/24/25 are not hardware PWM pins on the Pi Zero 2, so the kernel
+#   LED class is the preferred backend. Add to /boot/firmware/config.txt:
+#       dtoverlay=gpio-led,gpio=23,label=cupshat:green
+#       dtoverlay=gpio-led,gpio=24,label=cupshat:orange
+#       dtoverlay=gpio-led,gpio=25,label=cupshat:red
+#   and load the pattern trigger (modprobe ledtrig-pattern).
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os                   # Used to find kernel LEDs
+import threading            # Used to wake the tick thread only when needed
+import time                 # Used to step software patterns
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+LED_SYSFS_ROOT = "/sys/class/leds"
+
+LED_GREEN   = "green"
+LED_ORANGE  = "orange"
+LED_RED     = "red"
+
+# Kernel LED names, as given by the gpio-led overlay labels.
+LED_SYSFS_NAMES = {
+    LED_GREEN:  "cupshat:green",
+    LED_ORANGE: "cupshat:orange",
+    LED_RED:    "cupshat:red",
+}
+
+# Pattern kinds
+PATTERN_OFF         = 0
+PATTERN_SOLID       = 1
+PATTERN_BLINK       = 2
+PATTERN_BLINK_N     = 3
+PATTERN_BREATHE     = 4
+
+# System states, highest priority last. Paper out beats error: CUPS reports it as
+# media-empty-error, which also makes the summary status an error, and the orange
+# double blink tells more than the red LED.
+LED_STATE_IDLE          = 0
+LED_STATE_PRINTING      = 1
+LED_STATE_ERROR         = 2
+LED_STATE_PAPER_OUT     = 3
+LED_STATE_OVERHEATED    = 4
+
+LED_OVERHEAT_TEMP_C = 80.0
+
+LED_GPIO_PWM_FREQ = 200         # Hz, used for solid/breathe duty cycles
+LED_TICK_RATE = 0.02            # Seconds between software steps (breathe/blink-N fallback)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class LedPattern:
+    def __init__(self, kind, on_ms=0, off_ms=0, count=0, pause_ms=0):
+        """
+        on_ms/off_ms: blink timing. For breathe, on_ms is the ramp-up and off_ms the ramp-down.
+        count/pause_ms: for blink-N, number of blinks followed by a pause.
+        """
+        self.kind = kind
+        self.on_ms = on_ms
+        self.off_ms = off_ms
+        self.count = count
+        self.pause_ms = pause_ms
+
+    def __eq__(self, other):
+        return isinstance(other, LedPattern) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self) -> tuple:
+        return (self.kind, self.on_ms, self.off_ms, self.count, self.pause_ms)
+
+    def period_ms(self) -> int:
+        if self.kind == PATTERN_BLINK_N:
+            return self.count * (self.on_ms + self.off_ms) + self.pause_ms
+        return self.on_ms + self.off_ms
+
+    def level_at(self, now) -> float:
+        """
+        Brightness (0.0 - 1.0) at time now, in seconds. Used for software stepping.
+        """
+        if self.kind == PATTERN_OFF:
+            return 0.0
+        if self.kind == PATTERN_SOLID:
+            return 1.0
+
+        t = (now * 1000) % self.period_ms()
+        if self.kind == PATTERN_BREATHE:
+            if t < self.on_ms:
+                return t / self.on_ms
+            return 1.0 - (t - self.on_ms) / self.off_ms
+
+        if self.kind == PATTERN_BLINK_N and t >= self.count * (self.on_ms + self.off_ms):
+            return 0.0
+        return 1.0 if (t % (self.on_ms + self.off_ms)) < self.on_ms else 0.0
+
+    def kernel_pattern(self, max_brightness) -> str:
+        """
+        Pattern for the kernel "pattern" LED trigger: pairs of brightness and duration.
+        The kernel ramps linearly between entries; zero-length steps give hard edges.
+        """
+        hi = max_brightness
+        if self.kind == PATTERN_BREATHE:
+            steps = [(0, self.on_ms), (hi, self.off_ms)]
+        else:
+            steps = []
+            for _ in range(self.count if self.kind == PATTERN_BLINK_N else 1):
+                steps += [(hi, self.on_ms), (hi, 0), (0, self.off_ms), (0, 0)]
+            if self.kind == PATTERN_BLINK_N and self.pause_ms:
+                steps += [(0, self.pause_ms), (0, 0)]
+        return " ".join(f"{b} {d}" for b, d in steps)
+
+PATTERN_LED_OFF = LedPattern(PATTERN_OFF)
+PATTERN_LED_ON = LedPattern(PATTERN_SOLID)
+
+# State -> pattern for each LED
+LED_STATE_PATTERNS = {
+    LED_STATE_IDLE: {
+        LED_GREEN:  LedPattern(PATTERN_BLINK, on_ms=250, off_ms=250),      # Heartbeat
+        LED_ORANGE: PATTERN_LED_OFF,
+        LED_RED:    PATTERN_LED_OFF,
+    },
+    LED_STATE_PRINTING: {
+        LED_GREEN:  PATTERN_LED_ON,
+        LED_ORANGE: LedPattern(PATTERN_BREATHE, on_ms=1000, off_ms=1000),
+        LED_RED:    PATTERN_LED_OFF,
+    },
+    LED_STATE_ERROR: {
+        LED_GREEN:  PATTERN_LED_ON,
+        LED_ORANGE: PATTERN_LED_OFF,
+        LED_RED:    PATTERN_LED_ON,
+    },
+    LED_STATE_PAPER_OUT: {
+        LED_GREEN:  PATTERN_LED_ON,
+        LED_ORANGE: LedPattern(PATTERN_BLINK_N, on_ms=150, off_ms=150, count=2, pause_ms=1000),
+        LED_RED:    PATTERN_LED_OFF,
+    },
+    LED_STATE_OVERHEATED: {
+        LED_GREEN:  PATTERN_LED_ON,
+        LED_ORANGE: PATTERN_LED_OFF,
+        LED_RED:    LedPattern(PATTERN_BLINK_N, on_ms=100, off_ms=100, count=3, pause_ms=700),
+    },
+}
+
+class SysfsLed:
+    def __init__(self, path):
+        """
+        path is the kernel LED directory, e.g. /sys/class/leds/cupshat:green
+        """
+        self.path = path
+        with open(os.path.join(path, "max_brightness")) as f:
+            self.max_brightness = int(f.read())
+
+    def needs_tick(self) -> bool:
+        return False
+
+    def set_pattern(self, pattern: LedPattern):
+        if pattern.kind in (PATTERN_OFF, PATTERN_SOLID):
+            self._write("trigger", "none")
+            self._write("brightness", self.max_brightness if pattern.kind == PATTERN_SOLID else 0)
+        elif pattern.kind == PATTERN_BLINK:
+            self._write("trigger", "timer")
+            self._write("delay_on", pattern.on_ms)
+            self._write("delay_off", pattern.off_ms)
+        else:
+            self._write("trigger", "pattern")
+            self._write("pattern", pattern.kernel_pattern(self.max_brightness))
+            self._write("repeat", -1)
+
+    def tick(self, now):
+        pass
+
+    def _write(self, name, value):
+        with open(os.path.join(self.path, name), "w") as f:
+            f.write(str(value))
+
+class GpioPwmLed:
+    def __init__(self, io, pin):
+        """
+        io is the RPi.GPIO module; pin must already be set up as an output.
+        """
+        self.pwm = io.PWM(pin, LED_GPIO_PWM_FREQ)
+        self.pwm.start(0)
+        self.pattern = PATTERN_LED_OFF
+        self.duty = 0
+
+    def needs_tick(self) -> bool:
+        return self.pattern.kind in (PATTERN_BREATHE, PATTERN_BLINK_N)
+
+    def set_pattern(self, pattern: LedPattern):
+        self.pattern = pattern
+        if pattern.kind == PATTERN_BLINK:
+            # The RPi.GPIO PWM thread does the blinking.
+            self.pwm.ChangeFrequency(1000 / pattern.period_ms())
+            self._set_duty(100 * pattern.on_ms / pattern.period_ms())
+        else:
+            self.pwm.ChangeFrequency(LED_GPIO_PWM_FREQ)
+            self._set_duty(100 if pattern.kind == PATTERN_SOLID else 0)
+
+    def tick(self, now):
+        if self.needs_tick():
+            self._set_duty(round(100 * self.pattern.level_at(now)))
+
+    def _set_duty(self, duty):
+        if duty != self.duty:
+            self.duty = duty
+            self.pwm.ChangeDutyCycle(duty)
+
+class LedPatternEngine:
+    def __init__(self, leds):
+        """
+        leds is a dict of LED_GREEN/LED_ORANGE/LED_RED -> backend (SysfsLed or GpioPwmLed).
+        """
+        self.leds = leds
+        self.state = None
+        self.tick_needed = threading.Event()   # Set while a backend needs software stepping
+        self.set_state(LED_STATE_IDLE)
+
+    def set_state(self, state):
+        """
+        Apply the patterns for state. Does nothing if the state didn't change.
+        """
+        if state == self.state:
+            return
+        self.state = state
+
+        for name, led in self.leds.items():
+            led.set_pattern(LED_STATE_PATTERNS[state][name])
+
+        if self.needs_tick():
+            self.tick_needed.set()
+        else:
+            self.tick_needed.clear()
+
+    def needs_tick(self) -> bool:
+        return any(led.needs_tick() for led in self.leds.values())
+
+    def tick(self):
+        now = time.monotonic()
+        for led in self.leds.values():
+            led.tick(now)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def create_leds(io, pins) -> dict:
+    """
+    Use the kernel LED for each LED if it exists, otherwise fall back to RPi.GPIO PWM.
+    pins is a dict of LED_GREEN/LED_ORANGE/LED_RED -> BCM pin.
+    """
+    leds = {}
+    for name, pin in pins.items():
+        path = os.path.join(LED_SYSFS_ROOT, LED_SYSFS_NAMES[name])
+        if os.path.isdir(path):
+            leds[name] = SysfsLed(path)
+        else:
+            leds[name] = GpioPwmLed(io, pin)
+    return leds
+
+def resolve_state(summary_status, state_reasons, cpu_temperature) -> int:
+    """
+    Pick the highest priority LED_STATE_... for the current printer/system status.
+    summary_status is one of the printer_status.PRINTER_STATUS_... values,
+    state_reasons is every printer-state-reasons keyword across all printers.
+    """
+    if cpu_temperature is not None and cpu_temperature >= LED_OVERHEAT_TEMP_C:
+        return LED_STATE_OVERHEATED
+    if any(r.startswith("media-empty") or r.startswith("media-needed") for r in state_reasons):
+        return LED_STATE_PAPER_OUT
+    if summary_status < 0:
+        return LED_STATE_ERROR
+    if summary_status > 0:
+        return LED_STATE_PRINTING
+    return LED_STATE_IDLE
@@ -19,6 +19,8 @@
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
 import cups_hat_display as CUPS_Hat
+import task_profiler
+import memory_report
 import time
 import threading
 
@@ -26,12 +28,26 @@ import threading
 # Global Variables
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
-flag_tick_heartbeat = False
+flag_tick_led = False
 flag_tick_oled_update = False
+flag_tick_printer_status = True     # Poll once right away at startup
 
 # Tick rates
 tick_rate_oled_update = 0.1        # Refresh rate - 10Hz
-tick_rate_heartbeat = 0.25         # Blink LED every 250ms
+tick_rate_led = CUPS_Hat.led_patterns.LED_TICK_RATE     # Only used for software-stepped LED patterns
+tick_rate_printer_status = 2.0     # Poll all printers every 2s while busy (one IPP request, in the collector worker)
+
+# Framebuffer mirror for remote support. Set to a Unix socket path
+# (e.g. "/tmp/cups_hat_oled.sock") or a (host, port) tuple to enable.
+mirror_address = None
+
+# Frame recording, e.g. "/home/pi/cups_hat_frames.ofr". Every distinct frame is
+# appended; see frame_recorder.py for the format and frame_compare.py to check it.
+record_path = None
+
+# Low memory mode for boards where CUPS needs the RAM: fewer cached sprites,
+# icons kept as packed bytes, and no label font once the labels are drawn.
+low_memory = False
 
 # Kill threads?
 flag_kill_threads = False
@@ -45,8 +61,31 @@ def app_cleanup():
     """
     Function is called before shutting down or exiting the app
     """
+    cups_hat.job_queue.stop()
+    cups_hat.collectors.stop()
+    if cups_hat.recorder is not None:
+        cups_hat.recorder.close()
+        cups_hat.recorder = None
+    if cups_hat.mirror is not None:
+        cups_hat.mirror.close()     # Also removes the Unix socket file
+        cups_hat.mirror = None
 # END OF def app_cleanup()
 
+def app_exit(threads):
+    """
+    Stop the ticker threads, show the closing animation, then clean up.
+    The animation goes out before app_cleanup() so it is still recorded and mirrored.
+    """
+    global flag_kill_threads
+    flag_kill_threads = True
+    cups_hat.led_engine.tick_needed.set()
+    for thread in threads:
+        thread.join()
+
+    cups_hat.display_shutdown()
+    app_cleanup()
+# END OF def app_exit()
+
 # TODO: Define all task methods with "task_" before the name
 # Refer to Task State Diagram in OneNote
 def task_oled_update(cups_hat: CUPS_Hat):
@@ -97,16 +136,42 @@ def task_check_inputs(cups_hat: CUPS_Hat):
 
 # END OF def task_check_inputs()
 
+def task_printer_status(cups_hat: CUPS_Hat):
+    """
+    Task that refreshes the status of all configured printers.
+    Also runs as soon as the collector worker has a new poll, e.g. after a job arrived.
+    """
+    global flag_tick_printer_status
+    if flag_tick_printer_status is True or cups_hat.is_printer_poll_new():
+        flag_tick_printer_status = False
+        cups_hat.run_printer_info_commands()
+# END OF def task_printer_status()
+
 def task_led_status(cups_hat: CUPS_Hat):
     """
-    Task that updates the LEDs/Neopixels to indicate system status
+    Task that steps LED patterns the backend can't run by itself.
+    Pattern changes are applied by task_printer_status.
     """
-    global flag_tick_heartbeat
-    if flag_tick_heartbeat is True:
-        flag_tick_heartbeat = False
-        cups_hat.heartbeat()
+    global flag_tick_led
+    if flag_tick_led is True:
+        flag_tick_led = False
+        cups_hat.led_engine.tick()
 # END OF def task_led_status()
 
+def main_loop_iteration(cups_hat: CUPS_Hat):
+    """
+    One pass of the main loop: sleep until a button is pressed or the next tick
+    is due, instead of spinning, then call each task.
+    """
+    cups_hat.wait_for_input(tick_rate_led if cups_hat.led_engine.needs_tick() else tick_rate_oled_update)
+
+    profiler.run("task_check_inputs", task_check_inputs, cups_hat)
+    profiler.run("task_oled_prepare_framebuffer", task_oled_prepare_framebuffer, cups_hat)
+    profiler.run("task_oled_update", task_oled_update, cups_hat)
+    profiler.run("task_printer_status", task_printer_status, cups_hat)
+    profiler.run("task_led_status", task_led_status, cups_hat)
+# END OF def main_loop_iteration()
+
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 # Thread functions
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
@@ -117,11 +182,19 @@ def thread_oled_timer(tick_rate):
         flag_tick_oled_update = True
         time.sleep(tick_rate)
 
-def thread_heartbeat_timer(tick_rate):
-    global flag_tick_heartbeat
+def thread_led_timer(tick_rate):
+    global flag_tick_led
+    while not flag_kill_threads:
+        # Sleep without waking up while every LED pattern runs in the kernel/PWM thread.
+        cups_hat.led_engine.tick_needed.wait()
+        flag_tick_led = True
+        time.sleep(tick_rate)
+
+def thread_printer_status_timer(tick_rate):
+    global flag_tick_printer_status
     while not flag_kill_threads:
-        flag_tick_heartbeat = True
         time.sleep(tick_rate)
+        flag_tick_printer_status = True
 
 
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
@@ -129,42 +202,47 @@ def thread_heartbeat_timer(tick_rate):
 #-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 
 # Define the Class instance as a global variable to allow methods to be called during Keyboard Interrupts
-cups_hat = CUPS_Hat.CUPS_Hat()
+cups_hat = CUPS_Hat.CUPS_Hat(low_memory=low_memory)
+
+# Per-task timing is always on. Send SIGUSR1 to sample the main loop and dump a profile.
+profiler = task_profiler.TaskProfiler()
+
+# Send SIGUSR2 for a report of the memory held per subsystem (needs python -X tracemalloc).
+memory_reporter = memory_report.MemoryReporter()
 
 if __name__ == '__main__':
     try:
         """ Main application """
+        if mirror_address is not None:
+            cups_hat.enable_mirror(mirror_address)
+        if record_path is not None:
+            cups_hat.enable_recorder(record_path)
+
+        profiler.install_signal_handler()
+        memory_reporter.install_signal_handler()
+        cups_hat.start_collectors(tick_rate_printer_status)
+
         # Start threads
         thread_1 = threading.Thread(target=thread_oled_timer, args=(tick_rate_oled_update,))
-        thread_2 = threading.Thread(target=thread_heartbeat_timer, args=(tick_rate_heartbeat,))
+        thread_2 = threading.Thread(target=thread_led_timer, args=(tick_rate_led,))
+        thread_3 = threading.Thread(target=thread_printer_status_timer, args=(tick_rate_printer_status,))
 
         thread_1.start()
         thread_2.start()
+        thread_3.start()
 
         cups_hat.display_startup()
         print("Starting display...")
 
         while True:
-            # Call each task
-            task_check_inputs(cups_hat)
-            task_oled_prepare_framebuffer(cups_hat)
-            task_oled_update(cups_hat)
-            task_led_status(cups_hat)
+            main_loop_iteration(cups_hat)
 
     except KeyboardInterrupt:
-        flag_kill_threads = True
-        thread_1.join()
-        thread_2.join()
-
         print("\nEnding test....")
-        cups_hat.display_shutdown()
+        app_exit([thread_1, thread_2, thread_3])
 
     except SystemExit:
         #TODO: Replace or remove this SystemExit processing later.
         #NOTE: SystemExit is the exception result of calling exit()
-        flag_kill_threads = True
-        thread_1.join()
-        thread_2.join()
-
         print("Byeee")
-        cups_hat.display_shutdown()
\ No newline at end of file
+        app_exit([thread_1, thread_2, thread_3])
\ No newline at end of file
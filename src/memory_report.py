@@ -0,0 +1,158 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# memory_report.py - Memory held by each part of the app, from tracemalloc
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: memory_report.py
+# Description: Sending SIGUSR2 to the process takes a tracemalloc snapshot and
+#              dumps the memory still held, per subsystem (the module of this
+#              app that allocated it), with the largest allocation sites of
+#              each, next to the process RSS.
+#
+# Usage:
+#   python -X tracemalloc=16 src/main.py
+#   kill -USR2 $(pgrep -f main.py)
+#   cat /tmp/cups_hat_memory_*.txt
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   tracemalloc has to run from the start to see the allocations, and it slows
+#   the app down, so it is only on when asked for with -X tracemalloc.
+#   An allocation is charged to the innermost frame of this app's modules on
+#   its stack, skipping the compositor helpers (bitplane.py, widgets.py) so a
+#   sprite counts for the module that asked for it. Allocations made while
+#   importing a module count as "imports".
+#   Memory allocated by C libraries directly (PIL image buffers, FreeType) is
+#   not traced; the gap between RSS and the traced total covers it and the
+#   interpreter itself.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import collections          # Used to sum the sizes per subsystem
+import os                   # Used to build the dump path
+import signal               # Used to dump the report on SIGUSR2
+import threading            # Used to take the snapshot off the main loop
+import time                 # Used to name the dump
+import tracemalloc          # Used to find who holds the memory
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+MEMORY_DUMP_DIR = "/tmp"
+MEMORY_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+MEMORY_HELPER_MODULES = ("bitplane.py", "widgets.py")   # Allocate on behalf of their callers
+MEMORY_TOP_SITES = 3            # Allocation sites listed per subsystem
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class MemoryReporter:
+    def __init__(self, dump_dir=MEMORY_DUMP_DIR):
+        self.dump_dir = dump_dir
+        self.writer = None
+        self.last_dump_path = None
+
+    def install_signal_handler(self, signum=signal.SIGUSR2):
+        """
+        Dump a report whenever signum is received.
+        Must be called from the main thread.
+        """
+        signal.signal(signum, lambda signum, frame: self.start_dump())
+
+    def start_dump(self):
+        """
+        Write a report to a file from a background thread.
+        Ignored if one is already being written.
+        """
+        if self.writer is not None and self.writer.is_alive():
+            return
+        self.writer = threading.Thread(target=self._thread_dump, name="memory-report", daemon=True)
+        self.writer.start()
+
+    def _thread_dump(self):
+        path = os.path.join(self.dump_dir, time.strftime("cups_hat_memory_%Y%m%d_%H%M%S.txt"))
+        with open(path, "w") as f:
+            f.write(report())
+            f.write("\n")
+        self.last_dump_path = path
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def subsystem_of(traceback) -> tuple:
+    """
+    (subsystem, allocation site) to charge a tracemalloc traceback to.
+    """
+    helper = None
+    for frame in reversed(traceback):           # Innermost frame first
+        if frame.filename.startswith("<frozen importlib"):
+            return "imports", f"{os.path.basename(traceback[-1].filename)}:{traceback[-1].lineno}"
+        if frame.filename.startswith("<") or os.path.dirname(os.path.abspath(frame.filename)) != MEMORY_SRC_DIR:
+            continue            # Not one of this app's modules, "<frozen abc>" would resolve next to them
+        module = os.path.basename(frame.filename)
+        if module not in MEMORY_HELPER_MODULES:
+            return module, f"{module}:{frame.lineno}"
+        if helper is None:
+            helper = (module, f"{module}:{frame.lineno}")
+    if helper is not None:
+        return helper
+    return "other", f"{os.path.basename(traceback[-1].filename)}:{traceback[-1].lineno}"
+
+def subsystem_sizes(snapshot, baseline=None) -> dict:
+    """
+    subsystem -> (bytes, {allocation site -> bytes}) for a tracemalloc snapshot,
+    or for what it holds on top of the baseline snapshot.
+    """
+    if baseline is None:
+        stats = [(stat.traceback, stat.size) for stat in snapshot.statistics("traceback")]
+    else:
+        stats = [(stat.traceback, stat.size_diff) for stat in snapshot.compare_to(baseline, "traceback")]
+
+    sizes = collections.Counter()
+    sites = collections.defaultdict(collections.Counter)
+    for traceback, size in stats:
+        subsystem, site = subsystem_of(traceback)
+        sizes[subsystem] += size
+        sites[subsystem][site] += size
+    return {subsystem: (size, sites[subsystem]) for subsystem, size in sizes.items()}
+
+def rss_kb() -> int:
+    """
+    Resident set size of this process in kB, 0 if /proc isn't there.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def report(snapshot=None, baseline=None) -> str:
+    """
+    Memory held per subsystem as a text table, largest first. See subsystem_sizes().
+    """
+    if snapshot is None:
+        if not tracemalloc.is_tracing():
+            return "tracemalloc is not running, start the app with: python -X tracemalloc=16 src/main.py"
+        snapshot = tracemalloc.take_snapshot()
+
+    sizes = subsystem_sizes(snapshot, baseline)
+    traced = sum(size for size, _ in sizes.values())
+    lines = [f"RSS {rss_kb()} kB, traced {traced // 1024} kB (the rest is the interpreter and C libraries)",
+             f"{'subsystem':<24} {'kB':>8}  largest allocation sites"]
+    for subsystem, (size, sites) in sorted(sizes.items(), key=lambda item: item[1][0], reverse=True):
+        top = ", ".join(f"{site} {site_size // 1024}k" for site, site_size in sites.most_common(MEMORY_TOP_SITES))
+        lines.append(f"{subsystem:<24} {size / 1024:>8.1f}  {top}")
+    return "\n".join(lines)
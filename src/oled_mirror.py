@@ -0,0 +1,236 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# oled_mirror.py - Streams the OLED framebuffer to local subscribers
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: oled_mirror.py
+# Description: Publishes the contents of img_framebuffer over a Unix or TCP
+#              socket so the display can be watched during remote support.
+#              Subscribers receive a keyframe first, then XOR/RLE deltas
+#              only when the frame changes.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Message format (all integers big-endian):
+#       magic 'OM' | type (1 byte) | width (u16) | height (u16) | length (u32) | payload
+#   type 'K' is a keyframe, type 'D' is a delta against the previous frame.
+#   The payload is always the RLE of (frame XOR reference), where the reference
+#   of a keyframe is an all-black frame. See rle_encode() for the RLE layout.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os                   # Used to remove stale Unix socket files
+import select               # Used to check for new subscribers without blocking
+import socket               # Used for the Unix/TCP listening socket
+import struct               # Used to pack the message header
+import time                 # Used to rate-limit the accept check
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+MIRROR_MAGIC = b"OM"
+MIRROR_TYPE_KEYFRAME = b"K"
+MIRROR_TYPE_DELTA = b"D"
+
+MIRROR_HEADER = struct.Struct("!2scHHI")
+
+# How often (in seconds) to check the listening socket for new subscribers.
+MIRROR_ACCEPT_INTERVAL = 0.5
+
+MIRROR_MAX_SUBSCRIBERS = 4
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Codec functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def xor_bytes(a: bytes, b: bytes) -> bytes:
+    """
+    XOR two equal-length byte strings.
+    """
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(len(a), "big")
+
+def rle_encode(data: bytes) -> bytes:
+    """
+    Run-length encode a (mostly zero) XOR delta.
+    The output is a sequence of records: zero_run (u8), literal_len (u8), literal bytes.
+    """
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        zeros = 0
+        while i < n and data[i] == 0 and zeros < 255:
+            zeros += 1
+            i += 1
+
+        start = i
+        while i < n and data[i] != 0 and (i - start) < 255:
+            i += 1
+
+        out.append(zeros)
+        out.append(i - start)
+        out += data[start:i]
+    return bytes(out)
+
+def rle_decode(data: bytes, size: int) -> bytes:
+    """
+    Reverse rle_encode(). size is the length of the decoded frame.
+    """
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        zeros = data[i]
+        literal_len = data[i + 1]
+        i += 2
+        out += bytes(zeros)
+        out += data[i:i + literal_len]
+        i += literal_len
+
+    if len(out) != size:
+        raise ValueError(f"Decoded {len(out)} bytes, expected {size}")
+    return bytes(out)
+
+def encode_message(msg_type: bytes, width: int, height: int, payload: bytes) -> bytes:
+    """
+    Prepend the mirror header to payload.
+    """
+    return MIRROR_HEADER.pack(MIRROR_MAGIC, msg_type, width, height, len(payload)) + payload
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class MirrorSubscriber:
+    def __init__(self, sock):
+        """
+        One connected viewer. At most one message is queued at a time;
+        frames produced while it is still sending are skipped.
+        """
+        self.sock = sock
+        self.pending = bytearray()
+        self.needs_keyframe = False
+
+class FramebufferMirror:
+    def __init__(self, address):
+        """
+        address is either a path (str) for a Unix socket,
+        or a (host, port) tuple for a TCP socket.
+        """
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.remove(address)
+            self.listen_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.listen_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listen_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        self.address = address
+        self.listen_sock.bind(address)
+        self.listen_sock.listen(MIRROR_MAX_SUBSCRIBERS)
+        self.listen_sock.setblocking(False)
+
+        self.subscribers = []
+        self.last_frame = None      # bytes of the last published frame
+        self.width = 0
+        self.height = 0
+        self.next_accept_time = 0
+
+    def publish(self, img_framebuffer):
+        """
+        Send the framebuffer to all subscribers if it changed since the last call.
+        img_framebuffer is a mode "1" PIL Image.
+        """
+        now = time.monotonic()
+        if now >= self.next_accept_time:
+            self.next_accept_time = now + MIRROR_ACCEPT_INTERVAL
+            self._accept_subscribers(img_framebuffer)
+
+        if not self.subscribers:
+            # Nobody is watching, skip the conversion entirely.
+            self.last_frame = None
+            return
+
+        frame = img_framebuffer.tobytes()
+        if frame != self.last_frame:
+            self.width, self.height = img_framebuffer.size
+            delta = encode_message(MIRROR_TYPE_DELTA, self.width, self.height,
+                                   rle_encode(xor_bytes(frame, self.last_frame)))
+            self.last_frame = frame
+
+            for sub in self.subscribers:
+                if sub.pending or sub.needs_keyframe:
+                    # Still busy with an older message. Skip this frame and
+                    # re-sync with a keyframe once it catches up.
+                    sub.needs_keyframe = True
+                else:
+                    sub.pending += delta
+
+        self._flush_all()
+
+    def close(self):
+        """
+        Disconnect all subscribers and stop listening.
+        """
+        for sub in list(self.subscribers):
+            self._drop(sub)
+        self.listen_sock.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def _keyframe(self) -> bytes:
+        return encode_message(MIRROR_TYPE_KEYFRAME, self.width, self.height,
+                              rle_encode(self.last_frame))
+
+    def _accept_subscribers(self, img_framebuffer):
+        readable, _, _ = select.select([self.listen_sock], [], [], 0)
+        if not readable:
+            return
+
+        while len(self.subscribers) < MIRROR_MAX_SUBSCRIBERS:
+            try:
+                sock, _ = self.listen_sock.accept()
+            except BlockingIOError:
+                break
+            sock.setblocking(False)
+
+            if self.last_frame is None:
+                self.width, self.height = img_framebuffer.size
+                self.last_frame = img_framebuffer.tobytes()
+
+            # New subscribers always start with a keyframe of the last published frame,
+            # so every subscriber shares the same delta reference.
+            sub = MirrorSubscriber(sock)
+            sub.pending += self._keyframe()
+            self.subscribers.append(sub)
+
+    def _flush_all(self):
+        for sub in list(self.subscribers):
+            if not sub.pending:
+                if not sub.needs_keyframe:
+                    continue
+                sub.needs_keyframe = False
+                sub.pending += self._keyframe()
+
+            try:
+                sent = sub.sock.send(sub.pending)
+            except BlockingIOError:
+                continue
+            except OSError:
+                self._drop(sub)
+                continue
+            del sub.pending[:sent]
+
+    def _drop(self, sub):
+        self.subscribers.remove(sub)
+        try:
+            sub.sock.close()
+        except OSError:
+            pass
@@ -0,0 +1,105 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# oled_mirror_viewer.py - Rebuilds OLED frames streamed by oled_mirror.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: oled_mirror_viewer.py
+# Description: Connects to the framebuffer mirror and draws each frame in the
+#              terminal. Optionally saves the latest frame as a PNG.
+#
+# Usage:
+#   python oled_mirror_viewer.py /tmp/cups_hat_oled.sock
+#   python oled_mirror_viewer.py 192.168.1.20:8765 --png latest.png
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import argparse
+import socket
+
+import oled_mirror
+
+def recv_exact(sock, size) -> bytes:
+    """
+    Read exactly size bytes from sock. Raises ConnectionError on EOF.
+    """
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("Mirror closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+def read_frames(sock):
+    """
+    Generator that yields (width, height, frame_bytes) for every message received.
+    Frame bytes are in PIL mode "1" raw layout (rows packed MSB first).
+    """
+    frame = None
+    while True:
+        magic, msg_type, width, height, length = oled_mirror.MIRROR_HEADER.unpack(
+            recv_exact(sock, oled_mirror.MIRROR_HEADER.size))
+        if magic != oled_mirror.MIRROR_MAGIC:
+            raise ValueError("Bad magic in mirror stream")
+
+        size = ((width + 7) // 8) * height
+        delta = oled_mirror.rle_decode(recv_exact(sock, length), size)
+
+        if msg_type == oled_mirror.MIRROR_TYPE_KEYFRAME:
+            frame = delta
+        elif frame is None:
+            # A delta is useless without a keyframe to apply it to.
+            continue
+        else:
+            frame = oled_mirror.xor_bytes(frame, delta)
+
+        yield width, height, frame
+
+def frame_to_text(width, height, frame) -> str:
+    """
+    Render a frame as text, two pixel rows per character line.
+    """
+    stride = (width + 7) // 8
+
+    def pixel(x, y):
+        return (frame[y * stride + (x >> 3)] >> (7 - (x & 7))) & 1
+
+    glyphs = {(0, 0): " ", (1, 0): "▀", (0, 1): "▄", (1, 1): "█"}
+    lines = []
+    for y in range(0, height, 2):
+        lines.append("".join(glyphs[(pixel(x, y), pixel(x, y + 1) if y + 1 < height else 0)]
+                             for x in range(width)))
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="View the CUPS Hat OLED remotely.")
+    parser.add_argument("address", help="Unix socket path, or host:port for TCP")
+    parser.add_argument("--png", help="Also save the latest frame to this PNG file")
+    args = parser.parse_args()
+
+    if ":" in args.address:
+        host, port = args.address.rsplit(":", 1)
+        sock = socket.create_connection((host, int(port)))
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.address)
+
+    for width, height, frame in read_frames(sock):
+        # Move the cursor home so the frame redraws in place.
+        print("\x1b[H\x1b[2J" + frame_to_text(width, height, frame), flush=True)
+
+        if args.png:
+            from PIL import Image
+            Image.frombytes("1", (width, height), frame).save(args.png)
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nEnding viewer.....")
@@ -0,0 +1,137 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# printer_status.py - Status of every CUPS queue managed by the hat
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: printer_status.py
+# Description: Refreshes all configured printers with a single
+#              CUPS-Get-Printers request per poll, so the poll cost stays the
+#              same no matter how many queues the hat fronts.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import ipp_client
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+# Summary status values, as stored in CUPS_Hat.printer_status
+PRINTER_STATUS_OK       = 0         # All printers idle
+PRINTER_STATUS_BUSY     = 1         # At least one printer is printing
+PRINTER_STATUS_ERROR    = -1        # At least one printer is stopped, missing or unreachable
+
+PRINTER_REQUESTED_ATTRIBUTES = [
+    "printer-name",
+    "printer-state",
+    "printer-state-reasons",
+    "printer-state-message",
+    "printer-is-accepting-jobs",
+    "queued-job-count",
+]
+
+# printer-state-reasons that don't mean anything is wrong.
+PRINTER_BENIGN_REASONS = ("none", "cups-waiting-for-job-completed")
+
+PRINTER_STATE_NAMES = {
+    ipp_client.IPP_PRINTER_IDLE:        "Idle",
+    ipp_client.IPP_PRINTER_PROCESSING:  "Printing",
+    ipp_client.IPP_PRINTER_STOPPED:     "Stopped",
+}
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class PrinterInfo:
+    def __init__(self, name):
+        self.name = name
+        self.is_found = False       # False until CUPS reports the queue
+        self.state = 0
+        self.state_reasons = []
+        self.state_message = ""
+        self.is_accepting = False
+        self.queued_job_count = 0
+
+    def state_name(self) -> str:
+        if not self.is_found:
+            return "Not found"
+        return PRINTER_STATE_NAMES.get(self.state, "Unknown")
+
+    def reasons(self) -> list:
+        """
+        printer-state-reasons without the benign ones.
+        """
+        return [r for r in self.state_reasons if r not in PRINTER_BENIGN_REASONS]
+
+    def status(self) -> int:
+        """
+        Collapse this printer into one of the PRINTER_STATUS_... values.
+        """
+        if not self.is_found or self.state == ipp_client.IPP_PRINTER_STOPPED:
+            return PRINTER_STATUS_ERROR
+        if any(r.endswith("-error") for r in self.state_reasons):
+            return PRINTER_STATUS_ERROR
+        if self.state == ipp_client.IPP_PRINTER_PROCESSING:
+            return PRINTER_STATUS_BUSY
+        return PRINTER_STATUS_OK
+
+class PrinterMonitor:
+    def __init__(self, ipp: ipp_client.IPPClient, printer_names):
+        self.ipp = ipp
+        self.printer_names = list(printer_names)
+        self.printers = [PrinterInfo(name) for name in self.printer_names]
+        self.is_reachable = False   # False if the last poll couldn't reach CUPS
+
+    def poll(self):
+        """
+        Refresh every configured printer with one CUPS-Get-Printers request.
+        Raises OSError/IPPError if CUPS can't be reached.
+        """
+        try:
+            response = self.ipp.request(
+                ipp_client.IPP_OP_CUPS_GET_PRINTERS,
+                [(ipp_client.IPP_TAG_KEYWORD, "requested-attributes", PRINTER_REQUESTED_ATTRIBUTES)])
+        except (OSError, ValueError, ipp_client.IPPError):
+            self.is_reachable = False
+            raise
+        self.is_reachable = True
+
+        reported = {}
+        for attrs in response.groups_of(ipp_client.IPP_TAG_PRINTER):
+            reported[attrs.get("printer-name", [""])[0]] = attrs
+
+        for printer in self.printers:
+            attrs = reported.get(printer.name)
+            printer.is_found = attrs is not None
+            if attrs is None:
+                continue
+            printer.state = attrs.get("printer-state", [0])[0]
+            printer.state_reasons = attrs.get("printer-state-reasons", [])
+            printer.state_message = attrs.get("printer-state-message", [""])[0]
+            printer.is_accepting = attrs.get("printer-is-accepting-jobs", [False])[0]
+            printer.queued_job_count = attrs.get("queued-job-count", [0])[0]
+
+    def summary_status(self) -> int:
+        """
+        Worst status across all printers: ERROR beats BUSY beats OK.
+        """
+        if not self.is_reachable:
+            return PRINTER_STATUS_ERROR
+
+        statuses = [printer.status() for printer in self.printers]
+        if PRINTER_STATUS_ERROR in statuses:
+            return PRINTER_STATUS_ERROR
+        if PRINTER_STATUS_BUSY in statuses:
+            return PRINTER_STATUS_BUSY
+        return PRINTER_STATUS_OK
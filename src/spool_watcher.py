@@ -0,0 +1,153 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# spool_watcher.py - Notices print jobs arriving and finishing through inotify
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: spool_watcher.py
+# Description: Watches the CUPS spool directory with inotify. CUPS writes a
+#              control file (c00042) and data files (d00042-001) there when a
+#              job arrives, rewrites the control file on every job state
+#              change, and removes the data files when the job is done. The
+#              collector worker waits on the watcher's fd, and polls CUPS right
+#              after a job file changed instead of on a fast timer. The CUPS
+#              state directory can be watched too: CUPS saves job.cache there
+#              when jobs change state, including ones the spool doesn't see
+#              (a job held or cancelled after its files are gone).
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Reference: man 7 inotify. The calls go through ctypes, no extra package.
+#   /var/spool/cups is root:lp 0710, the watcher needs to run as root or lp.
+#   /run/cups only holds the socket and certificates, nothing that changes
+#   with the jobs, so it isn't worth a watch.
+#   Files other than job files (temp files, the tmp/ directory) are ignored.
+#   If a watched directory goes away, its watch is dropped. Once no watch is
+#   left, is_active() is False and the worker goes back to polling.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import errno                # Used for the errors raised when inotify is unavailable
+import os                   # Used to read the inotify fd
+import re                   # Used to recognize job files
+import struct               # Used to unpack inotify events
+
+try:
+    import ctypes           # Used to call inotify_init1/inotify_add_watch
+    import ctypes.util
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1
+    libc.inotify_add_watch
+except (ImportError, OSError, AttributeError):
+    libc = None             # Not Linux
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE  = 0x00000008
+IN_MOVED_FROM   = 0x00000040
+IN_MOVED_TO     = 0x00000080
+IN_CREATE       = 0x00000100
+IN_DELETE       = 0x00000200
+IN_Q_OVERFLOW   = 0x00004000
+IN_IGNORED      = 0x00008000
+IN_NONBLOCK     = 0o4000
+IN_CLOEXEC      = 0o2000000
+
+SPOOL_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+SPOOL_JOB_FILE = re.compile(r"^(c\d+|d\d+-\d+|job\.cache)$")  # Control and data files of a job, the job state cache
+SPOOL_EVENT = struct.Struct("iIII")                 # wd, mask, cookie, name length
+SPOOL_READ_SIZE = 4096
+
+SPOOL_SETTLE_TIME = 0.2     # Seconds to let CUPS finish writing a job's files before polling
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class SpoolWatcher:
+    def __init__(self, dirs):
+        """
+        Watch dirs for job files being created, rewritten, renamed or removed.
+        Raises OSError if inotify isn't available or none of dirs can be watched.
+        """
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self.watches = {}           # watch descriptor -> directory
+        for path in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(path), SPOOL_WATCH_MASK)
+            if wd < 0:
+                print(f"Spool watcher: can't watch {path}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self.watches[wd] = path
+
+        if not self.watches:
+            os.close(self.fd)
+            raise OSError(errno.ENOENT, "none of the spool directories can be watched")
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def is_active(self) -> bool:
+        """
+        False once every watched directory is gone.
+        """
+        return bool(self.watches)
+
+    def read_events(self) -> int:
+        """
+        Read every pending event. Returns how many were about job files.
+        A queue overflow counts as one, since events were lost.
+        """
+        count = 0
+        while True:
+            try:
+                data = os.read(self.fd, SPOOL_READ_SIZE)
+            except BlockingIOError:
+                return count
+
+            offset = 0
+            while offset + SPOOL_EVENT.size <= len(data):
+                wd, mask, _, length = SPOOL_EVENT.unpack_from(data, offset)
+                name = data[offset + SPOOL_EVENT.size:offset + SPOOL_EVENT.size + length].rstrip(b"\0").decode(errors="replace")
+                offset += SPOOL_EVENT.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    count += 1
+                elif mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                elif SPOOL_JOB_FILE.match(name):
+                    count += 1
+
+    def close(self):
+        os.close(self.fd)
+        self.watches = {}
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def create_spool_watcher(dirs):
+    """
+    A SpoolWatcher for dirs, or None (polling only) if dirs is empty or can't be watched.
+    """
+    if not dirs:
+        return None
+    try:
+        return SpoolWatcher(dirs)
+    except OSError as err:
+        print(f"Spool watcher disabled, polling instead: {err}")
+        return None
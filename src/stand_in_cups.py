@@ -0,0 +1,121 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# stand_in_cups.py - A stand-in CUPS server for the tests
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: stand_in_cups.py
+# Description: Serves IPP over HTTP on 127.0.0.1 from a background thread, so
+#              the tests can run ipp_client, the job queue, the printer poll
+#              and the collector worker without CUPS. A test subclasses
+#              StandInCups and answers each request in reply().
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Requests with a document (Print-Job) arrive chunked: the first chunk is
+#   the IPP header and the rest is the document, as ipp_client sends them.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import collections          # Used to count the requests per operation
+import http.server          # Used to serve IPP over HTTP
+import threading            # Used to serve from the background
+import time                 # Used to time stamp the requests
+
+import ipp_client
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class StandInCups:
+    def __init__(self):
+        """
+        Start serving on a free port, see self.port.
+        """
+        self.requests = collections.Counter()   # operation -> count
+        self.log = []               # (time.monotonic(), operation, operation attributes) of every request
+        self.lock = threading.Lock()
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def client(self, timeout=ipp_client.IPP_TIMEOUT) -> ipp_client.IPPClient:
+        return ipp_client.IPPClient("127.0.0.1", self.port, timeout)
+
+    def reply(self, operation, attributes, document) -> tuple:
+        """
+        (status, groups) to answer with, groups as for ipp_client.encode_response()
+        without the operation group. document is the list of document chunks, None
+        for requests without one. Override in the test.
+        """
+        return ipp_client.IPP_STATUS_OK, []
+
+    def raw_reply(self, operation, attributes) -> tuple:
+        """
+        (HTTP status, content type, body) to answer with instead of an IPP
+        response, e.g. an HTML error page, or None to answer with reply().
+        Override in the test.
+        """
+        return None
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _answer(self, header, document) -> tuple:
+        request = ipp_client.decode_response(header)    # Same layout as a response
+        operation = request.status
+        attributes = (request.groups_of(ipp_client.IPP_TAG_OPERATION) or [{}])[0]
+        with self.lock:
+            self.requests[operation] += 1
+            self.log.append((time.monotonic(), operation, attributes))
+
+        raw = self.raw_reply(operation, attributes)
+        if raw is not None:
+            return raw
+        status, groups = self.reply(operation, attributes, document)
+        return 200, "application/ipp", ipp_client.encode_response(status, request.request_id, [
+            (ipp_client.IPP_TAG_OPERATION, [
+                (ipp_client.IPP_TAG_CHARSET, "attributes-charset", "utf-8"),
+                (ipp_client.IPP_TAG_LANGUAGE, "attributes-natural-language", "en"),
+            ]),
+        ] + groups)
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def _handler_for(cups: StandInCups):
+    class StandInCupsHandler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        break
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+                header, document = chunks[0], chunks[1:]
+            else:
+                header, document = self.rfile.read(int(self.headers["Content-Length"])), None
+
+            http_status, content_type, reply = cups._answer(header, document)
+            self.send_response(http_status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInCupsHandler
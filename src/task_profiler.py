@@ -0,0 +1,140 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# task_profiler.py - Per-task timing and an on-demand sampling profiler
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: task_profiler.py
+# Description: Keeps call count, cumulative time and max time for every task
+#              in the main loop. Sending SIGUSR1 to the process samples the
+#              main thread's stack for PROFILE_WINDOW seconds and dumps the
+#              task stats plus the sampled stacks to a file.
+#
+# Usage:
+#   kill -USR1 $(pgrep -f main.py)
+#   cat /tmp/cups_hat_profile_*.txt
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   The sampled stacks are written in "collapsed" format (frames joined by ';'
+#   followed by a count), which flamegraph.pl and speedscope read directly.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import collections          # Used to count sampled stacks
+import os                   # Used to build the dump path
+import signal               # Used to start the sampler on SIGUSR1
+import sys                  # Used to read the main thread's stack
+import threading            # Used for the sampler thread
+import time                 # Used for timing
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Constant Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+PROFILE_DUMP_DIR = "/tmp"
+PROFILE_WINDOW = 10.0           # Seconds to sample after the signal
+PROFILE_SAMPLE_INTERVAL = 0.005 # Seconds between stack samples
+PROFILE_MAX_DEPTH = 32
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class TaskStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+class TaskProfiler:
+    def __init__(self, dump_dir=PROFILE_DUMP_DIR, window=PROFILE_WINDOW):
+        self.stats = collections.defaultdict(TaskStats)
+        self.dump_dir = dump_dir
+        self.window = window
+        self.main_thread_id = threading.main_thread().ident
+        self.sampler = None
+        self.last_dump_path = None
+
+    def run(self, name, task, *args):
+        """
+        Call task(*args) and record how long it took under name.
+        """
+        start = time.perf_counter()
+        try:
+            return task(*args)
+        finally:
+            self.stats[name].add(time.perf_counter() - start)
+
+    def install_signal_handler(self, signum=signal.SIGUSR1):
+        """
+        Start a sampling window whenever signum is received.
+        Must be called from the main thread.
+        """
+        signal.signal(signum, lambda signum, frame: self.start_sampling())
+
+    def start_sampling(self):
+        """
+        Sample the main thread for self.window seconds, then dump to a file.
+        Ignored if a sampling window is already running.
+        """
+        if self.sampler is not None and self.sampler.is_alive():
+            return
+        self.sampler = threading.Thread(target=self._thread_sample, name="task-profiler", daemon=True)
+        self.sampler.start()
+
+    def report(self) -> str:
+        """
+        Per-task stats as a text table, slowest cumulative time first.
+        """
+        lines = [f"{'task':<32} {'calls':>10} {'total s':>10} {'avg ms':>8} {'max ms':>8}"]
+        # Copied: the main loop may add a task while the sampler thread reports.
+        for name, st in sorted(list(self.stats.items()), key=lambda item: item[1].total, reverse=True):
+            avg = st.total / st.count if st.count else 0
+            lines.append(f"{name:<32} {st.count:>10} {st.total:>10.3f} {avg * 1000:>8.3f} {st.max * 1000:>8.3f}")
+        return "\n".join(lines)
+
+    def _thread_sample(self):
+        samples = collections.Counter()
+        end = time.monotonic() + self.window
+        while time.monotonic() < end:
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is not None:
+                samples[_collapse_stack(frame)] += 1
+            del frame
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+
+        path = os.path.join(self.dump_dir, time.strftime("cups_hat_profile_%Y%m%d_%H%M%S.txt"))
+        with open(path, "w") as f:
+            f.write(self.report())
+            f.write(f"\n\n# {sum(samples.values())} samples over {self.window}s (collapsed stacks)\n")
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        self.last_dump_path = path
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def _collapse_stack(frame) -> str:
+    """
+    Turn a frame into "outer;...;inner" using file:function names.
+    """
+    names = []
+    while frame is not None and len(names) < PROFILE_MAX_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
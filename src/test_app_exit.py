@@ -0,0 +1,88 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_app_exit.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_app_exit.py
+# Description: Runs main.py's exit path (Ctrl-C or exit()) with the stub GPIO
+#              and OLED modules from test_soak.py, with frame recording and
+#              the framebuffer mirror on. Checks the closing animation runs to
+#              the end, is the last frame in the recording and reaches the
+#              mirror viewer, and the panel is cleared after it.
+#
+# Usage:
+#   python src/test_app_exit.py             (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   The collector worker and the ticker threads are not started.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import socket
+import tempfile
+
+from check_results import check, finish
+import test_soak
+
+test_soak.install_stub_modules()
+
+import frame_recorder
+import main
+
+def read_until_closed(sock) -> bytes:
+    data = bytearray()
+    while chunk := sock.recv(65536):
+        data += chunk
+    return bytes(data)
+
+def test_exit(path, mirror_path):
+    cups_hat = main.cups_hat
+    cups_hat.enable_recorder(path)
+    cups_hat.enable_mirror(mirror_path)
+    viewer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    viewer.connect(mirror_path)
+    cups_hat.display_startup()
+    cups_hat.menu_prepare_framebuffer()
+    cups_hat.oled_update(wait=True)
+
+    # The frame on the panel right before it is cleared.
+    shutdown_frames = []
+    clear = cups_hat.display_manager.clear
+    def clear_after_shutdown(wait=True):
+        shutdown_frames.append(cups_hat.img_framebuffer.tobytes())
+        clear(wait)
+    cups_hat.display_manager.clear = clear_after_shutdown
+
+    try:
+        main.app_exit([])
+        error = None
+    except (OSError, ValueError) as err:
+        error = err
+    check(f"exit path runs to the end with recording and mirror on ({error!r})", error is None and bool(shutdown_frames))
+    check("recorder closed and dropped", cups_hat.recorder is None)
+    check("mirror closed and dropped", cups_hat.mirror is None and not os.path.exists(mirror_path))
+
+    viewer.settimeout(5)
+    streamed = read_until_closed(viewer)
+    viewer.close()
+    check(f"mirror viewer got the frames, then the end of the stream ({len(streamed)} bytes)", len(streamed) > 0)
+
+    with frame_recorder.FrameReader(path) as reader:
+        frames = list(reader.frames())
+    check(f"closing animation is the last recorded frame ({len(frames)} frames)",
+          len(frames) >= 2 and frames[-1].data == shutdown_frames[0])
+    check("panel cleared after the closing animation", not any(cups_hat.main_panel.device.buf))
+    cups_hat.display_manager.stop()
+
+def main_test():
+    directory = tempfile.mkdtemp(prefix="exit_")
+    test_exit(os.path.join(directory, "frames.ofr"), os.path.join(directory, "oled.sock"))
+    finish()
+
+if __name__ == '__main__':
+    main_test()
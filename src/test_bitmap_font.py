@@ -0,0 +1,94 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_bitmap_font.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_bitmap_font.py
+# Description: Checks that every font in bitmap_font.FONT_BUILD_LIST draws the
+#              same pixels as ImageDraw.text() with the TTF, for the menu
+#              strings and random text, then benchmarks both paths.
+#
+# Usage:
+#   python src/test_bitmap_font.py          (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+import bitmap_font
+
+MENU_STRINGS = [
+    "Reboot", "Print\nTest Page", "Shutdown", "Printer\nInfo", "System\nInfo",
+    "Printer\nOptions", "Job\nQueue", "Resume\nPrinter", "Cancel All\nJobs",
+    "Reset\nUSB", "Go Back to\nMain Menu", "Welcome!\nStartup!", "Goodbye!\nShutdown!",
+]
+
+BENCH_ROUNDS = 2000
+
+def draw_ttf(font, text, xy, spacing):
+    img = Image.new("1", (80, 26))
+    ImageDraw.Draw(img).text(xy, text, font=font, fill=255, spacing=spacing)
+    return img
+
+def draw_bitmap(font, text, xy, spacing):
+    img = Image.new("1", (80, 26))
+    font.draw_text(img, xy, text, fill=255, spacing=spacing)
+    return img
+
+def main():
+    rng = random.Random(1)
+    ok = True
+
+    for ttf_path, size in bitmap_font.FONT_BUILD_LIST:
+        ttf = ImageFont.truetype(ttf_path, size=size)
+        bmp = bitmap_font.BitmapFont(bitmap_font.compile_font(ttf_path, size))
+        charset = "".join(ch for ch in bmp.glyphs)
+
+        cases = [(text, (3, -2), -2) for text in MENU_STRINGS]
+        for _ in range(500):
+            text = "".join(rng.choice(charset) for _ in range(rng.randint(1, 12)))
+            if rng.random() < 0.3:
+                text += "\n" + "".join(rng.choice(charset) for _ in range(rng.randint(1, 12)))
+            cases.append((text, (rng.randint(-4, 8), rng.randint(-4, 8)), rng.choice([-2, 0, 4])))
+
+        mismatches = [case for case in cases
+                      if draw_ttf(ttf, *case).tobytes() != draw_bitmap(bmp, *case).tobytes()]
+        print(f"{ttf_path} {size}px: {len(bmp.glyphs)} glyphs, {len(cases) - len(mismatches)}/{len(cases)} identical")
+        for case in mismatches[:5]:
+            print(f"  differs: {case!r}")
+        ok &= not mismatches
+
+        # Benchmark the menu strings on both paths, drawing into one reused image like the app.
+        img = Image.new("1", (80, 26))
+        draw = ImageDraw.Draw(img)
+        start = time.perf_counter()
+        for _ in range(BENCH_ROUNDS):
+            for text in MENU_STRINGS:
+                draw.text((3, -2), text, font=ttf, fill=255, spacing=-2)
+        ttf_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(BENCH_ROUNDS):
+            for text in MENU_STRINGS:
+                bmp.draw_text(img, (3, -2), text, fill=255, spacing=-2)
+        bmp_time = time.perf_counter() - start
+
+        draws = BENCH_ROUNDS * len(MENU_STRINGS)
+        print(f"  TTF:    {ttf_time / draws * 1e6:7.1f} us per draw")
+        print(f"  bitmap: {bmp_time / draws * 1e6:7.1f} us per draw ({ttf_time / bmp_time:.1f}x faster)")
+
+    print("PASSED" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
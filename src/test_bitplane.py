@@ -0,0 +1,153 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_bitplane.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_bitplane.py
+# Description: Pastes random sprites (half of them lazy) at random positions
+#              and clip boxes with both bitplane.Bitplane and PIL, and checks
+#              the screens match, with and without numpy. Then times
+#              composing a main menu frame (icon, text box, arrows) both ways.
+#
+# Usage:
+#   python src/test_bitplane.py             (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+import bitmap_font
+import bitplane
+
+ROUNDS = 300
+BENCH_FRAMES = 2000
+
+def random_image(rng, width, height) -> Image.Image:
+    img = Image.new("1", (width, height))
+    img.putdata([255 if rng.random() < 0.4 else 0 for _ in range(width * height)])
+    return img
+
+def pil_paste(screen, img, xy, clip, transparent):
+    """
+    What cups_hat_display did before: paste into a box image, then paste the box.
+    """
+    box = screen.crop(clip)
+    offset = (xy[0] - clip[0], xy[1] - clip[1])
+    if transparent:
+        box.paste(255, offset, img)
+    else:
+        box.paste(img, offset)
+    screen.paste(box, clip[:2])
+
+def page_order(img) -> bytes:
+    """
+    Pack a PIL image the way adafruit_ssd1306 does, to check the buffer layout.
+    """
+    width, height = img.size
+    pixels = img.load()
+    out = bytearray(width * height // 8)
+    for y in range(height):
+        for x in range(width):
+            if pixels[x, y]:
+                out[(y // 8) * width + x] |= 1 << (y % 8)
+    return bytes(out)
+
+def compare_random(rng) -> bool:
+    screen = Image.new("1", (128, 32))
+    plane = bitplane.Bitplane(128, 32)
+    for _ in range(ROUNDS):
+        img = random_image(rng, rng.randint(1, 40), rng.randint(1, 20))
+        transparent = rng.random() < 0.3
+        xy = (rng.randint(-20, 130), rng.randint(-12, 34))
+        cx0, cy0 = rng.randint(0, 100), rng.randint(0, 24)
+        clip = (cx0, cy0, rng.randint(cx0 + 1, 128), rng.randint(cy0 + 1, 32))
+
+        pil_paste(screen, img, xy, clip, transparent)
+        plane.blit(bitplane.Sprite(img, transparent, lazy=rng.random() < 0.5), xy, clip)
+
+        if plane.tobytes() != screen.tobytes() or bytes(plane.buffer) != page_order(screen):
+            print(f"  differs after pasting {img.size} at {xy} clipped to {clip}")
+            return False
+    return True
+
+def bench():
+    icon = Image.open("assets/printer icon.png").convert("1")
+    left = Image.open("assets/left icon.png").convert("1")
+    right = Image.open("assets/right_icon.png").convert("1")
+    font = bitmap_font.load_font("fonts/PixelOperator.ttf", 16)
+    text_box = Image.new("1", (80, 26))
+    font.draw_text(text_box, (3, -2), "Printer\nInfo", fill=255, spacing=-2)
+
+    # PIL path: clear, paste icon, text box and arrows, then take the bytes to detect changes.
+    screen = Image.new("1", (128, 32))
+    draw = ImageDraw.Draw(screen)
+    start = time.perf_counter()
+    for _ in range(BENCH_FRAMES):
+        draw.rectangle((0, 0, 128, 32), outline=0, fill=0)
+        screen.paste(icon, (14, 8))
+        screen.paste(text_box, (36, 5))
+        screen.paste(left, (1, 12))
+        screen.paste(right, (119, 12))
+        screen.tobytes()
+    pil_time = time.perf_counter() - start
+
+    # Packing for the panel, which adafruit_ssd1306's image() does pixel by pixel on every send.
+    start = time.perf_counter()
+    for _ in range(BENCH_FRAMES // 20):
+        page_order(screen)
+    pack_time = (time.perf_counter() - start) * 20
+
+    plane = bitplane.Bitplane(128, 32)
+    sprites = [bitplane.Sprite(img) for img in (icon, text_box, left, right)]
+    start = time.perf_counter()
+    for _ in range(BENCH_FRAMES):
+        plane.clear()
+        plane.blit(sprites[0], (14, 8))
+        plane.blit(sprites[1], (36, 5))
+        plane.blit(sprites[2], (1, 12))
+        plane.blit(sprites[3], (119, 12))
+        bytes(plane.buffer)
+    plane_time = time.perf_counter() - start
+
+    screen_copy = Image.new("1", (128, 32))
+    pil_paste(screen_copy, icon, (14, 8), (0, 0, 128, 32), False)
+    pil_paste(screen_copy, text_box, (36, 5), (0, 0, 128, 32), False)
+    pil_paste(screen_copy, left, (1, 12), (0, 0, 128, 32), False)
+    pil_paste(screen_copy, right, (119, 12), (0, 0, 128, 32), False)
+    same = plane.tobytes() == screen_copy.tobytes()
+
+    print(f"  PIL compose:              {pil_time / BENCH_FRAMES * 1e6:7.1f} us per frame")
+    print(f"  PIL compose + panel pack: {(pil_time + pack_time) / BENCH_FRAMES * 1e6:7.1f} us per frame")
+    print(f"  bitplane (panel ready):   {plane_time / BENCH_FRAMES * 1e6:7.1f} us per frame "
+          f"({(pil_time + pack_time) / plane_time:.0f}x faster end to end)")
+    return same
+
+def main():
+    ok = True
+    numpy_module = bitplane.numpy
+    for name, module in (("numpy", numpy_module), ("bytearray", None)):
+        if name == "numpy" and module is None:
+            print("numpy: not installed, skipped")
+            continue
+        bitplane.numpy = module
+        same = compare_random(random.Random(7))
+        print(f"{name}: {ROUNDS} random pastes {'identical' if same else 'DIFFER'}")
+        ok &= same
+        ok &= bench()
+    bitplane.numpy = numpy_module
+
+    print("PASSED" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
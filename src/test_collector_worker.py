@@ -0,0 +1,205 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_collector_worker.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_collector_worker.py
+# Description: Checks the shared memory snapshots of collector_worker.py:
+#              - a writer process rewriting snapshots every 0.2 ms while this
+#                process reads; every snapshot read must be consistent
+#              - the cost of a read with and without a new snapshot
+#              - the real worker: first snapshot, System Info commands only
+#                while their page is shown, restart after it is killed,
+#                restart after it hangs, adoption by a restarted UI, and a
+#                new worker when the restarted UI has another configuration
+#
+# Usage:
+#   python src/test_collector_worker.py     (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   CUPS doesn't need to be running, the printer polls then report unreachable.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import multiprocessing
+import os
+import signal
+import time
+
+from check_results import check, finish
+import collector_worker
+import printer_status
+
+STRESS_TIME = 2.0
+BENCH_READS = 20000
+WRITER_PAUSE = 0.0002       # Still thousands of times more often than the real worker writes
+SYSINFO_IDLE_TIME = 2.5     # Longer than COLLECTOR_SYSINFO_INTERVAL
+
+def fill(snapshot, n):
+    """
+    Every field derived from n, so a mix of two writes is easy to spot.
+    """
+    text = str(n)
+    snapshot.sys_ip_address = snapshot.sys_temperature = snapshot.sys_uptime = text
+    snapshot.sys_memusage = snapshot.sys_cpuload = text
+    snapshot.sysinfo_time = snapshot.printers_time = float(n)
+    snapshot.is_reachable = bool(n & 1)
+    snapshot.printers = []
+    for i in range(n % collector_worker.COLLECTOR_MAX_PRINTERS + 1):
+        printer = printer_status.PrinterInfo(f"{text}-{i}")
+        printer.queued_job_count = n & 0xFFFF
+        printer.state_reasons = [f"r{n}", "media-empty-error"]
+        printer.state_message = text
+        snapshot.printers.append(printer)
+
+def is_consistent(snapshot) -> bool:
+    text = snapshot.sys_ip_address
+    n = int(text)
+    return (snapshot.sys_cpuload == text and snapshot.sysinfo_time == n and snapshot.printers_time == n
+            and len(snapshot.printers) == n % collector_worker.COLLECTOR_MAX_PRINTERS + 1
+            and all(p.name.startswith(text + "-") and p.queued_job_count == n & 0xFFFF
+                    and p.state_reasons == [f"r{n}", "media-empty-error"] for p in snapshot.printers))
+
+def stress_writer(name, stop):
+    shm = collector_worker.open_segment(name)
+    writer = collector_worker.SnapshotWriter(shm)
+    snapshot = collector_worker.CollectorSnapshot()
+    n = 0
+    while not stop.is_set():
+        n += 1
+        fill(snapshot, n)
+        writer.write(snapshot)
+        time.sleep(WRITER_PAUSE)
+    writer.buf = None
+    shm.close()
+
+def test_seqlock(name) -> bool:
+    shm = collector_worker.open_segment(name, create=True)
+    reader = collector_worker.SnapshotReader(shm)
+    stop = multiprocessing.Event()
+    writer = multiprocessing.Process(target=stress_writer, args=(name, stop))
+    writer.start()
+
+    reads = distinct = bad = 0
+    last_seq = None
+    end = time.monotonic() + STRESS_TIME
+    while time.monotonic() < end:
+        snapshot = reader.read()
+        if snapshot is None:
+            continue
+        reads += 1
+        if snapshot.seq != last_seq:
+            distinct += 1
+            last_seq = snapshot.seq
+            if not is_consistent(snapshot):
+                bad += 1
+    stop.set()
+    writer.join()
+
+    print(f"seqlock: {reads} reads, {distinct} distinct snapshots, {reader.torn_reads} torn reads retried, "
+          f"{bad} inconsistent")
+    ok = bad == 0 and distinct > 100
+
+    # Cost of a read when nothing changed, and when the worker published a new snapshot.
+    start = time.perf_counter()
+    for _ in range(BENCH_READS):
+        reader.read()
+    unchanged = (time.perf_counter() - start) / BENCH_READS
+
+    writer_side = collector_worker.SnapshotWriter(shm)
+    snapshot = collector_worker.CollectorSnapshot()
+    fill(snapshot, 3)
+    start = time.perf_counter()
+    for _ in range(BENCH_READS // 10):
+        writer_side.write(snapshot)
+        reader.read()
+    changed = (time.perf_counter() - start) / (BENCH_READS // 10)
+    print(f"  read, no new snapshot: {unchanged * 1e6:6.2f} us")
+    print(f"  write + read of a new snapshot (3 printers): {changed * 1e6:6.1f} us")
+
+    writer_side.buf = None
+    reader.buf = None
+    shm.close()
+    collector_worker.unlink_segment(shm)
+    return ok
+
+def wait_for(condition, timeout, supervisor=None) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if supervisor is not None:
+            supervisor.supervise()
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def test_supervisor(name):
+    ui = collector_worker.CollectorSupervisor(["Test_Printer"], printer_interval=0.5, name=name, stale_timeout=2.0)
+    ui.start()
+    check("worker publishes a first printer poll", wait_for(lambda: (s := ui.read()) is not None and s.printers_time > 0, 10, ui))
+    time.sleep(SYSINFO_IDLE_TIME)
+    check("no System Info commands while the page isn't shown", ui.read().sysinfo_time == 0)
+
+    # System Info page shown, then left.
+    ui.request_sysinfo(True)
+    check("System Info collected once the page is shown", wait_for(lambda: ui.read().sysinfo_time > 0, 5, ui))
+    ui.request_sysinfo(False)
+    time.sleep(collector_worker.COLLECTOR_HEARTBEAT_INTERVAL)
+    sysinfo_time = ui.read().sysinfo_time
+    time.sleep(SYSINFO_IDLE_TIME)
+    check("System Info commands stop once the page is left", ui.read().sysinfo_time == sysinfo_time)
+    snapshot = ui.read()
+    check("printer reported unreachable without CUPS", not snapshot.is_reachable and snapshot.printers[0].name == "Test_Printer")
+    print(f"  cpu load {snapshot.sys_cpuload.strip()!r}, memory {snapshot.sys_memusage.strip()!r}")
+
+    # Crash: the UI keeps the last snapshot and starts a new worker.
+    first_pid = ui.process.pid
+    os.kill(first_pid, signal.SIGKILL)
+    seq = ui.read().seq
+    check("last snapshot still readable after a crash", ui.read() is not None)
+    check("killed worker restarted", wait_for(lambda: ui.process is not None and ui.process.pid != first_pid
+                                              and ui.read().seq != seq, 10, ui))
+
+    # Hang: no heartbeats for stale_timeout.
+    hung_pid = ui.process.pid
+    os.kill(hung_pid, signal.SIGSTOP)
+    start = time.monotonic()
+    check("hung worker restarted", wait_for(lambda: ui.process is not None and ui.process.pid != hung_pid, 10, ui))
+    print(f"  restarted {time.monotonic() - start:.1f}s after it stopped responding")
+
+    # UI restart: the old UI goes away without stop(), a new one adopts the running worker.
+    worker_pid = ui.process.pid
+    wait_for(lambda: ui.reader.worker_pid() == worker_pid, 5)
+    restarted = collector_worker.CollectorSupervisor(["Test_Printer"], printer_interval=0.5, name=name, stale_timeout=2.0)
+    restarted.start()
+    check("restarted UI adopts the running worker", restarted.process is None and restarted.reader.worker_pid() == worker_pid)
+    seq = restarted.read().seq
+    check("adopted worker keeps publishing", wait_for(lambda: restarted.read().seq != seq, 5, restarted))
+
+    # UI restart with another printer list: the running worker is replaced, not adopted.
+    reconfigured = collector_worker.CollectorSupervisor(["Test_Printer", "Other_Printer"], printer_interval=0.5,
+                                                         name=name, stale_timeout=2.0)
+    reconfigured.start()
+    ui.process.wait(timeout=5)
+    check("worker with another configuration replaced",
+          reconfigured.process is not None and not collector_worker.is_worker_pid(worker_pid))
+    check("new worker polls the new printers", wait_for(lambda: (s := reconfigured.read()) is not None
+          and [p.name for p in s.printers] == ["Test_Printer", "Other_Printer"], 10, reconfigured))
+    worker_pid = reconfigured.process.pid
+
+    reconfigured.stop()
+    check("stop() ends the worker and removes the segment",
+          not collector_worker.is_worker_pid(worker_pid) and not os.path.exists(f"/dev/shm/{name}"))
+
+def main():
+    name = f"cups_hat_test_{os.getpid()}"
+    check("every snapshot read was consistent", test_seqlock(name))
+    test_supervisor(name)
+    finish()
+
+if __name__ == '__main__':
+    main()
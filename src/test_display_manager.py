@@ -0,0 +1,212 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_display_manager.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_display_manager.py
+# Description: Drives display_manager.DisplayManager with fake SSD1306 panels
+#              whose show() is slow, and checks the per-bus flush threads:
+#              panels on different buses flush at the same time, panels on one
+#              bus never do, frames queued behind a slow flush coalesce to the
+#              newest, and a panel with a longer refresh interval is skipped
+#              between its ticks. Then fails the panel's I2C for a while and
+#              checks the supervisor: flush() never blocks on the degraded
+#              panel, re-inits back off up to the cap, the current frame is
+#              resent on recovery, and set_contrast() doesn't raise.
+#
+# Usage:
+#   python src/test_display_manager.py      (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import time
+
+from check_results import check, finish
+import display_manager
+
+WIDTH, HEIGHT = 128, 32
+SHOW_TIME = 0.1             # Seconds a fake show() takes, like a 400 kHz bus with a slow panel
+QUEUED_FRAMES = 10
+TICK = 0.02                 # Main loop period for the refresh interval check
+TICKS = 50
+SLOW_INTERVAL = 0.25        # Refresh interval of the slow panel
+RETRY_DELAY_MIN = 0.05      # Scaled down re-init backoff
+RETRY_DELAY_MAX = 0.4
+FAILED_INITS = 6
+
+class FakeSSD1306:
+    def __init__(self, name, log, show_time):
+        self.name = name
+        self.log = log              # (name, start, end, frame) of every show(), shared by the panels
+        self.show_time = show_time
+        self.buf = bytearray(WIDTH * HEIGHT // 8)
+        self.contrast_value = None
+
+    def image(self, img):
+        raise AssertionError("bitplane panels copy into buf")
+
+    def show(self):
+        start = time.monotonic()
+        time.sleep(self.show_time)
+        self.log.append((self.name, start, time.monotonic(), bytes(self.buf)))
+
+    def contrast(self, value):
+        self.contrast_value = value
+
+def add_panel(manager, name, bus_id, log, show_time=SHOW_TIME, refresh_interval=0):
+    if bus_id not in manager.workers:
+        manager.add_bus(bus_id, object)
+    return manager.add_panel(display_manager.Panel(name, lambda bus: FakeSSD1306(name, log, show_time),
+        bus_id, WIDTH, HEIGHT, refresh_interval=refresh_interval, use_bitplane=True))
+
+def draw(panel, value):
+    panel.framebuffer.buffer[0] = value
+
+def shows(log, name) -> list:
+    return [entry for entry in log if entry[0] == name]
+
+def overlaps(a, b) -> bool:
+    return a[1] < b[2] and b[1] < a[2]
+
+def test_buses():
+    log = []
+    manager = display_manager.DisplayManager()
+    panels = [add_panel(manager, "a", 1, log), add_panel(manager, "b", 2, log),
+              add_panel(manager, "c1", 3, log), add_panel(manager, "c2", 3, log)]
+
+    for value in range(1, 4):
+        for panel in panels:
+            draw(panel, value)
+        start = time.monotonic()
+        manager.flush()
+        check(f"flush returns without waiting on I2C ({(time.monotonic() - start) * 1000:.1f} ms)",
+              time.monotonic() - start < SHOW_TIME / 4)
+        manager.wait_idle()
+
+    a, b = shows(log, "a"), shows(log, "b")
+    c = sorted(shows(log, "c1") + shows(log, "c2"), key=lambda entry: entry[1])
+    check(f"different buses flush at the same time ({sum(map(overlaps, a, b))} of {len(a)})",
+          len(a) == len(b) == 3 and all(map(overlaps, a, b)))
+    check(f"the shared bus never overlaps ({len(c)} flushes)",
+          len(c) == 6 and not any(overlaps(x, y) for x, y in zip(c, c[1:])))
+    manager.stop()
+
+def test_coalesce():
+    log = []
+    manager = display_manager.DisplayManager()
+    panel = add_panel(manager, "a", 1, log)
+
+    # The first frame goes out right away; the rest queue up behind it.
+    for value in range(1, QUEUED_FRAMES + 1):
+        draw(panel, value)
+        manager.flush()
+        time.sleep(SHOW_TIME / QUEUED_FRAMES / 2)
+    manager.wait_idle()
+
+    sent = [frame[0] for _, _, _, frame in log]
+    check(f"queued frames coalesce to the latest (sent {sent} of 1..{QUEUED_FRAMES})",
+          sent[0] == 1 and sent[-1] == QUEUED_FRAMES and len(sent) <= 3)
+    manager.stop()
+
+def test_intervals():
+    log = []
+    manager = display_manager.DisplayManager()
+    fast = add_panel(manager, "fast", 1, log, show_time=0)
+    slow = add_panel(manager, "slow", 1, log, show_time=0, refresh_interval=SLOW_INTERVAL)
+
+    start = time.monotonic()
+    for value in range(1, TICKS + 1):
+        draw(fast, value)
+        draw(slow, value)
+        manager.flush(wait=True)
+        time.sleep(TICK)
+    elapsed = time.monotonic() - start
+
+    slow_shows = shows(log, "slow")
+    gaps = [b[1] - a[1] for a, b in zip(slow_shows, slow_shows[1:])]
+    check(f"fast panel flushed every tick ({len(shows(log, 'fast'))} of {TICKS})", len(shows(log, "fast")) == TICKS)
+    check(f"slow panel skipped between its ticks ({len(slow_shows)} flushes in {elapsed:.1f}s)",
+          len(slow_shows) <= elapsed / SLOW_INTERVAL + 1 and all(gap >= SLOW_INTERVAL - TICK / 2 for gap in gaps))
+    check("slow panel sends the frame drawn at its last tick", slow_shows[-1][3][0] > TICKS - SLOW_INTERVAL / TICK - 2)
+    manager.stop()
+
+def test_degraded():
+    display_manager.PANEL_RETRY_DELAY_MIN = RETRY_DELAY_MIN
+    display_manager.PANEL_RETRY_DELAY_MAX = RETRY_DELAY_MAX
+    log = []
+    attempts = []               # time.monotonic() of every device init
+    failures = [FAILED_INITS]
+
+    def device_factory(bus):
+        attempts.append(time.monotonic())
+        if failures[0] > 0:
+            failures[0] -= 1
+            raise OSError(121, "Remote I/O error")
+        return FakeSSD1306("a", log, 0)
+
+    manager = display_manager.DisplayManager()
+    manager.add_bus(1, object)
+    panel = manager.add_panel(display_manager.Panel("a", device_factory, 1, WIDTH, HEIGHT, use_bitplane=True))
+
+    # Keep drawing while the panel is unplugged.
+    slowest = 0
+    value = 0
+    contrast_ok = True
+    deadline = time.monotonic() + 5.0
+    while (value < 2 or panel.is_degraded) and time.monotonic() < deadline:
+        value += 1
+        draw(panel, value)
+        start = time.monotonic()
+        manager.flush()
+        slowest = max(slowest, time.monotonic() - start)
+        try:
+            manager.set_contrast(panel, value % 256)
+        except OSError:
+            contrast_ok = False
+        time.sleep(TICK)
+    manager.wait_idle()
+
+    gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+    expected = [min(RETRY_DELAY_MIN * 2 ** i, RETRY_DELAY_MAX) for i in range(FAILED_INITS)]
+    print(f"  re-init gaps {[round(gap, 2) for gap in gaps]}, expected {expected}")
+    check(f"flush never waits on the degraded panel (slowest {slowest * 1000:.1f} ms)", slowest < TICK)
+    check(f"recovered after {len(attempts)} inits", not panel.is_degraded and len(attempts) == FAILED_INITS + 1)
+    check("re-init backoff doubles up to the cap",
+          len(gaps) == len(expected) and all(e - 0.01 <= gap < e + TICK + 0.05 for gap, e in zip(gaps, expected)))
+    check(f"current frame resent on recovery (sent {[frame[0] for _, _, _, frame in log]}, drawn up to {value})",
+          bool(log) and log[-1][3][0] == value)
+    check("set_contrast doesn't raise while degraded", contrast_ok)
+
+    # A contrast change fails on the bus: the panel is marked degraded instead of raising.
+    def contrast_fails(value):
+        raise OSError(121, "Remote I/O error")
+    panel.device.contrast = contrast_fails
+    try:
+        manager.set_contrast(panel, 0)
+        raised = False
+    except OSError:
+        raised = True
+    check("failing set_contrast marks the panel degraded", not raised and panel.is_degraded)
+    sends = len(log)
+    deadline = time.monotonic() + 2.0
+    while panel.is_degraded and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.wait_idle()
+    check("frame redrawn after the contrast failure", len(log) == sends + 1 and log[-1][3][0] == value)
+    manager.stop()
+
+def main():
+    test_buses()
+    test_coalesce()
+    test_intervals()
+    test_degraded()
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_frame_recorder.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_frame_recorder.py
+# Description: Records a simulated session (a System Info page whose uptime
+#              changes every second, plus menu changes) with
+#              frame_recorder.FrameRecorder, then checks the file size, seeking,
+#              recovery from a torn last record, and the golden frame check.
+#
+# Usage:
+#   python test_frame_recorder.py [hours]       (defaults to 2 simulated hours)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from check_results import check, finish
+import frame_compare
+import frame_recorder
+
+START_TIME = 1700000000.0
+MENU_MAIN_PRINTER_INFO = 3
+MENU_SUB_SYSINFO_P2 = 11
+
+font = ImageFont.load_default()
+
+def render(menu, second) -> Image.Image:
+    img = Image.new("1", (128, 32))
+    draw = ImageDraw.Draw(img)
+    if menu == MENU_SUB_SYSINFO_P2:
+        draw.text((10, 3), f"Temp: 48.3'C\nUptime: {second // 60} min {second % 60} s", font=font, fill=255)
+    else:
+        draw.rectangle((14, 8, 30, 24), outline=255)
+        draw.text((36, 5), "Printer\nInfo", font=font, fill=255)
+    draw.polygon([(1, 16), (6, 12), (6, 20)], fill=255)
+    draw.polygon([(126, 16), (121, 12), (121, 20)], fill=255)
+    return img
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    seconds = int(hours * 3600)
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "session.ofr")
+
+    # Mostly on System Info (changes every second), Printer Info for one minute in ten.
+    def menu_at(second):
+        return MENU_MAIN_PRINTER_INFO if (second // 60) % 10 == 0 else MENU_SUB_SYSINFO_P2
+
+    start = time.perf_counter()
+    recorder = frame_recorder.FrameRecorder(path)
+    for second in range(seconds):
+        img = render(menu_at(second), second)
+        for tick in range(10):      # 10 Hz like the main loop, only changes are written
+            recorder.record(img, menu_at(second), START_TIME + second + tick / 10)
+    recorder.close()
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(path) + os.path.getsize(frame_recorder.index_path(path))
+    print(f"{hours} h recorded in {elapsed:.1f} s: {size / 1024:.1f} kB ({size / hours / 1024:.1f} kB/h)")
+    check("under 1 MB per hour", size / hours < 1024 * 1024)
+
+    # Seek into the middle and compare with a fresh render.
+    with frame_recorder.FrameReader(path) as reader:
+        second = seconds // 2 + 7
+        start = time.perf_counter()
+        frame = reader.frame_at(START_TIME + second + 0.5)
+        seek_ms = (time.perf_counter() - start) * 1000
+        check(f"seek to {second} s ({seek_ms:.1f} ms)", frame.data == render(menu_at(second), second).tobytes())
+        check("menu recorded", frame.menu == menu_at(second))
+        check("nothing before the start", reader.frame_at(START_TIME - 1) is None)
+
+    # Simulate a power cut in the middle of the last record, then keep recording.
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+    recorder = frame_recorder.FrameRecorder(path)
+    recorder.record(render(MENU_SUB_SYSINFO_P2, seconds), MENU_SUB_SYSINFO_P2, START_TIME + seconds)
+    recorder.close()
+    with frame_recorder.FrameReader(path) as reader:
+        last = reader.frame_at(START_TIME + seconds)
+        check("recording resumes after a torn record",
+              last.data == render(MENU_SUB_SYSINFO_P2, seconds).tobytes())
+
+    # Golden frames: store, compare unchanged, then compare a modified render.
+    golden_dir = os.path.join(tmp, "golden")
+    states = frame_compare.load_menu_states()
+    frames = frame_compare.frames_from_recording(path)
+    os.makedirs(golden_dir)
+    for value, (width, height, data) in frames.items():
+        Image.frombytes("1", (width, height), data).save(os.path.join(golden_dir, states[value] + ".png"))
+    golden = frame_compare.frames_from_directory(golden_dir, states)
+
+    start = time.perf_counter()
+    results = {value: frame_compare.compare_frames(width, data, golden[value][2])
+               for value, (width, height, data) in frames.items()}
+    compare_ms = (time.perf_counter() - start) * 1000
+    check(f"golden frames match ({compare_ms:.2f} ms)", all(count == 0 for count, _ in results.values()))
+
+    changed = render(MENU_MAIN_PRINTER_INFO, 0)
+    ImageDraw.Draw(changed).point((64, 30), fill=255)
+    count, bbox = frame_compare.compare_frames(128, changed.tobytes(), golden[MENU_MAIN_PRINTER_INFO][2])
+    check("one changed pixel is caught", count == 1 and bbox == (64, 30, 64, 30))
+
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_golden_frames.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_golden_frames.py
+# Description: Builds the CUPS_Hat with the stub GPIO and OLED modules from
+#              test_soak.py, renders every MENU_* state with fixed System
+#              Info values, printer status and job rows, and checks the frames
+#              against the golden frames in golden/ with frame_compare.py.
+#
+# Usage:
+#   python src/test_golden_frames.py            (run from the repository root)
+#   python src/test_golden_frames.py --update   (store the frames as the new golden frames)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   The collector worker is not started, the values are set directly.
+#   Run with --update after a deliberate change to the screens, look at the
+#   PNGs in golden/ and commit them with the change.
+#   The System Info and printer text uses Pillow's default font, which
+#   changed in Pillow 10.1. Store the golden frames with the Pillow version
+#   the Pi runs.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from check_results import check, finish
+import test_soak
+
+test_soak.install_stub_modules()
+
+import cups_hat_display as CUPS_Hat
+import frame_compare
+import ipp_client
+import job_queue
+
+JOB_ROWS = 7                # Fewer than two pages, so the list shows a partly filled page
+
+def render_states(hat, path, states) -> int:
+    """
+    Render every state with no button held and save it as path/<MENU_NAME>.png.
+    """
+    hat.is_button_pressed = lambda pin: False
+
+    hat.sys_ip_address = "192.168.1.20"
+    hat.sys_cpuload = "0.42"
+    hat.sys_memusage = "Mem: 183/427MB"
+    hat.sys_temperature = "47.2C"
+    hat.sys_uptime = "3h 25m"
+
+    printer = hat.printer_monitor.printers[hat.printer_info_index]
+    printer.is_found = True
+    printer.state = ipp_client.IPP_PRINTER_IDLE
+    printer.state_reasons = ["toner-low-report"]
+    printer.is_accepting = True
+    printer.queued_job_count = JOB_ROWS
+
+    rows = [job_queue.JobRow(100 + i, f"user{i % 3}", ipp_client.IPP_JOB_PENDING, 12 * i) for i in range(JOB_ROWS)]
+    hat.job_queue.visible_rows = lambda: rows[:job_queue.JOBQ_ROWS_PER_PAGE]
+
+    for value, name in states.items():
+        hat.current_menu = value
+        hat.menu_prepare_framebuffer()
+        hat.img_framebuffer.to_image().save(os.path.join(path, name + ".png"))
+    return len(states)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every screen against the golden frames")
+    parser.add_argument("--update", action="store_true", help="store the frames as the new golden frames")
+    args = parser.parse_args()
+
+    states = frame_compare.load_menu_states()
+    hat = CUPS_Hat.CUPS_Hat()
+    path = tempfile.mkdtemp(prefix="frames_")
+    rendered = render_states(hat, path, states)
+    hat.display_manager.stop()
+
+    # Same check as on a recording from the Pi, see README.md.
+    command = [sys.executable, frame_compare.__file__, path] + (["--update"] if args.update else [])
+    result = subprocess.run(command, capture_output=True, text=True)
+    print(result.stdout, end="")
+    shutil.rmtree(path)
+
+    check(f"{rendered} of {len(states)} states rendered", rendered == len(states))
+    check("frames match the golden frames", result.returncode == 0 and "not covered" not in result.stdout)
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_gpio_input.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_gpio_input.py
+# Description: Drives gpio_input.EdgeEventInput with a FakeEdgeSource and
+#              checks edge latching, debouncing and that wait() sleeps in
+#              select() until an edge arrives. Pass --hw to print real button
+#              events from the GPIO character device instead.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import sys
+import threading
+import time
+
+from check_results import check, finish
+import gpio_input
+
+btn_left = 5 #GPIO5
+btn_enter = 6 #GPIO6
+btn_right = 26 #GPIO26
+
+buttons = {
+    btn_left:   gpio_input.EDGE_FALLING,
+    btn_enter:  gpio_input.EDGE_RISING,
+    btn_right:  gpio_input.EDGE_FALLING,
+}
+
+def fake_test():
+    source = gpio_input.FakeEdgeSource({pin: 1 for pin in buttons})
+    buttons_in = gpio_input.EdgeEventInput(source, buttons)
+    ms = 1000000
+
+    # Press LEFT with contact bounce; only the first falling edge counts.
+    source.inject(btn_left, False, 1000 * ms)
+    source.inject(btn_left, True, 1001 * ms)
+    source.inject(btn_left, False, 1002 * ms)
+    buttons_in.wait(0)
+    check("left latched once", buttons_in.is_button_ev_det(btn_left))
+    check("left sticky bit cleared", not buttons_in.is_button_ev_det(btn_left))
+    check("left held", buttons_in.is_button_pressed(btn_left))
+
+    # Quick click on ENTER: latches on release, even within the bounce time of the press.
+    source.inject(btn_enter, False, 2000 * ms)
+    source.inject(btn_enter, True, 2080 * ms)
+    buttons_in.wait(0)
+    check("enter latched on release", buttons_in.is_button_ev_det(btn_enter))
+    check("enter released", not buttons_in.is_button_pressed(btn_enter))
+
+    # Two presses on RIGHT, the second after the bounce time.
+    source.inject(btn_right, False, 3000 * ms)
+    source.inject(btn_right, True, 3100 * ms)
+    buttons_in.wait(0)
+    check("right first press", buttons_in.is_button_ev_det(btn_right))
+    source.inject(btn_right, False, 3300 * ms)
+    buttons_in.wait(0)
+    check("right second press", buttons_in.is_button_ev_det(btn_right))
+
+    # wait() should return as soon as an edge arrives, not after the timeout.
+    timer = threading.Timer(0.05, source.inject, args=(btn_left, True))
+    timer.start()
+    start = time.monotonic()
+    buttons_in.wait(2.0)
+    check("wait() wakes on edge", time.monotonic() - start < 1.0)
+    check("left released", not buttons_in.is_button_pressed(btn_left))
+
+    source.close()
+    finish()
+
+def hw_test():
+    buttons_in = gpio_input.EdgeEventInput(gpio_input.GpiodEdgeSource(buttons.keys()), buttons)
+    print("はじめ！")
+    while True:
+        buttons_in.wait(None)
+        for pin, name in ((btn_left, "LEFT"), (btn_enter, "ENTER"), (btn_right, "RIGHT")):
+            if buttons_in.is_button_ev_det(pin):
+                print(f"{name}! (t={buttons_in.last_event_ns[pin]} ns)")
+
+if __name__ == '__main__':
+    try:
+        if "--hw" in sys.argv:
+            hw_test()
+        else:
+            fake_test()
+    except KeyboardInterrupt:
+        print("\nEnding demo.....")
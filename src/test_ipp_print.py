@@ -0,0 +1,130 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_ipp_print.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_ipp_print.py
+# Description: Submits a file with ipp_client.IPPClient.print_job() to a
+#              stand-in CUPS (stand_in_cups.py) running in this process, and checks that
+#              the document arrived intact, in chunks, with a job id returned.
+#              Then selects Print Test Page on the CUPS_Hat (with the stub
+#              hardware from test_soak.py) against a slow stand-in, and checks
+#              the menu keeps running while the page is sent and shows the
+#              result once it is done.
+#
+# Usage:
+#   python src/test_ipp_print.py [file]     (run from the repository root, defaults to a generated 5 MB file)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+from check_results import check, finish
+import test_soak
+
+test_soak.install_stub_modules()
+
+import cups_hat_display as CUPS_Hat
+import ipp_client
+import stand_in_cups
+
+SLOW_REPLY = 1.0            # Seconds the stand-in takes to spool the test page
+MENU_MAX_TIME = 0.05        # Seconds selecting the menu entry may take
+
+class StandInCups(stand_in_cups.StandInCups):
+    def __init__(self):
+        super().__init__()
+        self.received = {}          # Filled in by the Print-Job request
+        self.delay = 0
+
+    def reply(self, operation, attributes, document):
+        time.sleep(self.delay)
+        # Hash the document like CUPS spooling it to disk.
+        body_hash = hashlib.sha256()
+        for chunk in document or ():
+            body_hash.update(chunk)
+        self.received.update(operation=operation, attributes=attributes,
+                             chunks=len(document or ()), sha256=body_hash.hexdigest())
+        return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_JOB, [
+            (ipp_client.IPP_TAG_INTEGER, "job-id", 42),
+            (ipp_client.IPP_TAG_ENUM, "job-state", ipp_client.IPP_JOB_PENDING),
+        ])]
+
+def test_print_menu(path):
+    """
+    Select Print Test Page on the hat and watch the label while CUPS takes its time.
+    """
+    cups = StandInCups()
+    cups.delay = SLOW_REPLY
+    CUPS_Hat.CUPS_TEST_PAGE_PATH = path
+    hat = CUPS_Hat.CUPS_Hat()
+    hat.ipp = cups.client(timeout=SLOW_REPLY * 4)
+    hat.current_menu = CUPS_Hat.MENU_MAIN_PRINT_TEST
+
+    start = time.monotonic()
+    hat.run_command()
+    hat.menu_prepare_framebuffer()
+    elapsed = time.monotonic() - start
+    sending = hat.label_widget.value
+    hat.run_command()           # Pressed again while sending: ignored
+
+    labels = [sending]
+    deadline = time.monotonic() + SLOW_REPLY * 4
+    while time.monotonic() < deadline and labels[-1] != CUPS_Hat.OLED_PRINT_TEST_SENT_LABEL:
+        hat.menu_prepare_framebuffer()
+        if hat.label_widget.value != labels[-1]:
+            labels.append(hat.label_widget.value)
+        time.sleep(0.05)
+
+    hat.print_test_result_time -= CUPS_Hat.OLED_PRINT_TEST_RESULT_TIME
+    hat.menu_prepare_framebuffer()
+    labels.append(hat.label_widget.value)
+    hat.display_manager.stop()
+    cups.shutdown()
+
+    print(f"menu:      {elapsed * 1000:.1f} ms to select, labels {labels}")
+    check("Print Test Page selected without waiting for CUPS", elapsed < MENU_MAX_TIME)
+    check("one job submitted, second press ignored", hat.last_job_id == 42 and cups.requests[ipp_client.IPP_OP_PRINT_JOB] == 1)
+    check("label shows sending, sent, then the menu item again",
+          labels == [CUPS_Hat.OLED_PRINT_TEST_SENDING_LABEL, CUPS_Hat.OLED_PRINT_TEST_SENT_LABEL,
+                     hat.menu_item_names[CUPS_Hat.MENU_MAIN_PRINT_TEST]])
+
+def main():
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "test_document.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(5 * 1024 * 1024))
+
+    with open(path, "rb") as f:
+        expected = hashlib.sha256(f.read()).hexdigest()
+
+    cups = StandInCups()
+    job_id = cups.client().print_job("Test_Printer", path, "Test Page")
+    cups.shutdown()
+    received = cups.received
+
+    print(f"job-id:    {job_id}")
+    print(f"operation: 0x{received['operation']:04x}")
+    print(f"job-name:  {received['attributes']['job-name'][0]}")
+    print(f"chunks:    {received['chunks']}")
+    print(f"intact:    {received['sha256'] == expected}")
+
+    check("document received intact as Print-Job",
+          job_id == 42 and received["operation"] == ipp_client.IPP_OP_PRINT_JOB and received["sha256"] == expected)
+    test_print_menu(path)
+    finish()
+
+if __name__ == '__main__':
+    main()
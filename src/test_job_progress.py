@@ -0,0 +1,239 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_job_progress.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_job_progress.py
+# Description: Runs the collector worker loop against a stand-in CUPS in this
+#              process that prints a 10 page job, and counts the progress polls:
+#              none while the printer is idle or the Printer Info page is not
+#              shown, frequent ones while it is. Also checks that a job purged
+#              between polls is dropped for the next one, the poll backoff
+#              for a stalled job, and that the progress bar widget is only
+#              redrawn when its width in pixels changes.
+#
+# Usage:
+#   python src/test_job_progress.py         (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import struct
+import threading
+import time
+
+import bitplane
+from check_results import check, finish
+import collector_worker
+import ipp_client
+import job_progress
+import stand_in_cups
+import widgets
+
+JOB_PAGES = 10
+JOB_PAGE_TIME = 1.0         # Seconds per page, twice the fastest poll interval
+JOB_K_OCTETS = 500
+HIDDEN_TIME = 1.5           # Seconds the job prints before Printer Info is shown
+
+class StandInCups(stand_in_cups.StandInCups):
+    def __init__(self):
+        super().__init__()
+        self.job_start = None
+
+    def job_state(self):
+        """
+        (job-state, pages done) of job 7 right now.
+        """
+        if self.job_start is None:
+            return None, 0
+        pages = int((time.monotonic() - self.job_start) / JOB_PAGE_TIME)
+        if pages >= JOB_PAGES:
+            return ipp_client.IPP_JOB_COMPLETED, JOB_PAGES
+        return ipp_client.IPP_JOB_PROCESSING, pages
+
+    def reply(self, operation, attributes, document):
+        state, pages = self.job_state()
+        is_printing = state == ipp_client.IPP_JOB_PROCESSING
+        if operation == ipp_client.IPP_OP_CUPS_GET_PRINTERS:
+            return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_PRINTER, [
+                (ipp_client.IPP_TAG_NAME, "printer-name", "Test_Printer"),
+                (ipp_client.IPP_TAG_ENUM, "printer-state",
+                 ipp_client.IPP_PRINTER_PROCESSING if is_printing else ipp_client.IPP_PRINTER_IDLE),
+                (ipp_client.IPP_TAG_KEYWORD, "printer-state-reasons", "none"),
+                (ipp_client.IPP_TAG_INTEGER, "queued-job-count", 1 if is_printing else 0),
+            ])]
+
+        job = [
+            (ipp_client.IPP_TAG_INTEGER, "job-id", 7),
+            (ipp_client.IPP_TAG_NAME, "job-name", "report.pdf"),
+            (ipp_client.IPP_TAG_ENUM, "job-state", state),
+            (ipp_client.IPP_TAG_INTEGER, "job-media-sheets-completed", pages),
+            (ipp_client.IPP_TAG_INTEGER, "job-impressions-completed", pages),
+            (ipp_client.IPP_TAG_INTEGER, "job-impressions", JOB_PAGES),
+            (ipp_client.IPP_TAG_INTEGER, "job-k-octets-processed", JOB_K_OCTETS * pages // JOB_PAGES),
+            (ipp_client.IPP_TAG_INTEGER, "job-k-octets", JOB_K_OCTETS),
+        ]
+        if operation == ipp_client.IPP_OP_GET_JOBS:
+            return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_JOB, job)] if is_printing else []
+        if operation == ipp_client.IPP_OP_GET_JOB_ATTRIBUTES and state is not None:
+            return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_JOB, job)]
+        return ipp_client.IPP_STATUS_OK, []
+
+class PurgingCups(stand_in_cups.StandInCups):
+    def __init__(self):
+        super().__init__()
+        self.job_7_purged = False
+
+    def reply(self, operation, attributes, document):
+        if operation == ipp_client.IPP_OP_GET_JOB_ATTRIBUTES and attributes["job-id"][0] == 7 and self.job_7_purged:
+            return ipp_client.IPP_STATUS_NOT_FOUND, []
+
+        job_id = 8 if self.job_7_purged else 7
+        job = (ipp_client.IPP_TAG_JOB, [
+            (ipp_client.IPP_TAG_INTEGER, "job-id", job_id),
+            (ipp_client.IPP_TAG_NAME, "job-name", f"job{job_id}.pdf"),
+            (ipp_client.IPP_TAG_ENUM, "job-state", ipp_client.IPP_JOB_PROCESSING),
+            (ipp_client.IPP_TAG_INTEGER, "job-media-sheets-completed", 1),
+        ])
+        if operation == ipp_client.IPP_OP_GET_JOBS:
+            return ipp_client.IPP_STATUS_OK, [job]
+        if operation == ipp_client.IPP_OP_GET_JOB_ATTRIBUTES and attributes["job-id"][0] == job_id:
+            return ipp_client.IPP_STATUS_OK, [job]
+        return ipp_client.IPP_STATUS_NOT_FOUND, []
+
+def progress_polls(cups) -> int:
+    return cups.requests[ipp_client.IPP_OP_GET_JOBS] + cups.requests[ipp_client.IPP_OP_GET_JOB_ATTRIBUTES]
+
+def watch(reader, seconds) -> list:
+    """
+    Read like the UI does for a while, return the distinct progress values seen.
+    """
+    seen = []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        reader.heartbeat()
+        snapshot = reader.read()
+        if snapshot is not None and snapshot.progress is not None:
+            if not seen or seen[-1] != snapshot.progress.counters():
+                seen.append(snapshot.progress.counters())
+        time.sleep(0.05)
+    return seen
+
+def test_worker():
+    cups = StandInCups()
+    name = f"cups_hat_test_{os.getpid()}"
+    shm = collector_worker.open_segment(name, create=True)
+    collector_worker.COLLECTOR_HEADER.pack_into(shm.buf, 0, collector_worker.COLLECTOR_MAGIC, collector_worker.COLLECTOR_LAYOUT,
+        collector_worker.COLLECTOR_MAX_PRINTERS, 0, 0, 0, collector_worker.COLLECTOR_PROGRESS_NONE, 0, 0.0, time.monotonic(), 0)
+    reader = collector_worker.SnapshotReader(shm)
+    worker = threading.Thread(target=collector_worker.worker_main, args=(name, ["Test_Printer"], 1.0, 3600, cups.port))
+    worker.start()
+
+    # Idle printer, Printer Info shown: nothing to follow.
+    reader.request_progress(0)
+    watch(reader, 2.0)
+    check(f"idle printer: {progress_polls(cups)} progress polls", progress_polls(cups) == 0)
+
+    # Printing, but the Printer Info page isn't shown.
+    reader.request_progress(None)
+    cups.job_start = time.monotonic()
+    watch(reader, HIDDEN_TIME)
+    check(f"printing, page not shown: {progress_polls(cups)} progress polls", progress_polls(cups) == 0)
+
+    # Printer Info shown while printing: follow the job until it is done.
+    reader.request_progress(0)
+    start = time.monotonic()
+    seen = watch(reader, JOB_PAGES * JOB_PAGE_TIME - HIDDEN_TIME + 2.5)
+    active_time = time.monotonic() - start
+    polls = progress_polls(cups)
+    pages = [counters[2] for counters in seen]
+    print(f"  pages seen: {pages}")
+    print(f"  {polls} progress polls in {active_time:.1f}s "
+          f"({cups.requests[ipp_client.IPP_OP_GET_JOBS]} Get-Jobs, {cups.requests[ipp_client.IPP_OP_GET_JOB_ATTRIBUTES]} Get-Job-Attributes)")
+    check("every page change seen, in order", bool(pages) and pages == list(range(pages[0], pages[-1] + 1))
+          and pages[-1] >= JOB_PAGES - 1)
+    check("job found with Get-Jobs, then followed with Get-Job-Attributes",
+          cups.requests[ipp_client.IPP_OP_GET_JOB_ATTRIBUTES] > cups.requests[ipp_client.IPP_OP_GET_JOBS])
+    check("progress cleared once the job is done", reader.read().progress is None)
+
+    # Done printing, page still shown: polling stops.
+    polls = progress_polls(cups)
+    watch(reader, 2.0)
+    check(f"after the job: {progress_polls(cups) - polls} progress polls", progress_polls(cups) - polls == 0)
+
+    # Stop the worker the way an orphaned one stops: no UI heartbeat.
+    struct.pack_into("<d", shm.buf, collector_worker.COLLECTOR_READER_HEARTBEAT_OFFSET, float("-inf"))
+    worker.join()
+    cups.shutdown()
+    reader.buf = None
+    shm.close()
+    collector_worker.unlink_segment(shm)
+
+def test_purged() -> bool:
+    """
+    Job 7 is purged between polls while job 8 starts: the monitor moves on to job 8.
+    """
+    cups = PurgingCups()
+    monitor = job_progress.JobProgressMonitor(cups.client(), "Test_Printer")
+    first = monitor.poll()
+    followed = monitor.poll()
+    cups.job_7_purged = True
+    requests = cups.requests.copy()
+    moved = monitor.poll()
+    searched = cups.requests - requests
+    after = monitor.poll()
+    cups.shutdown()
+    print(f"  job {first.job_id}, then {followed.job_id}, purged: {moved and moved.job_id} "
+          f"({searched[ipp_client.IPP_OP_GET_JOB_ATTRIBUTES]} Get-Job-Attributes, {searched[ipp_client.IPP_OP_GET_JOBS]} Get-Jobs), "
+          f"then {after and after.job_id}")
+    return (first.job_id == 7 and followed.job_id == 7 and moved is not None and moved.job_id == 8
+            and searched[ipp_client.IPP_OP_GET_JOB_ATTRIBUTES] == 1 and searched[ipp_client.IPP_OP_GET_JOBS] == 1
+            and after is not None and after.job_id == 8)
+
+def test_cadence() -> bool:
+    cadence = job_progress.JobProgressCadence()
+    job = job_progress.JobProgress(7, "report.pdf", ipp_client.IPP_JOB_PROCESSING)
+    moving = []
+    for page in range(3):
+        job.sheets_completed = page
+        moving.append(cadence.next_interval(job))
+    stalled = [cadence.next_interval(job) for _ in range(6)]
+    job.sheets_completed += 1
+    resumed = cadence.next_interval(job)
+    print(f"  moving {moving}, stalled {stalled}, resumed {resumed}")
+    return (moving == [job_progress.JOB_PROGRESS_INTERVAL_MIN] * 3
+            and stalled[-1] == job_progress.JOB_PROGRESS_INTERVAL_MAX and resumed == job_progress.JOB_PROGRESS_INTERVAL_MIN)
+
+def test_bar() -> bool:
+    screen = bitplane.Bitplane(128, 32)
+    tree = widgets.WidgetTree(screen)
+    bar = tree.add(widgets.ProgressBarWidget((10, 20), (108, 6)))
+    tree.render()
+
+    steps = 2000
+    redraws = 0
+    widths = set()
+    for i in range(steps + 1):
+        bar.set(bar.fill_width(i / steps))
+        widths.add(bar.value)
+        redraws += bool(tree.render())
+    print(f"  {steps + 1} progress updates, {redraws} bar redraws, {len(widths)} distinct widths")
+
+    full = screen.to_image().crop((10, 20, 118, 26))
+    return redraws == len(widths) and all(full.getpixel((x, 3)) for x in range(2, 106))
+
+def main():
+    test_worker()
+    check("purged job dropped, the next one found with Get-Jobs", test_purged())
+    check("poll interval backs off while the job is stalled", test_cadence())
+    check("bar only redrawn when its width changes", test_bar())
+    finish()
+
+if __name__ == '__main__':
+    main()
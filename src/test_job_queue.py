@@ -0,0 +1,194 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_job_queue.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_job_queue.py
+# Description: Browses a queue of 5000 jobs held by a slow stand-in CUPS with
+#              job_queue.JobQueueBrowser. Checks that every Get-Jobs asks only
+#              for the visible page plus the prefetch window, that page turns
+#              find their rows already fetched and rendered, that a page turn
+#              never waits on CUPS, and that the page is clamped when the queue
+#              shrinks. Then answers with an HTTP error page and with a
+#              truncated IPP response, and checks the fetch thread survives
+#              both and recovers.
+#
+# Usage:
+#   python src/test_job_queue.py            (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import time
+
+from PIL import ImageFont
+
+from check_results import check, finish
+import ipp_client
+import job_queue
+import stand_in_cups
+
+QUEUE_JOBS = 5000
+REPLY_DELAY = 0.2           # Seconds the stand-in takes to answer
+PAGE_TURNS = 20
+PAGE_TURN_MAX_TIME = 0.01   # Seconds a page turn and reading its rows may take
+WINDOW_ROWS = (2 * job_queue.JOBQ_PREFETCH_PAGES + 1) * job_queue.JOBQ_ROWS_PER_PAGE
+
+class StandInCups(stand_in_cups.StandInCups):
+    def __init__(self):
+        super().__init__()
+        self.job_total = QUEUE_JOBS
+        self.windows = []           # (first-index, limit) of every Get-Jobs
+        self.raw = None             # (HTTP status, content type, body) sent instead of the IPP reply
+
+    def raw_reply(self, operation, attributes):
+        return self.raw
+
+    def reply(self, operation, attributes, document):
+        time.sleep(REPLY_DELAY)
+        if operation == ipp_client.IPP_OP_GET_PRINTER_ATTRIBUTES:
+            return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_PRINTER, [
+                (ipp_client.IPP_TAG_INTEGER, "queued-job-count", self.job_total),
+            ])]
+        if operation != ipp_client.IPP_OP_GET_JOBS:
+            return ipp_client.IPP_STATUS_OK, []
+
+        first, limit = attributes["first-index"][0], attributes["limit"][0]
+        self.windows.append((first, limit))
+        return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_JOB, [
+            (ipp_client.IPP_TAG_INTEGER, "job-id", 1000 + index),
+            (ipp_client.IPP_TAG_NAME, "job-originating-user-name", f"user{index % 7}"),
+            (ipp_client.IPP_TAG_ENUM, "job-state", ipp_client.IPP_JOB_PENDING),
+            (ipp_client.IPP_TAG_INTEGER, "job-k-octets", index % 900),
+        ]) for index in range(first, min(first + limit, self.job_total + 1))]
+
+def wait_fetched(browser, timeout=5.0) -> bool:
+    """
+    Wait until the fetch thread has the whole window around the visible page.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with browser.lock:
+            page, count = browser.page, browser.job_count
+            first = max(0, (page - job_queue.JOBQ_PREFETCH_PAGES) * browser.rows_per_page)
+            last = min(count, (page + 1 + job_queue.JOBQ_PREFETCH_PAGES) * browser.rows_per_page)
+            done = count > 0 and all(i in browser.jobs for i in range(first, last))
+        if done:
+            return True
+        time.sleep(0.01)
+    return False
+
+def refresh(browser, cups, raw) -> bool:
+    """
+    Answer the next refresh with raw (None for the normal reply) and wait until the fetch thread is done with it.
+    """
+    cups.raw = raw
+    requests = sum(cups.requests.values())
+    browser.next_refresh = 0
+    browser.wake.set()
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline and sum(cups.requests.values()) == requests:
+        time.sleep(0.01)
+    time.sleep(REPLY_DELAY * 3 + 0.1)
+    return sum(cups.requests.values()) > requests
+
+def test_bad_replies(browser, cups):
+    html_401 = (401, "text/html", b"<html><body><h1>Unauthorized</h1></body></html>")
+    truncated = (200, "application/ipp", ipp_client.encode_response(ipp_client.IPP_STATUS_OK, 1, [
+        (ipp_client.IPP_TAG_PRINTER, [(ipp_client.IPP_TAG_INTEGER, "queued-job-count", 5)])])[:11])
+
+    for label, raw, error in (("HTTP 401 page", html_401, ipp_client.IPPError),
+                              ("truncated IPP response", truncated, ValueError)):
+        cups.raw = raw
+        try:
+            cups.client().request(ipp_client.IPP_OP_GET_JOBS)
+            raised = None
+        except Exception as err:
+            raised = err
+        check(f"{label} raises {error.__name__} ({raised!r})", isinstance(raised, error))
+
+        refreshed = refresh(browser, cups, raw)
+        check(f"fetch thread survives a {label} ({browser.last_error!r})",
+              refreshed and browser.thread.is_alive() and isinstance(browser.last_error, error))
+
+    refresh(browser, cups, None)
+    check("fetch thread recovers once CUPS answers again",
+          browser.last_error is None and browser.job_count == cups.job_total and None not in browser.visible_rows())
+
+def main():
+    job_queue.JOBQ_REFRESH_INTERVAL = 3600     # Refreshes are forced below, not left to the clock
+    cups = StandInCups()
+    browser = job_queue.JobQueueBrowser(cups.client(), "Test_Printer")
+    row_cache = job_queue.JobRowCache(ImageFont.load_default())
+
+    browser.open()
+    check("first window fetched", wait_fetched(browser))
+    check(f"queue of {browser.job_count} jobs, {browser.page_count()} pages", browser.job_count == QUEUE_JOBS)
+    check(f"first Get-Jobs asks for the first page plus prefetch {cups.windows[:1]}",
+          cups.windows[:1] == [(1, (1 + job_queue.JOBQ_PREFETCH_PAGES) * job_queue.JOBQ_ROWS_PER_PAGE)])
+
+    # Page right, letting the fetch thread catch up after every turn.
+    slowest = 0
+    incomplete = 0
+    for _ in range(PAGE_TURNS):
+        start = time.perf_counter()
+        browser.page_right()
+        rows = browser.visible_rows()
+        slowest = max(slowest, time.perf_counter() - start)
+        incomplete += None in rows
+        for row in rows:
+            if row is not None:
+                row_cache.get(row)
+        wait_fetched(browser)
+    check(f"page turns never wait on CUPS (slowest {slowest * 1000:.2f} ms, replies take {REPLY_DELAY}s)",
+          slowest < PAGE_TURN_MAX_TIME)
+    check(f"every page turned to was already fetched ({incomplete} were not)", incomplete == 0)
+    check(f"every Get-Jobs within the window of {WINDOW_ROWS} rows "
+          f"(largest {max(limit for _, limit in cups.windows)}, {len(cups.windows)} requests)",
+          all(limit <= WINDOW_ROWS for _, limit in cups.windows))
+    check("Get-Jobs only fetch the rows not held yet",
+          all(limit == job_queue.JOBQ_ROWS_PER_PAGE for _, limit in cups.windows[1:PAGE_TURNS + 1]))
+    check(f"rows kept bounded ({len(browser.jobs)} held)",
+          len(browser.jobs) <= (2 * job_queue.JOBQ_KEEP_PAGES + 1) * job_queue.JOBQ_ROWS_PER_PAGE)
+
+    # Paging back: the rows and their sprites are still there.
+    requests = len(cups.windows)
+    rendered = len(row_cache.rows)
+    hits = 0
+    for _ in range(job_queue.JOBQ_PREFETCH_PAGES):
+        browser.page_left()
+        rows = browser.visible_rows()
+        hits += sum(row is not None and row.key() in row_cache.rows for row in rows)
+        for row in rows:
+            row_cache.get(row)
+    check(f"paging back hits the row cache ({hits} rows)",
+          hits == job_queue.JOBQ_PREFETCH_PAGES * job_queue.JOBQ_ROWS_PER_PAGE and len(row_cache.rows) == rendered)
+    wait_fetched(browser)
+    check("paging back within the window sends no Get-Jobs", len(cups.windows) == requests)
+
+    # The queue shrinks under the visible page: the page is clamped by the next refresh.
+    cups.job_total = 10
+    browser.next_refresh = 0
+    browser.wake.set()
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline and browser.job_count != cups.job_total:
+        browser.page_right()
+        time.sleep(0.01)
+    time.sleep(REPLY_DELAY * 2 + 0.1)
+    rows = browser.visible_rows()
+    check(f"page clamped to the shrunk queue (page {browser.page + 1} of {browser.page_count()})",
+          browser.page == browser.page_count() - 1 and len(rows) == cups.job_total % job_queue.JOBQ_ROWS_PER_PAGE)
+
+    test_bad_replies(browser, cups)
+
+    browser.stop()
+    cups.shutdown()
+    finish()
+
+if __name__ == '__main__':
+    main()
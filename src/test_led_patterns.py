@@ -0,0 +1,125 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_led_patterns.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_led_patterns.py
+# Description: Checks the LED state picked for each printer/system status, and
+#              the trigger settings written to the kernel LED class for every
+#              state's patterns, on a temporary directory standing in for
+#              /sys/class/leds.
+#
+# Usage:
+#   python src/test_led_patterns.py         (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import shutil
+import tempfile
+
+from check_results import check, finish
+import led_patterns
+import printer_status
+
+MAX_BRIGHTNESS = 255
+LED_PINS = {led_patterns.LED_GREEN: 23, led_patterns.LED_ORANGE: 24, led_patterns.LED_RED: 25}
+
+# What the kernel LED files must hold after each state is applied: LED -> {file: contents}
+EXPECTED_SYSFS = {
+    led_patterns.LED_STATE_IDLE: {
+        led_patterns.LED_GREEN:  {"trigger": "timer", "delay_on": "250", "delay_off": "250"},
+        led_patterns.LED_ORANGE: {"trigger": "none", "brightness": "0"},
+        led_patterns.LED_RED:    {"trigger": "none", "brightness": "0"},
+    },
+    led_patterns.LED_STATE_PRINTING: {
+        led_patterns.LED_GREEN:  {"trigger": "none", "brightness": str(MAX_BRIGHTNESS)},
+        led_patterns.LED_ORANGE: {"trigger": "pattern", "pattern": "0 1000 255 1000", "repeat": "-1"},
+        led_patterns.LED_RED:    {"trigger": "none", "brightness": "0"},
+    },
+    led_patterns.LED_STATE_ERROR: {
+        led_patterns.LED_GREEN:  {"trigger": "none", "brightness": str(MAX_BRIGHTNESS)},
+        led_patterns.LED_ORANGE: {"trigger": "none", "brightness": "0"},
+        led_patterns.LED_RED:    {"trigger": "none", "brightness": str(MAX_BRIGHTNESS)},
+    },
+    led_patterns.LED_STATE_PAPER_OUT: {
+        led_patterns.LED_GREEN:  {"trigger": "none", "brightness": str(MAX_BRIGHTNESS)},
+        led_patterns.LED_ORANGE: {"trigger": "pattern", "repeat": "-1",
+                                  "pattern": "255 150 255 0 0 150 0 0 255 150 255 0 0 150 0 0 0 1000 0 0"},
+        led_patterns.LED_RED:    {"trigger": "none", "brightness": "0"},
+    },
+    led_patterns.LED_STATE_OVERHEATED: {
+        led_patterns.LED_GREEN:  {"trigger": "none", "brightness": str(MAX_BRIGHTNESS)},
+        led_patterns.LED_ORANGE: {"trigger": "none", "brightness": "0"},
+        led_patterns.LED_RED:    {"trigger": "pattern", "repeat": "-1",
+                                  "pattern": "255 100 255 0 0 100 0 0 " * 2 + "255 100 255 0 0 100 0 0 0 700 0 0"},
+    },
+}
+
+def test_resolve_state():
+    OK, BUSY, ERROR = printer_status.PRINTER_STATUS_OK, printer_status.PRINTER_STATUS_BUSY, printer_status.PRINTER_STATUS_ERROR
+    hot = led_patterns.LED_OVERHEAT_TEMP_C
+    cases = [
+        # summary status, state reasons, CPU temperature, expected state
+        (OK,    ["none"],               45.0,       led_patterns.LED_STATE_IDLE),
+        (OK,    [],                     None,       led_patterns.LED_STATE_IDLE),
+        (BUSY,  ["none"],               45.0,       led_patterns.LED_STATE_PRINTING),
+        (ERROR, ["none"],               45.0,       led_patterns.LED_STATE_ERROR),
+        (ERROR, ["offline-report"],     None,       led_patterns.LED_STATE_ERROR),
+        (BUSY,  ["media-needed"],       45.0,       led_patterns.LED_STATE_PAPER_OUT),
+        (ERROR, ["media-empty-error"],  45.0,       led_patterns.LED_STATE_PAPER_OUT),
+        (ERROR, ["media-empty-error"],  hot,        led_patterns.LED_STATE_OVERHEATED),
+        (OK,    ["none"],               hot - 0.1,  led_patterns.LED_STATE_IDLE),
+        (OK,    ["none"],               hot + 5,    led_patterns.LED_STATE_OVERHEATED),
+    ]
+    for summary, reasons, temperature, expected in cases:
+        state = led_patterns.resolve_state(summary, reasons, temperature)
+        check(f"status {summary}, reasons {reasons}, {temperature} C -> state {state}", state == expected)
+
+def read_led_files(path) -> dict:
+    files = {}
+    for name in os.listdir(path):
+        if name != "max_brightness":
+            with open(os.path.join(path, name)) as f:
+                files[name] = f.read()
+    return files
+
+def test_sysfs():
+    root = tempfile.mkdtemp(prefix="leds_")
+    led_patterns.LED_SYSFS_ROOT = root
+    for name in led_patterns.LED_SYSFS_NAMES.values():
+        os.mkdir(os.path.join(root, name))
+        with open(os.path.join(root, name, "max_brightness"), "w") as f:
+            f.write(f"{MAX_BRIGHTNESS}\n")
+
+    leds = led_patterns.create_leds(None, LED_PINS)
+    check("kernel LEDs used when present", all(isinstance(led, led_patterns.SysfsLed) for led in leds.values()))
+
+    engine = led_patterns.LedPatternEngine(leds)
+    for state in (led_patterns.LED_STATE_PRINTING, led_patterns.LED_STATE_ERROR, led_patterns.LED_STATE_PAPER_OUT,
+                  led_patterns.LED_STATE_OVERHEATED, led_patterns.LED_STATE_IDLE):
+        for name in led_patterns.LED_SYSFS_NAMES.values():
+            for file in os.listdir(os.path.join(root, name)):
+                if file != "max_brightness":
+                    os.unlink(os.path.join(root, name, file))
+        engine.set_state(state)
+
+        written = {led: read_led_files(os.path.join(root, led_patterns.LED_SYSFS_NAMES[led])) for led in leds}
+        check(f"state {state}: kernel trigger settings", written == EXPECTED_SYSFS[state])
+        check(f"state {state}: no software stepping", not engine.tick_needed.is_set())
+
+    shutil.rmtree(root)
+
+def main():
+    test_resolve_state()
+    test_sysfs()
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_memory_budget.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_memory_budget.py
+# Description: Builds the CUPS_Hat with the stub GPIO and OLED modules from
+#              test_soak.py, normally and in low memory mode, and walks both
+#              through every menu, button press, and a run of changing System
+#              Info values and job rows. Checks the frames are identical, that
+#              low memory mode holds much less, and that it never needs the
+#              label font again. Prints the memory report of both.
+#
+# Usage:
+#   python src/test_memory_budget.py        (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   The collector worker is not started, the values are set directly.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import gc
+import tracemalloc
+
+from check_results import check, finish
+import test_soak
+
+test_soak.install_stub_modules()
+
+import cups_hat_display as CUPS_Hat
+import job_queue
+import memory_report
+
+SYSINFO_UPDATES = 60        # System Info values shown, more than any sprite cache holds
+JOB_ROWS = 40
+LOW_MEMORY_MAX_RATIO = 0.25 # Low memory mode must hold at most this much of the normal footprint
+
+def walk_menus(hat) -> list:
+    """
+    Show every screen the way the main loop would, return the frames in order.
+    """
+    pressed = set()
+    hat.is_button_pressed = lambda pin: pin in pressed
+    rows = [job_queue.JobRow(100 + i, f"user{i % 7}", 5, 10 * i) for i in range(JOB_ROWS)]
+    frames = []
+
+    def show(menu, buttons=()):
+        pressed.clear()
+        pressed.update(buttons)
+        hat.current_menu = menu
+        hat.menu_prepare_framebuffer()
+        frames.append(bytes(hat.img_framebuffer.buffer))
+
+    hat.widgets_update(icon=hat.icons.get(CUPS_Hat.ASSET_ICON_PRINTER), label=CUPS_Hat.OLED_STARTUP_LABEL)
+    frames.append(bytes(hat.img_framebuffer.buffer))
+
+    menus = list(range(CUPS_Hat.MENU_MAIN_FIRST, CUPS_Hat.MENU_MAIN_LAST + 1)) + \
+            list(range(CUPS_Hat.MENU_SUB_PRTOPT_FIRST, CUPS_Hat.MENU_SUB_PRTOPT_LAST + 1))
+    for _ in range(2):
+        for menu in menus:
+            for buttons in ((), (hat.btn_enter,), (hat.btn_left,), (hat.btn_right,)):
+                show(menu, buttons)
+
+    for i in range(SYSINFO_UPDATES):
+        hat.sys_ip_address = "192.168.1.20"
+        hat.sys_cpuload = f"{i % 13 * 0.07:.2f}"
+        hat.sys_memusage = f"Mem: {180 + i}/427MB"
+        hat.sys_temperature = f"{40 + i % 9}.{i % 10}C"
+        hat.sys_uptime = f"{i // 60}:{i % 60:02d}"
+        show(CUPS_Hat.MENU_SUB_SYSINFO_P1 + i % 2)
+
+    show(CUPS_Hat.MENU_SUB_PRTINFO_PAGE)
+
+    for page in range(0, JOB_ROWS, job_queue.JOBQ_ROWS_PER_PAGE):
+        hat.job_queue.visible_rows = lambda page=page: rows[page:page + job_queue.JOBQ_ROWS_PER_PAGE]
+        show(CUPS_Hat.MENU_SUB_JOBQ_LIST, (hat.btn_right,))
+
+    hat.widgets_update(icon=hat.icons.get(CUPS_Hat.ASSET_ICON_POWER), label=CUPS_Hat.OLED_SHUTDOWN_LABEL)
+    frames.append(bytes(hat.img_framebuffer.buffer))
+    return frames
+
+def build(low_memory):
+    """
+    (hat, frames, bytes held by the hat) for one mode.
+    """
+    own_frames = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+    gc.collect()
+    before = tracemalloc.take_snapshot().filter_traces(own_frames)    # Not the frames or the snapshots
+    hat = CUPS_Hat.CUPS_Hat(low_memory=low_memory)
+    frames = walk_menus(hat)
+    gc.collect()
+    after = tracemalloc.take_snapshot().filter_traces(own_frames)
+
+    sizes = memory_report.subsystem_sizes(after, before)
+    held = sum(size for size, _ in sizes.values())
+    print(f"  {'low memory' if low_memory else 'normal'}: {held / 1024:.1f} kB held after {len(frames)} frames")
+    print("    " + memory_report.report(after, before).replace("\n", "\n    "))
+    return hat, frames, held, sizes
+
+def main():
+    tracemalloc.start(16)
+
+    # Warm up module level caches (PIL plugins, the default font) so they count for neither mode.
+    hat = CUPS_Hat.CUPS_Hat()
+    walk_menus(hat)
+    hat.display_manager.stop()
+    del hat
+
+    normal, normal_frames, normal_held, _ = build(low_memory=False)
+    low, low_frames, low_held, low_sizes = build(low_memory=True)
+
+    check(f"same {len(normal_frames)} frames in both modes", normal_frames == low_frames)
+    check(f"low memory mode holds {low_held / 1024:.1f} kB, normal {normal_held / 1024:.1f} kB",
+          low_held <= normal_held * LOW_MEMORY_MAX_RATIO)
+    check("icons shared by several menus are stored once",
+          len(low.icons.files) < len(low.icons.paths) and len(normal.icons.files) == len(low.icons.files))
+    check("label font not loaded again in low memory mode", low.img_font is None)
+    check("low memory sprite caches bounded",
+          len(low.submenu_text_box_cache.sprites) <= CUPS_Hat.LOW_MEMORY_VALUE_CACHE_SIZE
+          and len(low.job_row_cache.rows) <= CUPS_Hat.LOW_MEMORY_JOB_ROW_CACHE_SIZE
+          and len(low.icons.sprites.sprites) <= 2)
+
+    check("icon sprites charged to asset_store.py", "asset_store.py" in low_sizes)
+
+    normal.display_manager.stop()
+    low.display_manager.stop()
+    finish()
+
+if __name__ == '__main__':
+    main()
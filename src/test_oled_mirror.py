@@ -0,0 +1,140 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_oled_mirror.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_oled_mirror.py
+# Description: Checks that a keyframe followed by XOR/RLE deltas rebuilds the
+#              same frames, then runs oled_mirror.FramebufferMirror on a Unix
+#              socket: a subscriber that keeps up sees every frame, and one
+#              that stops reading never stalls the publisher and is re-synced
+#              with a keyframe once it reads again.
+#
+# Usage:
+#   python src/test_oled_mirror.py          (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import random
+import socket
+import tempfile
+import time
+
+from PIL import Image
+
+from check_results import check, finish
+import oled_mirror
+
+WIDTH, HEIGHT = 128, 32
+FRAME_SIZE = WIDTH * HEIGHT // 8
+SLOW_FRAMES = 300
+PUBLISH_MAX_TIME = 0.05     # Seconds a publish may take while a subscriber is stuck
+
+def random_frame(rng, density) -> bytes:
+    return bytes(rng.randrange(256) if rng.random() < density else 0 for _ in range(FRAME_SIZE))
+
+def test_codec(rng):
+    frames = [bytes(FRAME_SIZE), bytes([0xFF]) * FRAME_SIZE, random_frame(rng, 1.0)]
+    frames += [random_frame(rng, rng.choice((0.01, 0.1, 0.5))) for _ in range(50)]
+
+    stream = [oled_mirror.rle_encode(frames[0])]
+    stream += [oled_mirror.rle_encode(oled_mirror.xor_bytes(b, a)) for a, b in zip(frames, frames[1:])]
+
+    frame = oled_mirror.rle_decode(stream[0], FRAME_SIZE)
+    rebuilt = [frame]
+    for payload in stream[1:]:
+        frame = oled_mirror.xor_bytes(frame, oled_mirror.rle_decode(payload, FRAME_SIZE))
+        rebuilt.append(frame)
+    check(f"keyframe then {len(stream) - 1} deltas rebuild the same frames", rebuilt == frames)
+    check("unchanged frame encodes small", len(oled_mirror.rle_encode(bytes(FRAME_SIZE))) <= 2 * (FRAME_SIZE // 255 + 1))
+
+class Viewer:
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.sock.settimeout(0.2)
+        self.buf = bytearray()
+        self.frame = None
+
+    def read_messages(self) -> list:
+        """
+        (type, frame) of every complete message received so far.
+        """
+        try:
+            while True:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    break
+                self.buf += chunk
+        except (socket.timeout, BlockingIOError):
+            pass
+
+        messages = []
+        header = oled_mirror.MIRROR_HEADER
+        while len(self.buf) >= header.size:
+            _, msg_type, width, height, length = header.unpack_from(self.buf)
+            if len(self.buf) < header.size + length:
+                break
+            payload = oled_mirror.rle_decode(bytes(self.buf[header.size:header.size + length]), (width + 7) // 8 * height)
+            del self.buf[:header.size + length]
+            if msg_type == oled_mirror.MIRROR_TYPE_KEYFRAME:
+                self.frame = payload
+            elif self.frame is not None:
+                self.frame = oled_mirror.xor_bytes(self.frame, payload)
+            messages.append((msg_type, self.frame))
+        return messages
+
+def test_mirror(rng):
+    path = os.path.join(tempfile.mkdtemp(prefix="oled_mirror_"), "mirror.sock")
+    mirror = oled_mirror.FramebufferMirror(path)
+    viewer = Viewer(path)
+
+    # A viewer that keeps up gets a keyframe, then one delta per changed frame.
+    frames = [random_frame(rng, 0.2) for _ in range(20)]
+    received = []
+    for frame in frames:
+        mirror.publish(Image.frombytes("1", (WIDTH, HEIGHT), frame))
+        received += viewer.read_messages()
+    check("first message is a keyframe", bool(received) and received[0][0] == oled_mirror.MIRROR_TYPE_KEYFRAME)
+    check(f"every frame seen in order ({len(received)} messages)", [frame for _, frame in received][-len(frames):] == frames)
+
+    # The viewer stops reading: the publisher must not wait on it.
+    mirror.subscribers[0].sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    slowest = 0
+    for _ in range(SLOW_FRAMES):
+        frame = random_frame(rng, 1.0)
+        start = time.perf_counter()
+        mirror.publish(Image.frombytes("1", (WIDTH, HEIGHT), frame))
+        slowest = max(slowest, time.perf_counter() - start)
+    check(f"publish never stalls on a stuck viewer (slowest {slowest * 1000:.1f} ms)", slowest < PUBLISH_MAX_TIME)
+    check("frames skipped while the viewer is behind", mirror.subscribers[0].needs_keyframe)
+
+    # Reading again: the viewer catches up and is re-synced with a keyframe of the current frame.
+    messages = []
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline and not (messages and messages[-1][0] == oled_mirror.MIRROR_TYPE_KEYFRAME):
+        messages += viewer.read_messages()
+        mirror.publish(Image.frombytes("1", (WIDTH, HEIGHT), frame))
+    check(f"re-synced with a keyframe after {len(messages)} messages",
+          bool(messages) and messages[-1] == (oled_mirror.MIRROR_TYPE_KEYFRAME, frame) and len(messages) < SLOW_FRAMES)
+
+    viewer.sock.close()
+    mirror.close()
+    check("close() removes the socket file", not os.path.exists(path))
+    os.rmdir(os.path.dirname(path))
+
+def main():
+    rng = random.Random(26)
+    test_codec(rng)
+    test_mirror(rng)
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_printer_status.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_printer_status.py
+# Description: Polls a stand-in CUPS with printer_status.PrinterMonitor and
+#              checks how the CUPS-Get-Printers reply is parsed: one request
+#              for every printer, queues that aren't configured ignored, a
+#              configured queue CUPS doesn't know shown as not found, and the
+#              summary status priority (error over busy over idle). Then checks
+#              that the app's printer task only reads the collector worker's
+#              snapshot and never talks to CUPS from the UI thread.
+#
+# Usage:
+#   python src/test_printer_status.py       (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import time
+
+from check_results import check, finish
+import test_soak
+
+test_soak.install_stub_modules()
+
+import cups_hat_display as CUPS_Hat
+import ipp_client
+import printer_status
+import stand_in_cups
+
+CONFIGURED = ["Office_Laser", "Photo_Inkjet", "Label_Printer"]
+SLOW_REPLY = 2.0            # Seconds the stand-in takes while checking the UI never waits on it
+UI_MAX_TIME = 0.05
+
+class StandInCups(stand_in_cups.StandInCups):
+    def __init__(self):
+        super().__init__()
+        self.status = ipp_client.IPP_STATUS_OK
+        self.delay = 0
+        self.printers = {}          # printer-name -> (state, [reasons], accepting, queued jobs)
+        self.requested = []         # requested-attributes of every CUPS-Get-Printers
+
+    def reply(self, operation, attributes, document):
+        time.sleep(self.delay)
+        if operation != ipp_client.IPP_OP_CUPS_GET_PRINTERS:
+            return ipp_client.IPP_STATUS_OK, []
+        self.requested.append(attributes.get("requested-attributes", []))
+        return self.status, [(ipp_client.IPP_TAG_PRINTER, [
+            (ipp_client.IPP_TAG_NAME, "printer-name", name),
+            (ipp_client.IPP_TAG_ENUM, "printer-state", state),
+            (ipp_client.IPP_TAG_KEYWORD, "printer-state-reasons", reasons),
+            (ipp_client.IPP_TAG_TEXT, "printer-state-message", f"{name} says hi"),
+            (ipp_client.IPP_TAG_BOOLEAN, "printer-is-accepting-jobs", accepting),
+            (ipp_client.IPP_TAG_INTEGER, "queued-job-count", jobs),
+        ]) for name, (state, reasons, accepting, jobs) in self.printers.items()]
+
+def test_parsing(cups):
+    cups.printers = {
+        "Office_Laser":     (ipp_client.IPP_PRINTER_IDLE, ["none"], True, 0),
+        "Photo_Inkjet":     (ipp_client.IPP_PRINTER_PROCESSING, ["cups-waiting-for-job-completed", "toner-low-report"], True, 2),
+        "Somebody_Elses":   (ipp_client.IPP_PRINTER_STOPPED, ["paused"], False, 9),
+    }
+    monitor = printer_status.PrinterMonitor(cups.client(), CONFIGURED)
+    requests = cups.requests[ipp_client.IPP_OP_CUPS_GET_PRINTERS]
+    monitor.poll()
+    office, photo, label = monitor.printers
+
+    check("one CUPS-Get-Printers for all printers", cups.requests[ipp_client.IPP_OP_CUPS_GET_PRINTERS] == requests + 1)
+    check("only the attributes shown are requested", cups.requested[-1] == printer_status.PRINTER_REQUESTED_ATTRIBUTES)
+    check("queues that aren't configured ignored", [p.name for p in monitor.printers] == CONFIGURED)
+    check("idle printer parsed", office.is_found and office.state == ipp_client.IPP_PRINTER_IDLE and office.is_accepting
+          and office.queued_job_count == 0 and office.state_message == "Office_Laser says hi" and office.state_name() == "Idle")
+    check(f"every state reason kept {photo.state_reasons}",
+          photo.state_reasons == ["cups-waiting-for-job-completed", "toner-low-report"] and photo.queued_job_count == 2)
+    check(f"benign reasons dropped {photo.reasons()}", photo.reasons() == ["toner-low-report"])
+    check("missing printer not found", not label.is_found and label.state_name() == "Not found"
+          and label.status() == printer_status.PRINTER_STATUS_ERROR)
+
+    # The missing printer shows up once it is added to CUPS.
+    cups.printers["Label_Printer"] = (ipp_client.IPP_PRINTER_IDLE, ["none"], True, 0)
+    monitor.poll()
+    check("printer found once added", label.is_found and label.status() == printer_status.PRINTER_STATUS_OK)
+
+def test_summary(cups):
+    IDLE, PRINTING, STOPPED = ipp_client.IPP_PRINTER_IDLE, ipp_client.IPP_PRINTER_PROCESSING, ipp_client.IPP_PRINTER_STOPPED
+    OK, BUSY, ERROR = printer_status.PRINTER_STATUS_OK, printer_status.PRINTER_STATUS_BUSY, printer_status.PRINTER_STATUS_ERROR
+    cases = [
+        ("all idle",                    [(IDLE, ["none"]), (IDLE, ["none"]), (IDLE, ["none"])],                 OK),
+        ("one printing",                [(IDLE, ["none"]), (PRINTING, ["none"]), (IDLE, ["none"])],             BUSY),
+        ("printing with a warning",     [(PRINTING, ["toner-low-report"]), (IDLE, ["none"]), (IDLE, ["none"])], BUSY),
+        ("printing and one stopped",    [(PRINTING, ["none"]), (STOPPED, ["paused"]), (IDLE, ["none"])],        ERROR),
+        ("printing with an error",      [(PRINTING, ["media-jam-error"]), (IDLE, ["none"]), (IDLE, ["none"])],  ERROR),
+        ("one missing",                 [(PRINTING, ["none"]), (IDLE, ["none"])],                               ERROR),
+    ]
+    monitor = printer_status.PrinterMonitor(cups.client(), CONFIGURED)
+    for label, printers, expected in cases:
+        cups.printers = {name: (state, reasons, True, 0) for name, (state, reasons) in zip(CONFIGURED, printers)}
+        monitor.poll()
+        check(f"summary of {label}: {monitor.summary_status()}", monitor.summary_status() == expected)
+
+    cups.status = 0x0500        # server-error-internal-error
+    try:
+        monitor.poll()
+        raised = False
+    except ipp_client.IPPError:
+        raised = True
+    check("error status raises and counts as unreachable", raised and monitor.summary_status() == ERROR)
+    cups.status = ipp_client.IPP_STATUS_OK
+
+    unreachable = printer_status.PrinterMonitor(ipp_client.IPPClient("127.0.0.1", 1, 1), CONFIGURED)
+    try:
+        unreachable.poll()
+        raised = False
+    except OSError:
+        raised = True
+    check("CUPS down: raises and summary is an error", raised and unreachable.summary_status() == ERROR)
+
+def test_ui_thread(cups):
+    hat = CUPS_Hat.CUPS_Hat()
+    hat.ipp = cups.client(timeout=SLOW_REPLY * 2)
+    hat.printer_monitor.ipp = hat.ipp
+    cups.delay = SLOW_REPLY
+    requests = sum(cups.requests.values())
+
+    start = time.monotonic()
+    hat.run_printer_info_commands()
+    hat.is_printer_poll_new()
+    elapsed = time.monotonic() - start
+    check(f"printer task never waits on CUPS ({elapsed * 1000:.1f} ms, CUPS takes {SLOW_REPLY}s)",
+          elapsed < UI_MAX_TIME and sum(cups.requests.values()) == requests)
+    hat.display_manager.stop()
+
+def main():
+    cups = StandInCups()
+    test_parsing(cups)
+    test_summary(cups)
+    test_ui_thread(cups)
+    cups.shutdown()
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,461 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_soak.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_soak.py
+# Description: Soak test: runs main.py's loop, tasks and ticker threads with
+#              stub GPIO and OLED modules on a virtual clock, as fast as the
+#              CPU allows, through weeks of simulated button presses and menu
+#              changes. Samples RSS, open fds, threads and Python objects of
+#              the app and of the collector worker, and the time every loop
+#              iteration takes, and fails if any of them keeps growing.
+#
+# Usage:
+#   python src/test_soak.py                 (run from the repository root, 14 days)
+#   python src/test_soak.py --days 1        (quick check)
+#   python src/test_soak.py --days 60 --seed 7
+#   python src/test_soak.py --days 1 --inject-leak    (must FAIL: checks the checks)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   Only main.py's ticker threads and the button input run on the virtual
+#   clock. The collector worker, the OLED bus thread and the job queue thread
+#   run in real time, so the worker sees a few real minutes of uptime.
+#   The stub modules are installed even on the Pi, and libgpiod and the kernel
+#   LEDs are not used, so the soak can run next to the real app. CUPS doesn't
+#   need to be running; the printer then shows as unreachable.
+#   Growth is judged after a warmup (caches filling up, allocator arenas):
+#   the median of the last quarter of the samples is compared with the median
+#   of the first quarter.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import argparse
+import contextlib
+import gc
+import heapq
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import types
+
+from check_results import check, finish
+import gpio_input
+import led_patterns
+
+SOAK_DAYS = 14
+SOAK_SAMPLE_INTERVAL = 3600         # Virtual seconds between samples
+SOAK_PRINT_INTERVAL = 6 * 3600      # Virtual seconds between printed samples
+SOAK_WARMUP = 0.2                   # Fraction of the samples ignored for the growth checks
+
+SOAK_ACTIVITY_GAP = 20 * 60         # Mean virtual seconds between bursts of button presses
+SOAK_BURST_PRESSES = (1, 30)        # Presses per burst
+SOAK_PRESS_GAP = (0.2, 3.0)         # Seconds between presses in a burst
+SOAK_PRESS_HOLD = (0.05, 0.4)       # Seconds a button is held
+
+SOAK_RSS_GROWTH_LIMIT_KB = 1024     # Allowed growth of the median RSS, per process
+SOAK_WORKER_FDS_TOLERANCE = 3       # fds a System Info command holds in the worker while it runs (stdout pipe,
+                                    # /dev/null, exec error pipe); a sample may land in the middle of one
+SOAK_OBJECTS_GROWTH_LIMIT = 500     # Allowed growth of the median gc-tracked object count (app only)
+SOAK_FRAME_DRIFT_RATIO = 1.5        # Allowed growth of the median per-sample p99 loop time...
+SOAK_FRAME_DRIFT_MIN = 0.0005       # ...unless it grew by less than this many seconds
+
+SCRIPT_PRESS = 0
+SCRIPT_RELEASE = 1
+SCRIPT_BURST_END = 2
+
+SOAK_SYSINFO_INTERVAL = 0.05        # Real seconds between System Info runs in the worker, so a few
+                                    # real minutes run the commands as often as days on the Pi would
+
+CLOCK_SETTLE_TIMEOUT = 0.05         # Real seconds to wait for a woken ticker thread to go back to sleep
+
+PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Stub hardware modules
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class StubSSD1306:
+    """
+    Stands in for adafruit_ssd1306.SSD1306_I2C. Counts the frames sent.
+    """
+    frames_shown = 0
+
+    def __init__(self, width, height, i2c, addr=0x3C):
+        self.width = width
+        self.height = height
+        self.buf = bytearray(width * height // 8)
+
+    def image(self, img):
+        pass
+
+    def show(self):
+        StubSSD1306.frames_shown += 1
+
+    def contrast(self, value):
+        pass
+
+class StubPWM:
+    def __init__(self, pin, frequency):
+        pass
+
+    def start(self, duty):
+        pass
+
+    def ChangeFrequency(self, frequency):
+        pass
+
+    def ChangeDutyCycle(self, duty):
+        pass
+
+    def stop(self):
+        pass
+
+def install_stub_modules():
+    """
+    Put stub board/busio/adafruit_ssd1306/RPi.GPIO modules in place of the real ones.
+    """
+    board = types.ModuleType("board")
+    board.SCL, board.SDA = 3, 2
+
+    busio = types.ModuleType("busio")
+    busio.I2C = lambda scl, sda: types.SimpleNamespace(deinit=lambda: None)
+
+    ssd1306 = types.ModuleType("adafruit_ssd1306")
+    ssd1306.SSD1306_I2C = StubSSD1306
+
+    gpio = types.ModuleType("RPi.GPIO")
+    gpio.BCM, gpio.IN, gpio.OUT = 11, 1, 0
+    gpio.LOW, gpio.HIGH = 0, 1
+    gpio.PUD_UP, gpio.RISING, gpio.FALLING = 22, 31, 32
+    gpio.setmode = gpio.setup = gpio.output = gpio.add_event_detect = gpio.cleanup = lambda *args, **kwargs: None
+    gpio.input = lambda pin: gpio.HIGH
+    gpio.event_detected = lambda pin: False
+    gpio.PWM = StubPWM
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = gpio
+
+    sys.modules.update({"board": board, "busio": busio, "adafruit_ssd1306": ssd1306, "RPi": rpi, "RPi.GPIO": gpio})
+
+    # Stay off the real buttons and LEDs even where they exist.
+    gpio_input.gpiod = None
+    led_patterns.LED_SYSFS_ROOT = "/nonexistent"
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Virtual clock and scripted buttons
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class VirtualClock:
+    """
+    Replaces the time module in main.py. sleep() blocks until advance() moved
+    the clock past the deadline, and advance() returns once the threads it woke
+    are asleep again, so the ticker flags are set before the tasks run.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.cond = threading.Condition()
+        self.sleepers = {}          # thread ident -> deadline
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds):
+        ident = threading.get_ident()
+        with self.cond:
+            deadline = self.now + seconds
+            self.sleepers[ident] = deadline
+            self.cond.notify_all()
+            while self.now < deadline:
+                self.cond.wait()
+            del self.sleepers[ident]
+            self.cond.notify_all()
+
+    def advance_to(self, when):
+        with self.cond:
+            if when <= self.now:
+                return
+            self.now = when
+            woken = [ident for ident, deadline in self.sleepers.items() if deadline <= when]
+            if not woken:
+                return
+            self.cond.notify_all()
+
+            # A thread that doesn't come back (e.g. the LED ticker parked on its event) is given up on.
+            settle = time.monotonic() + CLOCK_SETTLE_TIMEOUT
+            while not all(self.sleepers.get(ident, 0) > self.now for ident in woken):
+                remaining = settle - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+
+class ScriptedInput:
+    """
+    Replaces the gpio_input backend: bursts of button presses at random virtual times.
+    wait() advances the virtual clock instead of sleeping.
+    """
+    def __init__(self, clock, rng, buttons, veto):
+        """
+        buttons is a dict of pin -> (gpio_input.EDGE_FALLING/EDGE_RISING, weight).
+        veto(pin) returns a replacement pin for a press that must not happen (e.g. ENTER on Shutdown).
+        """
+        self.clock = clock
+        self.rng = rng
+        self.edges = {pin: edge for pin, (edge, _) in buttons.items()}
+        self.pins = list(buttons)
+        self.weights = [weight for _, weight in buttons.values()]
+        self.veto = veto
+        self.levels = {pin: 1 for pin in buttons}
+        self.latched = {pin: False for pin in buttons}
+        self.events = []            # heap of (time, seq, SCRIPT_..., pin, hold)
+        self.seq = 0
+        self.presses = 0
+        self.schedule_burst(0)
+
+    def push(self, when, kind, pin=None, hold=0):
+        self.seq += 1
+        heapq.heappush(self.events, (when, self.seq, kind, pin, hold))
+
+    def schedule_burst(self, after):
+        """
+        Presses never overlap, so the menu can't change between the press
+        of a button and its release (ENTER acts on the release).
+        """
+        when = after + self.rng.expovariate(1 / SOAK_ACTIVITY_GAP)
+        for _ in range(self.rng.randint(*SOAK_BURST_PRESSES)):
+            hold = self.rng.uniform(*SOAK_PRESS_HOLD)
+            self.push(when, SCRIPT_PRESS, hold=hold)    # Button picked when the press happens, see press()
+            when += hold + self.rng.uniform(*SOAK_PRESS_GAP)
+        self.push(when, SCRIPT_BURST_END)
+
+    def press(self, when, hold):
+        pin = self.veto(self.rng.choices(self.pins, self.weights)[0])
+        self.edge(pin, False)
+        self.push(when + hold, SCRIPT_RELEASE, pin)
+        self.presses += 1
+
+    def edge(self, pin, is_rising):
+        self.levels[pin] = 1 if is_rising else 0
+        if (self.edges[pin] == gpio_input.EDGE_RISING) == is_rising:
+            self.latched[pin] = True
+
+    def fileno(self):
+        return None
+
+    def wait(self, timeout):
+        target = self.clock.now + timeout
+        if self.events and self.events[0][0] <= target:
+            target = self.events[0][0]
+        self.clock.advance_to(target)
+        while self.events and self.events[0][0] <= self.clock.now:
+            when, _, kind, pin, hold = heapq.heappop(self.events)
+            if kind == SCRIPT_PRESS:
+                self.press(when, hold)
+            elif kind == SCRIPT_RELEASE:
+                self.edge(pin, True)
+            else:
+                self.schedule_burst(when)
+
+    def is_button_pressed(self, pin) -> bool:
+        return self.levels[pin] == 0
+
+    def is_button_ev_det(self, pin) -> bool:
+        retval = self.latched[pin]
+        self.latched[pin] = False
+        return retval
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Sampling and checks
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def process_stats(pid) -> dict:
+    """
+    RSS in kB, open fds and threads (native, not just Python ones) of pid, or None if it's gone.
+    """
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            rss_kb = int(f.read().split()[1]) * PAGE_KB
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+        with open(f"/proc/{pid}/status") as f:
+            threads = next(int(line.split()[1]) for line in f if line.startswith("Threads:"))
+    except (OSError, StopIteration):
+        return None
+    return {"rss_kb": rss_kb, "fds": fds, "threads": threads}
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def growth(samples, key) -> tuple:
+    """
+    (median of the first quarter, median of the last quarter) of samples[key] after the warmup.
+    """
+    values = [s[key] for s in samples[int(len(samples) * SOAK_WARMUP):] if s.get(key) is not None]
+    if len(values) < 4:
+        return None
+    quarter = len(values) // 4
+    return statistics.median(values[:quarter]), statistics.median(values[-quarter:])
+
+def check_growth(samples):
+    for prefix, name, fds_tolerance in (("", "app", 0), ("worker_", "collector worker", SOAK_WORKER_FDS_TOLERANCE)):
+        rss = growth(samples, prefix + "rss_kb")
+        if rss is None:
+            check(f"{name}: enough samples (run longer)", False)
+            continue
+        check(f"{name} RSS {rss[0]:.0f} -> {rss[1]:.0f} kB", rss[1] - rss[0] <= SOAK_RSS_GROWTH_LIMIT_KB)
+        first, last = growth(samples, prefix + "fds")
+        check(f"{name} fds {first:g} -> {last:g}", last <= first + fds_tolerance)
+        first, last = growth(samples, prefix + "threads")
+        check(f"{name} threads {first:g} -> {last:g}", last <= first)
+
+    first, last = growth(samples, "objects")
+    check(f"app gc-tracked objects {first:.0f} -> {last:.0f}", last - first <= SOAK_OBJECTS_GROWTH_LIMIT)
+
+    first, last = growth(samples, "frame_p99")
+    check(f"loop iteration p99 {first * 1e3:.2f} -> {last * 1e3:.2f} ms",
+          last <= max(first * SOAK_FRAME_DRIFT_RATIO, first + SOAK_FRAME_DRIFT_MIN))
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Soak
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def run_loop(main, clock, days, samples, inject_leak):
+    """
+    main.py's loop for days of virtual time, appending a sample every SOAK_SAMPLE_INTERVAL.
+    """
+    cups_hat = main.cups_hat
+
+    # Time the tasks of each iteration, not the wait for input (the virtual clock settling its threads).
+    wait_for_input = cups_hat.wait_for_input
+    tasks_start = [0]
+    def timed_wait_for_input(timeout):
+        wait_for_input(timeout)
+        tasks_start[0] = time.perf_counter()
+    cups_hat.wait_for_input = timed_wait_for_input
+
+    end = days * 86400
+    next_sample = SOAK_SAMPLE_INTERVAL
+    frame_times = []
+    leak = []
+    real_start = time.monotonic()
+    print(f"{'day':>6} {'RSS kB':>8} {'fds':>4} {'thr':>4} {'objects':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}"
+          f" {'wkr RSS':>8} {'fds':>4} {'presses':>8} {'frames':>8}")
+
+    # The app prints on some button presses; keep that out of the report.
+    with open(os.devnull, "w") as devnull:
+        while clock.now < end:
+            with contextlib.redirect_stdout(devnull):
+                main.main_loop_iteration(cups_hat)
+                frame_times.append(time.perf_counter() - tasks_start[0])
+                if inject_leak:
+                    leak.append(bytes(64))
+
+            if clock.now < next_sample:
+                continue
+            next_sample += SOAK_SAMPLE_INTERVAL
+
+            sample = process_stats(os.getpid())
+            sample["objects"] = len(gc.get_objects())
+            sample["frame_p50"] = percentile(frame_times, 0.5)
+            sample["frame_p99"] = percentile(frame_times, 0.99)
+            sample["frame_max"] = max(frame_times)
+            frame_times.clear()
+            worker = process_stats(cups_hat.collectors.reader.worker_pid()) or {}
+            sample.update({"worker_" + key: value for key, value in worker.items()})
+            samples.append(sample)
+
+            if clock.now % SOAK_PRINT_INTERVAL < SOAK_SAMPLE_INTERVAL:
+                print(f"{clock.now / 86400:6.2f} {sample['rss_kb']:8} {sample['fds']:4} {sample['threads']:4} {sample['objects']:8}"
+                      f" {sample['frame_p50'] * 1e3:7.3f} {sample['frame_p99'] * 1e3:7.3f} {sample['frame_max'] * 1e3:7.2f}"
+                      f" {worker.get('rss_kb', 0):8} {worker.get('fds', 0):4} {cups_hat.input.presses:8} {StubSSD1306.frames_shown:8}")
+
+    real_time = time.monotonic() - real_start
+    print(f"{days} virtual days in {real_time:.0f}s ({days * 86400 / real_time:.0f}x), "
+          f"{cups_hat.input.presses} button presses, {StubSSD1306.frames_shown} frames sent, "
+          f"{cups_hat.collectors.restarts} worker restarts")
+
+def soak(days, seed, inject_leak=False):
+    install_stub_modules()
+    import main
+    CUPS_Hat = main.CUPS_Hat
+    cups_hat = main.cups_hat
+
+    clock = VirtualClock()
+    main.time = clock
+
+    def veto(pin):
+        # The soak can't survive a shutdown, and must not print test pages or reboot.
+        if pin == cups_hat.btn_enter and cups_hat.current_menu in (
+                CUPS_Hat.MENU_MAIN_SHUTDOWN, CUPS_Hat.MENU_MAIN_PRINT_TEST, CUPS_Hat.MENU_MAIN_REBOOT):
+            return cups_hat.btn_right
+        return pin
+    cups_hat.input = ScriptedInput(clock, random.Random(seed), {
+        cups_hat.btn_left:  (gpio_input.EDGE_FALLING, 2),
+        cups_hat.btn_enter: (gpio_input.EDGE_RISING, 1),
+        cups_hat.btn_right: (gpio_input.EDGE_FALLING, 2),
+    }, veto)
+
+    # Own segment, so a soak next to the real app doesn't adopt its worker.
+    # The worker's output (printer poll errors without CUPS) goes to /dev/null.
+    cups_hat.collectors.name = f"cups_hat_soak_{os.getpid()}"
+    cups_hat.collectors.sysinfo_interval = SOAK_SYSINFO_INTERVAL
+    stdout_fd = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            cups_hat.start_collectors(main.tick_rate_printer_status)
+        finally:
+            os.dup2(stdout_fd, 1)
+            os.close(stdout_fd)
+
+    # Same start up as main.py.
+    threads = [
+        threading.Thread(target=main.thread_oled_timer, args=(main.tick_rate_oled_update,), name="oled_timer"),
+        threading.Thread(target=main.thread_led_timer, args=(main.tick_rate_led,), name="led_timer"),
+        threading.Thread(target=main.thread_printer_status_timer, args=(main.tick_rate_printer_status,), name="printer_status_timer"),
+    ]
+    for thread in threads:
+        thread.start()
+    cups_hat.display_startup()
+
+    print(f"Soak: {days} virtual days, seed {seed}")
+    samples = []
+    try:
+        run_loop(main, clock, days, samples, inject_leak)
+    finally:
+        # Same shut down as main.py, also when the loop failed.
+        main.flag_kill_threads = True
+        cups_hat.led_engine.tick_needed.set()
+        while any(thread.is_alive() for thread in threads):
+            clock.advance_to(clock.now + main.tick_rate_printer_status)
+            for thread in threads:
+                thread.join(CLOCK_SETTLE_TIMEOUT)
+        cups_hat.display_shutdown()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            main.app_cleanup()
+        cups_hat.display_manager.stop()
+
+    check_growth(samples)
+    check("collector worker never restarted", cups_hat.collectors.restarts == 0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test of the main loop on a virtual clock")
+    parser.add_argument("--days", type=float, default=SOAK_DAYS, help="virtual days to simulate")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the button press schedule")
+    parser.add_argument("--inject-leak", action="store_true", help="leak 64 bytes per loop iteration, the soak must fail")
+    args = parser.parse_args()
+
+    soak(args.days, args.seed, args.inject_leak)
+    finish()
+
+if __name__ == '__main__':
+    main()
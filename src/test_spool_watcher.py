@@ -0,0 +1,178 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_spool_watcher.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_spool_watcher.py
+# Description: Checks spool_watcher.py on a temporary directory used as the
+#              CUPS spool: which file changes count as job activity, and what
+#              happens when the directory goes away. Then runs the collector
+#              worker loop on that spool against a stand-in CUPS, writing job
+#              files like CUPS does, and checks that printers are polled right
+#              after a job arrives or finishes and only rarely while idle.
+#
+# Usage:
+#   python src/test_spool_watcher.py        (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import select
+import shutil
+import struct
+import tempfile
+import threading
+import time
+
+from check_results import check, finish
+import collector_worker
+import ipp_client
+import spool_watcher
+import stand_in_cups
+
+PRINTER_INTERVAL = 0.5
+SAFETY_INTERVAL = 3.0
+
+def pending(watcher, timeout=0.2) -> int:
+    """
+    Job file events seen within timeout.
+    """
+    readable, _, _ = select.select([watcher], [], [], timeout)
+    return watcher.read_events() if readable else 0
+
+def write_file(path, data=b"x"):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_watcher():
+    spool = tempfile.mkdtemp(prefix="cups_spool_")
+    os.mkdir(os.path.join(spool, "tmp"))
+    watcher = spool_watcher.SpoolWatcher([spool])
+
+    check("nothing pending at first", pending(watcher, 0.05) == 0)
+    write_file(os.path.join(spool, "d00042-001"))
+    check("data file of a new job", pending(watcher) > 0)
+    write_file(os.path.join(spool, "c00042.N"))
+    os.rename(os.path.join(spool, "c00042.N"), os.path.join(spool, "c00042"))
+    check("control file saved through a temp file and a rename", pending(watcher) > 0)
+    write_file(os.path.join(spool, "job.cache.N"))
+    os.rename(os.path.join(spool, "job.cache.N"), os.path.join(spool, "job.cache"))
+    check("job cache saved in the state directory", pending(watcher) > 0)
+    write_file(os.path.join(spool, "tmp", "0001a2b3c4d5"))
+    write_file(os.path.join(spool, "cups.lock"))
+    check("files that aren't job files ignored", pending(watcher) == 0)
+    os.unlink(os.path.join(spool, "d00042-001"))
+    check("data file removed when the job is done", pending(watcher) > 0)
+
+    shutil.rmtree(spool)
+    pending(watcher)
+    check("no longer active once the spool is gone", not watcher.is_active())
+    watcher.close()
+
+    check("disabled when no directory can be watched", spool_watcher.create_spool_watcher([spool]) is None)
+    check("disabled without directories", spool_watcher.create_spool_watcher([]) is None)
+
+class StandInCups(stand_in_cups.StandInCups):
+    def __init__(self):
+        super().__init__()
+        self.is_printing = False
+        self.polls = []             # time.monotonic() of every CUPS-Get-Printers
+
+    def reply(self, operation, attributes, document):
+        if operation != ipp_client.IPP_OP_CUPS_GET_PRINTERS:
+            return ipp_client.IPP_STATUS_OK, []
+        self.polls.append(time.monotonic())
+        return ipp_client.IPP_STATUS_OK, [(ipp_client.IPP_TAG_PRINTER, [
+            (ipp_client.IPP_TAG_NAME, "printer-name", "Test_Printer"),
+            (ipp_client.IPP_TAG_ENUM, "printer-state",
+             ipp_client.IPP_PRINTER_PROCESSING if self.is_printing else ipp_client.IPP_PRINTER_IDLE),
+            (ipp_client.IPP_TAG_KEYWORD, "printer-state-reasons", "none"),
+            (ipp_client.IPP_TAG_INTEGER, "queued-job-count", 1 if self.is_printing else 0),
+        ])]
+
+def polls_within(cups, start, seconds) -> int:
+    time.sleep(max(0, start + seconds - time.monotonic()))
+    return sum(1 for t in cups.polls if start <= t < start + seconds)
+
+def wait_for_state(reader, state, since, timeout=2.0) -> float:
+    """
+    Seconds from since until the snapshot shows the printer in state, None on timeout.
+    """
+    while time.monotonic() < since + timeout:
+        reader.heartbeat()
+        snapshot = reader.read()
+        if snapshot is not None and snapshot.printers_time > since and snapshot.printers[0].state == state:
+            return time.monotonic() - since
+        time.sleep(0.005)
+    return None
+
+def test_worker():
+    cups = StandInCups()
+    spool = tempfile.mkdtemp(prefix="cups_spool_")
+
+    name = f"cups_hat_test_{os.getpid()}"
+    shm = collector_worker.open_segment(name, create=True)
+    collector_worker.COLLECTOR_HEADER.pack_into(shm.buf, 0, collector_worker.COLLECTOR_MAGIC, collector_worker.COLLECTOR_LAYOUT,
+        collector_worker.COLLECTOR_MAX_PRINTERS, 0, 0, 0, collector_worker.COLLECTOR_PROGRESS_NONE, 0, 0.0, time.monotonic(), 0)
+    reader = collector_worker.SnapshotReader(shm)
+    worker = threading.Thread(target=collector_worker.worker_main,
+                              args=(name, ["Test_Printer"], PRINTER_INTERVAL, 3600, cups.port, [spool], SAFETY_INTERVAL))
+    worker.start()
+
+    # Idle: one poll at start up, then only the safety net.
+    wait_for_state(reader, ipp_client.IPP_PRINTER_IDLE, 0)
+    start = time.monotonic()
+    idle_polls = polls_within(cups, start, 2 * SAFETY_INTERVAL)
+    print(f"  idle: {idle_polls} polls in {2 * SAFETY_INTERVAL:.0f}s (safety interval {SAFETY_INTERVAL}s)")
+    check("idle printer polled at the safety interval", idle_polls <= 2)
+
+    # A job arrives: CUPS writes the data file, then saves the control file.
+    cups.is_printing = True
+    start = time.monotonic()
+    write_file(os.path.join(spool, "d00001-001"), b"%PDF" * 256)
+    write_file(os.path.join(spool, "c00001.N"))
+    os.rename(os.path.join(spool, "c00001.N"), os.path.join(spool, "c00001"))
+    latency = wait_for_state(reader, ipp_client.IPP_PRINTER_PROCESSING, start)
+    print(f"  job arrived: snapshot shows processing after {latency}s")
+    check("new job picked up right away", latency is not None and latency < spool_watcher.SPOOL_SETTLE_TIME + 0.3)
+
+    # Printing: the regular interval, state reasons can change without spool activity.
+    start = time.monotonic()
+    busy_polls = polls_within(cups, start, 2.0)
+    print(f"  printing: {busy_polls} polls in 2s (interval {PRINTER_INTERVAL}s)")
+    check("busy printer polled at the regular interval", busy_polls >= 3)
+
+    # The job finishes: the data file is removed and the control file saved again.
+    cups.is_printing = False
+    start = time.monotonic()
+    os.unlink(os.path.join(spool, "d00001-001"))
+    latency = wait_for_state(reader, ipp_client.IPP_PRINTER_IDLE, start)
+    print(f"  job done: snapshot shows idle after {latency}s")
+    check("finished job picked up right away", latency is not None and latency < spool_watcher.SPOOL_SETTLE_TIME + PRINTER_INTERVAL + 0.3)
+
+    start = time.monotonic()
+    idle_polls = polls_within(cups, start, SAFETY_INTERVAL - 0.5)
+    check(f"back to the safety interval once idle ({idle_polls} polls)", idle_polls == 0)
+
+    # Stop the worker the way an orphaned one stops: no UI heartbeat.
+    struct.pack_into("<d", shm.buf, collector_worker.COLLECTOR_READER_HEARTBEAT_OFFSET, float("-inf"))
+    worker.join()
+    cups.shutdown()
+    reader.buf = None
+    shm.close()
+    collector_worker.unlink_segment(shm)
+    shutil.rmtree(spool)
+
+def main():
+    test_watcher()
+    test_worker()
+    finish()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_task_profiler.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_task_profiler.py
+# Description: Runs a few tasks of known length through
+#              task_profiler.TaskProfiler and checks their call count, total
+#              and max time, then runs a short sampling window while new tasks
+#              keep appearing and checks the dump holds the task table and the
+#              sampled stacks.
+#
+# Usage:
+#   python src/test_task_profiler.py        (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import os
+import tempfile
+import time
+
+from check_results import check, finish
+import task_profiler
+
+SLEEP_SHORT = 0.002
+SLEEP_LONG = 0.02
+TOLERANCE = 0.015           # Seconds a sleep may overshoot on a busy machine
+SAMPLE_WINDOW = 0.5
+
+def task_sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+def task_fail():
+    raise ValueError("task failed")
+
+def test_stats(profiler):
+    for _ in range(5):
+        profiler.run("task_short", task_sleep, SLEEP_SHORT)
+    check("task result passed through", profiler.run("task_long", task_sleep, SLEEP_LONG) == SLEEP_LONG)
+    try:
+        profiler.run("task_fail", task_fail)
+    except ValueError:
+        pass
+
+    short, long, fail = profiler.stats["task_short"], profiler.stats["task_long"], profiler.stats["task_fail"]
+    check(f"call counts {short.count}, {long.count}, {fail.count}", (short.count, long.count, fail.count) == (5, 1, 1))
+    check(f"total {short.total * 1000:.1f} ms for 5 x {SLEEP_SHORT * 1000:.0f} ms",
+          5 * SLEEP_SHORT <= short.total < 5 * SLEEP_SHORT + TOLERANCE)
+    check(f"max {short.max * 1000:.1f} ms", SLEEP_SHORT <= short.max < SLEEP_SHORT + TOLERANCE and short.max <= short.total)
+    check(f"long task {long.total * 1000:.1f} ms", SLEEP_LONG <= long.total == long.max < SLEEP_LONG + TOLERANCE)
+
+    lines = profiler.report().splitlines()
+    check("report sorted by total time", [line.split()[0] for line in lines[1:3]] == ["task_long", "task_short"])
+
+def test_sampling(profiler):
+    profiler.dump_dir = tempfile.mkdtemp(prefix="profile_")
+    profiler.window = SAMPLE_WINDOW
+    profiler.start_sampling()
+    check("second signal ignored while sampling", profiler.start_sampling() is None and profiler.sampler.is_alive())
+
+    # New tasks keep appearing while the sampler reports, like a menu shown for the first time.
+    i = 0
+    while profiler.sampler.is_alive():
+        profiler.run(f"task_new_{i}", task_sleep, 0.001)
+        i += 1
+    profiler.sampler.join()
+
+    path = profiler.last_dump_path
+    check("dump written", path is not None and os.path.exists(path))
+    with open(path) as f:
+        dump = f.read()
+    stacks = [line for line in dump.splitlines() if ";" in line]
+    check(f"dump holds the task table and {len(stacks)} sampled stacks",
+          dump.startswith("task") and "task_long" in dump and bool(stacks))
+    check("main loop frames sampled", any("test_task_profiler.py:task_sleep" in stack for stack in stacks))
+    os.unlink(path)
+    os.rmdir(profiler.dump_dir)
+
+def main():
+    profiler = task_profiler.TaskProfiler()
+    test_stats(profiler)
+    test_sampling(profiler)
+    finish()
+
+if __name__ == '__main__':
+    main()
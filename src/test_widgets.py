@@ -0,0 +1,193 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# test_widgets.py
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: test_widgets.py
+# Description: Lays out the menu widgets like cups_hat_display.py and binds
+#              random data to them for many frames. After every frame the
+#              screen must match a full clear-and-redraw, with and without
+#              numpy. Then times a System Info frame where only the CPU load
+#              changed, and one where nothing changed, against a full redraw.
+#
+# Usage:
+#   python src/test_widgets.py              (run from the repository root)
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+import bitmap_font
+import bitplane
+import widgets
+
+FRAMES = 2000
+BENCH_FRAMES = 2000
+
+class Screen:
+    def __init__(self):
+        """
+        The menu widgets with the real assets and fonts.
+        """
+        font = bitmap_font.load_font("fonts/PixelOperator.ttf", 16)
+        small = ImageFont.load_default()
+
+        def label(text):
+            img = Image.new("1", (80, 26))
+            font.draw_text(img, (3, -2), text, fill=255, spacing=-2)
+            return img
+
+        def value(text):
+            img = Image.new("1", (108, 26))
+            ImageDraw.Draw(img).text((0, 0), text, font=small, fill=255, spacing=-5.5)
+            return img
+
+        def row(text):
+            img = Image.new("1", (108, 9))
+            ImageDraw.Draw(img).text((0, -2), text, font=small, fill=255)
+            return bitplane.Sprite(img)
+
+        names = ["reboot icon", "printer icon", "power icon", "info icon", "usb icon"]
+        icons = [Image.open(f"assets/{name}.png").convert("1") for name in names]
+        self.icons = [bitplane.Sprite(img) for img in icons] + [bitplane.Sprite(ImageOps.invert(img)) for img in icons]
+        arrows = [Image.open("assets/left icon.png").convert("1"), Image.open("assets/right_icon.png").convert("1")]
+        self.arrows = [bitplane.Sprite(img) for img in arrows] + [bitplane.Sprite(ImageOps.invert(img)) for img in arrows]
+        self.rows = [row(f"{100 + i} user{i} 3p {i * 7}kB") for i in range(8)]
+
+        self.plane = bitplane.Bitplane(128, 32)
+        self.tree = widgets.WidgetTree(self.plane)
+        icon_size = (max(s.width for s in self.icons), max(s.height for s in self.icons))
+        arrow_size = (max(s.width for s in self.arrows), max(s.height for s in self.arrows))
+        self.label_cache = bitplane.SpriteCache(label)
+        self.value_cache = bitplane.SpriteCache(value)
+        self.widgets = [
+            self.tree.add(widgets.IconWidget((14, 8), icon_size)),
+            self.tree.add(widgets.TextWidget((36, 5), (80, 26), self.label_cache)),
+            self.tree.add(widgets.TextWidget((10, 3), (108, 26), self.value_cache)),
+            self.tree.add(widgets.ListWidget((10, 3), (108, 26), 9)),
+            self.tree.add(widgets.IconWidget((1, 12), arrow_size)),
+            self.tree.add(widgets.IconWidget((119, 12), arrow_size)),
+        ]
+
+    def random_values(self, rng) -> list:
+        """
+        Either a main menu screen or a sub-menu screen, like menu_prepare_framebuffer().
+        """
+        left = rng.choice([None, self.arrows[0], self.arrows[2]])
+        right = rng.choice([None, self.arrows[1], self.arrows[3]])
+        kind = rng.random()
+        if kind < 0.4:
+            return [rng.choice(self.icons), rng.choice(["Reboot", "Printer\nInfo", "Job\nQueue"]), None, None, left, right]
+        if kind < 0.8:
+            text = f"IP: 192.168.1.20\nCPU Load: {rng.choice(['0.12', '0.15', '1.02'])}\nMem: 120/427 MB"
+            return [None, None, text, None, left, right]
+        rows = tuple(rng.choice(self.rows + [None]) for _ in range(rng.randint(1, 3)))
+        return [None, None, None, rows, left, right]
+
+    def full_redraw(self, values) -> bytes:
+        """
+        What the immediate-mode code did: clear and draw every visible widget.
+        """
+        plane = bitplane.Bitplane(128, 32)
+        for widget, value in zip(self.widgets, values):
+            if value is not None:
+                saved = widget.value
+                widget.value = value
+                widget.draw(plane, widget.box)
+                widget.value = saved
+        return bytes(plane.buffer)
+
+def compare_random(rng) -> bool:
+    screen = Screen()
+    damaged_area = 0
+    for frame in range(FRAMES):
+        values = screen.random_values(rng)
+        # Keep most of the previous frame, like the real menu between ticks.
+        for widget, value in zip(screen.widgets, values):
+            if frame == 0 or rng.random() < 0.3:
+                widget.set(value)
+        if rng.random() < 0.01:
+            screen.tree.invalidate()
+
+        damage = screen.tree.render()
+        damaged_area += sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in damage)
+        if bytes(screen.plane.buffer) != screen.full_redraw([w.value for w in screen.widgets]):
+            print(f"  frame {frame} differs from a full redraw, damage {damage}")
+            return False
+
+    print(f"  {FRAMES} frames identical to full redraws, "
+          f"{damaged_area / (FRAMES * 128 * 32) * 100:.0f}% of the screen recomposed on average")
+    return True
+
+def bench() -> bool:
+    screen = Screen()
+    arrows = [None, None, None, None, screen.arrows[0], screen.arrows[1]]
+    loads = ["0.12", "0.13"]
+
+    def values(i):
+        text = f"IP: 192.168.1.20\nCPU Load: {loads[i % 2]}\nMem: 120/427 MB"
+        return [None, None, text] + arrows[3:]
+
+    # Immediate mode: clear everything and draw every visible widget each frame.
+    plane = bitplane.Bitplane(128, 32)
+    start = time.perf_counter()
+    for i in range(BENCH_FRAMES):
+        plane.clear()
+        for widget, value in zip(screen.widgets, values(i)):
+            if value is not None:
+                widget.value = value
+                widget.draw(plane, widget.box)
+    full_time = time.perf_counter() - start
+
+    for widget in screen.widgets:
+        widget.value = None
+    screen.tree.invalidate()
+
+    start = time.perf_counter()
+    for i in range(BENCH_FRAMES):
+        for widget, value in zip(screen.widgets, values(i)):
+            widget.set(value)
+        screen.tree.render()
+    changed_time = time.perf_counter() - start
+    same = bytes(screen.plane.buffer) == bytes(plane.buffer)
+
+    start = time.perf_counter()
+    for i in range(BENCH_FRAMES):
+        for widget, value in zip(screen.widgets, values(0)):
+            widget.set(value)
+        damage = screen.tree.render()
+    idle_time = time.perf_counter() - start
+
+    print(f"  full redraw:            {full_time / BENCH_FRAMES * 1e6:7.1f} us per frame")
+    print(f"  retained, value change: {changed_time / BENCH_FRAMES * 1e6:7.1f} us per frame")
+    print(f"  retained, no change:    {idle_time / BENCH_FRAMES * 1e6:7.1f} us per frame (damage {damage})")
+    return same and damage == []
+
+def main():
+    ok = True
+    numpy_module = bitplane.numpy
+    for name, module in (("numpy", numpy_module), ("bytearray", None)):
+        if name == "numpy" and module is None:
+            print("numpy: not installed, skipped")
+            continue
+        bitplane.numpy = module
+        print(f"{name}:")
+        ok &= compare_random(random.Random(3))
+        ok &= bench()
+    bitplane.numpy = numpy_module
+
+    print("PASSED" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# widgets.py - Retained-mode widgets for the OLED menu
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Author: mjneri
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Name: widgets.py
+# Description: The menu screen as a fixed set of widgets (icon, label, value
+#              field, job list, progress bar, arrows), each with its own box
+#              on the screen. Every frame the menu code binds the data each
+#              widget shows. Only widgets whose data changed are marked dirty,
+#              and only their boxes are cleared and recomposed on the bitplane.
+#
+# Revisions:
+# Revision 0.01 - File Created (October 19, 2026)
+# Additional Comments:
+#   A widget's value is None while it is hidden. Hiding a widget damages its
+#   box like any other change, so whatever it covered gets cleared.
+#   Widgets are drawn in the order they were added. A damaged box is redrawn
+#   with every visible widget that overlaps it, clipped to the box, so the
+#   result is the same as clearing the screen and drawing everything.
+#   See test_widgets.py for the comparison with full redraws.
+#
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Module Includes
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+import bitplane             # Used for the sprites and the screen
+
+from PIL import Image, ImageDraw    # Used to draw the progress bar sprites
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Helper functions
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+def box_intersect(a, b):
+    """
+    Intersection of two (x0, y0, x1, y1) boxes, or None if they don't overlap.
+    """
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (x0, y0, x1, y1)
+
+def box_union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def merge_boxes(boxes) -> list:
+    """
+    Merge overlapping boxes into their bounding boxes, so no area is redrawn twice.
+    """
+    merged = []
+    for box in boxes:
+        i = 0
+        while i < len(merged):
+            if box_intersect(box, merged[i]) is not None:
+                box = box_union(box, merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(box)
+    return merged
+
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+# Class Defines
+#-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
+
+class Widget:
+    def __init__(self, box):
+        """
+        box is the (x0, y0, x1, y1) area the widget draws in.
+        """
+        self.box = box
+        self.value = None
+        self.dirty = True
+
+    def set(self, value):
+        """
+        Bind the data to show. None hides the widget.
+        """
+        if value != self.value:
+            self.value = value
+            self.dirty = True
+
+    def draw(self, screen: bitplane.Bitplane, clip):
+        """
+        Draw the current value, limited to clip. Only called while visible.
+        """
+        raise NotImplementedError
+
+class IconWidget(Widget):
+    def __init__(self, pos, size):
+        """
+        Shows a Sprite (an icon or an arrow) with its top-left at pos.
+        size is the largest sprite it will show.
+        """
+        super().__init__((pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]))
+
+    def draw(self, screen, clip):
+        screen.blit(self.value, self.box[:2], clip)
+
+class TextWidget(Widget):
+    def __init__(self, pos, size, cache: bitplane.SpriteCache):
+        """
+        Shows a string (a label or a value field) rendered by cache into a size text box at pos.
+        """
+        super().__init__((pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]))
+        self.cache = cache
+
+    def draw(self, screen, clip):
+        screen.blit(self.cache.get(self.value), self.box[:2], clip)
+
+class ListWidget(Widget):
+    def __init__(self, pos, size, row_height):
+        """
+        Shows a tuple of row Sprites stacked row_height apart, clipped to size.
+        None rows are left blank.
+        """
+        super().__init__((pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]))
+        self.row_height = row_height
+
+    def draw(self, screen, clip):
+        x, y = self.box[:2]
+        for i, row in enumerate(self.value):
+            if row is not None:
+                screen.blit(row, (x, y + i * self.row_height), clip)
+
+class ProgressBarWidget(Widget):
+    def __init__(self, pos, size):
+        """
+        Shows a bar outline filled from the left. The value is the filled width
+        in pixels, so the bar is only redrawn when a pixel actually changes.
+        """
+        super().__init__((pos[0], pos[1], pos[0] + size[0], pos[1] + size[1]))
+        self.size = size
+        self.cache = bitplane.SpriteCache(self.render, size=8)
+
+    def fill_width(self, fraction) -> int:
+        """
+        Filled width for a fraction done between 0 and 1, None for an unknown total.
+        """
+        if fraction is None:
+            return 0
+        return round(max(0.0, min(fraction, 1.0)) * (self.size[0] - 4))
+
+    def render(self, fill_width) -> Image.Image:
+        width, height = self.size
+        img = Image.new("1", self.size)
+        draw = ImageDraw.Draw(img)
+        draw.rectangle((0, 0, width - 1, height - 1), outline=255, fill=0)
+        if fill_width > 0:
+            draw.rectangle((2, 2, 1 + fill_width, height - 3), outline=255, fill=255)
+        return img
+
+    def draw(self, screen, clip):
+        screen.blit(self.cache.get(self.value), self.box[:2], clip)
+
+class WidgetTree:
+    def __init__(self, screen: bitplane.Bitplane):
+        self.screen = screen
+        self.widgets = []
+        self.full_redraw = True
+
+    def add(self, widget: Widget) -> Widget:
+        """
+        Add a widget on top of the ones already added.
+        """
+        self.widgets.append(widget)
+        self.full_redraw = True
+        return widget
+
+    def invalidate(self):
+        """
+        Redraw the whole screen on the next render(), e.g. after something else drew on it.
+        """
+        self.full_redraw = True
+
+    def render(self) -> list:
+        """
+        Recompose the boxes of the widgets that changed since the last call.
+        Returns the damaged (x0, y0, x1, y1) boxes, empty if nothing changed.
+        """
+        if self.full_redraw:
+            damage = [(0, 0, self.screen.width, self.screen.height)]
+        else:
+            damage = merge_boxes([w.box for w in self.widgets if w.dirty])
+
+        for box in damage:
+            self.screen.clear(box)
+            for widget in self.widgets:
+                if widget.value is None:
+                    continue
+                clip = box_intersect(box, widget.box)
+                if clip is not None:
+                    widget.draw(self.screen, clip)
+
+        for widget in self.widgets:
+            widget.dirty = False
+        self.full_redraw = False
+        return damage